@@ -1,11 +1,13 @@
 import asyncio
 
 from src.app_state_manager import app_state, Xref
+from src.core.broker_sync import broker_sync
 from src.core.decorators import track_it
-from src.core.report_downloader import ReportDownloader
-from src.core.report_uploader import ReportUploader
 from src.core.singleton_base import SingletonBase
+from src.core.startup_dag import StartupDag, Step, fingerprint_of
 from src.core.zerodha_kite_connect import ZerodhaKiteConnect
+from src.helpers.database_manager import db
+from src.helpers.date_time_utils import today_indian
 from src.helpers.logger import get_logger
 from src.ticks.ticker import Ticker
 from src.services.service_access_tokens import service_access_tokens
@@ -39,61 +41,103 @@ class AppInitializer(SingletonBase):
         self.start_time = None
         self.end_time = None
         self.schedule_time = None
+        self.market_calendar = None
+        self.run_pre_market = False
+        self.warm_start = False
+        self.refresh_task = None
+
+    def startup_steps(self):
+        """Startup as a dependency graph; seeding steps are skipped when their default records are unchanged."""
+        def seed(service, records):
+            return lambda: service.setup_table_records(records, skip_update_if_exists=True)
+
+        def unchanged(service, records):
+            async def fingerprint():
+                # The state file lives outside the database: a new, restored or emptied one is seeded again
+                if not await asyncio.to_thread(db.table_has_rows, service.model):
+                    return None
+                return fingerprint_of(records, *await asyncio.to_thread(db.schema_fingerprint))
+            return fingerprint
+
+        def pre_market():
+            return self.run_pre_market
+
+        def pre_market_sync():
+            return self.run_pre_market and not self.warm_start  # Today's snapshot already holds these
+
+        def cold_start():
+            return not self.warm_start
+
+        return [
+            Step('database', lambda: asyncio.to_thread(db.initialize)),
+            Step('broker_accounts', seed(service_broker_accounts, DEF_BROKER_ACCOUNTS), ('database',),
+                 fingerprint=unchanged(service_broker_accounts, DEF_BROKER_ACCOUNTS)),
+            Step('parameters', seed(service_parameter_table, DEF_PARAMETERS), ('broker_accounts',),
+                 fingerprint=unchanged(service_parameter_table, DEF_PARAMETERS)),
+            Step('access_tokens', seed(service_access_tokens, DEF_ACCESS_TOKENS), ('broker_accounts',),
+                 fingerprint=unchanged(service_access_tokens, DEF_ACCESS_TOKENS)),
+            Step('refresh_parameters', self.refresh_parameters, ('parameters',)),
+            Step('schedule_list', seed(service_schedule_list, DEF_SCHEDULES), ('database',),
+                 fingerprint=unchanged(service_schedule_list, DEF_SCHEDULES)),
+            Step('exchange_list', seed(service_exchange_list, DEF_EXCHANGE_LIST), ('database',),
+                 fingerprint=unchanged(service_exchange_list, DEF_EXCHANGE_LIST)),
+            Step('schedule_time', seed(service_schedule_time, DEF_SCHEDULE_TIME), ('schedule_list', 'exchange_list'),
+                 fingerprint=unchanged(service_schedule_time, DEF_SCHEDULE_TIME)),
+            Step('market_calendar', self.load_market_calendar, ('schedule_time',)),
+            Step('kite_login', lambda: self.get_kite_obj().init_kite_conn_async(test_conn=True),
+                 ('refresh_parameters', 'access_tokens')),
+            Step('restore_app_state', self.restore_app_state, ('refresh_parameters',)),
+            Step('pre_market_check', self.check_pre_market,
+                 ('refresh_parameters', 'market_calendar', 'restore_app_state')),
+            Step('thread_list', seed(service_thread_list, DEF_THREAD_LIST), ('pre_market_check',),
+                 fingerprint=unchanged(service_thread_list, DEF_THREAD_LIST), enabled=pre_market),
+            Step('watchlist', seed(service_watchlist, DEF_WATCH_LIST), ('pre_market_check',),
+                 fingerprint=unchanged(service_watchlist, DEF_WATCH_LIST), enabled=pre_market),
+            Step('thread_schedule', seed(service_thread_schedule, DEF_THREAD_SCHEDULE),
+                 ('thread_list', 'schedule_list'), fingerprint=unchanged(service_thread_schedule, DEF_THREAD_SCHEDULE),
+                 enabled=pre_market),
+            Step('instrument_list', self.sync_instrument_list, ('kite_login', 'exchange_list', 'pre_market_check'),
+                 enabled=pre_market_sync),
+            Step('holdings', self.sync_holdings, ('kite_login', 'pre_market_check'), enabled=pre_market_sync),
+            Step('watchlist_symbols', self.sync_watchlist, ('watchlist', 'instrument_list'),
+                 enabled=pre_market_sync),
+            Step('positions', self.sync_positions, ('kite_login', 'restore_app_state'), enabled=cold_start),
+            Step('app_state', self.setup_app_state, ('kite_login', 'market_calendar', 'thread_schedule',
+                                                     'instrument_list', 'holdings', 'watchlist_symbols',
+                                                     'positions')),
+        ]
 
     @track_it()
     async def setup(self):
+        dag = StartupDag("startup", self.startup_steps(), parms.STARTUP_STATE_FILE)
+        # Dropped tables have to be seeded again whatever the fingerprints say
+        await dag.run(skip_unchanged=bool(parms.STARTUP_SKIP_UNCHANGED) and not parms.DROP_TABLES)
 
-        # Step 1: Set up broker and parameter records
-        await service_broker_accounts.setup_table_records(DEF_BROKER_ACCOUNTS, skip_update_if_exists=True)
-        await service_parameter_table.setup_table_records(DEF_PARAMETERS, skip_update_if_exists=True)
-
-        # Step 2: Set up access token records
-        await service_access_tokens.setup_table_records(DEF_ACCESS_TOKENS, skip_update_if_exists=True)
-
-        # Step 3: Refresh parameters
+    @staticmethod
+    async def refresh_parameters():
         records = await service_parameter_table.get_all_records()
         refresh_parameters(records, refresh=True)
 
-        await asyncio.gather(
-            service_schedule_list.setup_table_records(DEF_SCHEDULES, skip_update_if_exists=True),
-            service_exchange_list.setup_table_records(DEF_EXCHANGE_LIST, skip_update_if_exists=True)
-        )
-        await service_schedule_time.setup_table_records(DEF_SCHEDULE_TIME, skip_update_if_exists=True)
-        self.schedule_time = service_schedule_time.get_market_schedule_recs_for_today()
+    async def load_market_calendar(self):
+        self.market_calendar = await service_schedule_time.get_market_calendar_async()
+        self.schedule_time = await service_schedule_time.get_market_schedule_recs_for_today_async()
 
-        # Step 4: Initialize singleton instance
-        ZerodhaKiteConnect().get_kite_conn(test_conn=True)
-        is_open = False
+    async def restore_app_state(self):
+        """Warm start from today's app state snapshot, if there is one and tables were not dropped."""
+        self.warm_start = (bool(parms.APP_STATE_WARM_START) and not parms.DROP_TABLES
+                           and app_state.load_snapshot(parms.APP_STATE_SNAPSHOT_FILE))
 
+    async def check_pre_market(self):
         if parms.DROP_TABLES:
-            await self.setup_pre_market()
+            self.run_pre_market = True
         else:
-            is_open, self.start_time, self.end_time = service_schedule_time.is_market_open(pre_market=True)
-
-        if is_open:
-            await app_initializer.setup_pre_market()
+            self.run_pre_market, self.start_time, self.end_time = service_schedule_time.is_market_open(
+                pre_market=True)
 
-        await service_positions.process_records(
-            await asyncio.to_thread(app_initializer.get_kite_conn().positions)
-        )
-
-        await service_positions.process_records(
-            await asyncio.to_thread(app_initializer.get_kite_conn().positions)
-        )
-
-        await self.update_app_sate()
+    # ─── Scheduled jobs, one per Thread constant ────────────────────────────────
 
     @track_it()
-    async def setup_pre_market(self):
-        await asyncio.gather(
-            service_thread_list.setup_table_records(DEF_THREAD_LIST, skip_update_if_exists=True),
-            service_watchlist.setup_table_records(DEF_WATCH_LIST, skip_update_if_exists=True),
-        )
-        await asyncio.gather(
-            service_thread_schedule.setup_table_records(DEF_THREAD_SCHEDULE, skip_update_if_exists=True),
-            service_schedule_time.setup_table_records(DEF_SCHEDULE_TIME, skip_update_if_exists=True),
-        )
-
+    async def sync_instrument_list(self):
         instrument_list = await asyncio.to_thread(self.get_kite_conn().instruments)  # Run in a separate thread
 
         exchange_list = {record["exchange"] for record in instrument_list}
@@ -102,42 +146,120 @@ class AppInitializer(SingletonBase):
 
         await service_instrument_list.process_records(instrument_list)
 
-        # positions = await asyncio.to_thread(get_kite_conn().positions)
+    @track_it()
+    async def sync_holdings(self):
+        if broker_sync.running:  # Keep row ids stable for AppState and the write-behind queue
+            await broker_sync.sync_now('holdings')
+            return
         holdings = await asyncio.to_thread(self.get_kite_conn().holdings)
+        await service_holdings.process_records(holdings)
 
-        await asyncio.gather(
-            # service_positions.process_records(positions),
-            service_holdings.process_records(holdings),
-        )
+    @track_it()
+    async def sync_positions(self):
+        if broker_sync.running:
+            await broker_sync.sync_now('positions')
+            return
+        positions = await asyncio.to_thread(self.get_kite_conn().positions)
+        await service_positions.process_records(positions)
 
+    @track_it()
+    async def sync_watchlist(self):
         await service_watchlist_symbols.process_records(DEF_WATCHLIST_SYMBOLS)
 
+    @track_it()
+    async def sync_stock_reports(self):
+        await self.sync_reports()
+
+    @track_it()
+    async def start_socket_ticker(self):
+        self.market_calendar = await service_schedule_time.get_market_calendar_async()
+        market_ticker = Ticker(self.get_kite_obj())
+        if market_ticker.is_alive():
+            logger.info("Ticker thread is already running.")
+            return
+        market_ticker.update_market_calendar(
+            self.market_calendar).update_instruments(
+            app_state.get(Xref.TRACK_INSTR_XREF_XCHANGE))
+        # Track list changes reach the socket subscriptions as they are published
+        market_ticker.unsubscribe = app_state.subscribe(Xref.TRACK_INSTR_XREF_XCHANGE,
+                                                        market_ticker.on_track_list_change)
+        market_ticker.start()  # Add tokens
+
+    async def setup_app_state(self):
+        """Rebuild the app state, or after a warm start tick right away and refresh the volatile parts behind it."""
+        if not self.warm_start:
+            await self.update_app_sate()
+            return
+        await self.start_socket_ticker()
+        self.refresh_task = asyncio.create_task(self.refresh_volatile_state())
+
     @track_it()
     async def update_app_sate(self):
 
-        app_state.set_instruments(await service_instrument_list.get_record_map(key_attr='symbol_exchange'))
+        instruments = await service_instrument_list.get_record_map(key_attr='symbol_exchange')
+        positions = await service_positions.get_record_map()
+        holdings = await service_holdings.get_record_map()
+        watchlist = await service_watchlist_symbols.get_record_map()
+        unique_exchanges = await service_schedule_time.get_unique_exchanges_async()
 
-        app_state.set_positions(await service_positions.get_record_map())
-        app_state.set_holdings(await service_holdings.get_record_map())
-        app_state.set_watchlist(await service_watchlist_symbols.get_record_map())
+        with app_state.transaction():  # Readers see the old state until the new one is complete
+            app_state.set_instruments(instruments)
+            app_state.set_positions(positions)
+            app_state.set_holdings(holdings)
+            app_state.set_watchlist(watchlist)
+            app_state.set_track_list(unique_exchanges)
+        await asyncio.to_thread(self.save_app_state)
 
-        app_state.set_track_list(service_schedule_time.get_unique_exchanges())
+        await self.start_socket_ticker()
 
-        self.schedule_time = service_schedule_time.get_schedule_records()
-        market_ticker = Ticker(self.get_kite_obj())
-        market_ticker.update_schedule_time(
-            self.schedule_time).update_instruments(
-            app_state.get(Xref.TRACK_INSTR_XREF_XCHANGE))
-        market_ticker.start()  # Add tokens
+    @track_it()
+    async def refresh_volatile_state(self):
+        """Positions and holdings change intraday; re-fetch them and rebuild the track list after a warm start."""
+        try:
+            await asyncio.gather(self.sync_positions(), self.sync_holdings())
+            positions = await service_positions.get_record_map()
+            holdings = await service_holdings.get_record_map()
+            unique_exchanges = await service_schedule_time.get_unique_exchanges_async()
+            with app_state.transaction():
+                app_state.set_positions(positions)
+                app_state.set_holdings(holdings)
+                app_state.set_track_list(unique_exchanges)
+            await asyncio.to_thread(self.save_app_state)  # The ticker picks up the new track list itself
+        except Exception as e:
+            logger.exception(f"Refreshing app state after warm start failed: {e}")
+
+    @staticmethod
+    def save_app_state():
+        try:
+            app_state.save_snapshot(parms.APP_STATE_SNAPSHOT_FILE)
+        except Exception as e:
+            logger.warning(f"Could not save app state snapshot: {e}")
 
     @staticmethod
     async def sync_reports():
-        await asyncio.to_thread(ReportDownloader.login_download_reports)
-        await ReportUploader.upload_reports()
+        """Download and upload only what is missing since each (account, report) watermark."""
+        # Selenium, pandas, pyarrow and NumPy are only loaded once reports are actually synced
+        from src.core.report_downloader import ReportDownloader
+        from src.core.report_uploader import ReportUploader
+        from src.services.service_report_ledger_daily import service_report_ledger_daily
+        from src.services.service_report_sync_state import service_report_sync_state
+        from src.services.service_report_trade_lots import service_report_trade_lots
+
+        watermarks = await service_report_sync_state.get_watermarks()
+        report_end_date = today_indian()
+        user_downloads = await asyncio.to_thread(ReportDownloader.login_download_reports, watermarks)
+        failed_uploads = await ReportUploader.upload_reports()
+        await asyncio.gather(service_report_trade_lots.match_new_trades(), service_report_ledger_daily.reconcile())
+        # A report whose upload failed keeps its watermark, so the next run fetches it again
+        await service_report_sync_state.set_watermarks({
+            (account, report): report_end_date
+            for account, downloads in user_downloads.items() for report in downloads
+            if (account, report) not in failed_uploads
+        })
 
     @staticmethod
     def get_kite_conn():
-        return ZerodhaKiteConnect().get_kite_conn()
+        return ZerodhaKiteConnect().get_kite_conn(test_conn=False)
 
     @staticmethod
     def get_kite_obj():
@@ -1,10 +1,20 @@
+import os
+import pickle
 import threading
 from collections import defaultdict
+from collections.abc import Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable
 
 from bidict import bidict
 
-from src.core.decorators import update_lock, track_it
+from src.core.decorators import track_it
 from src.core.singleton_base import SingletonBase
+from src.helpers.date_time_utils import today_indian, timestamp_indian
+from src.helpers.lazy_import import lazy_import
 from src.helpers.logger import get_logger
 from src.helpers.utils import reverse_dict, create_instr_symbol_xref
 
@@ -12,6 +22,11 @@ multi_set_dict = defaultdict(set)
 
 logger = get_logger(__name__)
 
+np = lazy_import("numpy")
+
+# Bump whenever the layout of track_state changes; older snapshots are then ignored
+SNAPSHOT_SCHEMA_VERSION = 2
+
 
 class Xref:
     SYMBOL_INSTR_XREF = 'symbol_instr_xref'
@@ -37,121 +52,384 @@ class Xref:
     TRACK_INSTR_XREF_BY_CATEGORY = 'track_instr_xref_by_category'
     TRACK_INSTR_XREF_XCHANGE = 'track_instr_xref_xchange'
     TRACK_INSTR_SYMBOL_XREF = 'track_instr_symbol_xref'
+    TRACK_EXCHANGES = 'track_exchanges'
+
+    # Sorted instrument tokens and the integer code of each one's exchange, for vectorised lookups
+    INSTR_TOKENS = 'instr_tokens'
+    INSTR_EXCHANGE_CODES = 'instr_exchange_codes'
+    EXCHANGE_CODES = 'exchange_codes'
+
+
+# Category letter -> (records, symbol -> record ids, instrument token -> record ids)
+CATEGORY_KEYS = {
+    'p': (Xref.POSITIONS, Xref.SYMBOL_POSITIONS, Xref.INSTR_POSITIONS),
+    'h': (Xref.HOLDINGS, Xref.SYMBOL_HOLDINGS, Xref.INSTR_HOLDINGS),
+    'w': (Xref.WATCHLISTS, Xref.SYMBOL_WATCHLISTS, Xref.INSTR_WATCHLISTS),
+}
+
+
+@dataclass(frozen=True)
+class StateChange:
+    """One published change of an AppState key, as delivered to its subscribers."""
+    key: str
+    old: Any
+    new: Any
+    version: int
+
+    @staticmethod
+    def _members(value):
+        if value is None:
+            return set()
+        return set(value.keys()) if isinstance(value, Mapping) else set(value)
+
+    @property
+    def added(self) -> set:
+        """Keys (for dicts) or members (for sets) that are new."""
+        return self._members(self.new) - self._members(self.old)
+
+    @property
+    def removed(self) -> set:
+        return self._members(self.old) - self._members(self.new)
+
+    def set_diffs(self) -> dict:
+        """For a dict of sets, {sub key: (added members, removed members)} of the sub keys that changed."""
+        old, new = self.old or {}, self.new or {}
+        diffs = {}
+        for sub_key in old.keys() | new.keys():
+            old_members, new_members = old.get(sub_key) or set(), new.get(sub_key) or set()
+            if old_members is not new_members and old_members != new_members:
+                diffs[sub_key] = (set(new_members) - set(old_members), set(old_members) - set(new_members))
+        return diffs
+
+
+class _PendingState:
+    """Private working copy of track_state inside a transaction; inner dicts are copied on first write."""
+
+    def __init__(self, published):
+        self.state = dict(published)
+        self._copied = set()
+
+    def _own(self, key):
+        """The inner dict of key, copied once so the published one is left untouched."""
+        if key not in self._copied:
+            self.state[key] = dict(self.state.get(key) or {})
+            self._copied.add(key)
+        return self.state[key]
+
+    def set(self, key, value, sub_key=None):
+        if sub_key is None:
+            self.state[key] = value
+            self._copied.add(key)  # A new object, never published yet
+        else:
+            self._own(key)[sub_key] = value
+
+    def remove(self, key, sub_key=None):
+        if sub_key is None:
+            self.state.pop(key, None)
+        elif key in self.state:
+            self._own(key).pop(sub_key, None)
 
 
 class AppState(SingletonBase):
+    """
+    Copy-on-write application state.
+
+    track_state is an immutable snapshot that is replaced as a whole, so readers never lock and always
+    see a consistent state. Writers build the next snapshot inside transaction(), serialised by
+    self.lock, and publish it with a single assignment; a transaction that raises publishes nothing.
+    set() and remove() outside a transaction are one-change transactions. Values handed out by get()
+    belong to a published snapshot and must not be mutated in place.
+
+    subscribe() registers a callback for a key. After each publish, callbacks of the keys that changed
+    get a StateChange, on the writer's thread and outside the lock, so they should be quick.
+    """
+
     def __init__(self):
         if getattr(self, '_singleton_initialized', True):
             logger.debug(f"Instance for {self.__class__.__name__} already initialized.")
             return
-        self.track_state = {}
-        self.element_locks = {}
-        self.lock = threading.RLock()
+        self.track_state = MappingProxyType({})
+        self.version = 0  # Incremented on every publish
+        self.lock = threading.RLock()  # Serialises writers only
+        self._local = threading.local()  # Open transaction of the current thread
+        self._subscribers = {}  # key -> tuple of callbacks, replaced rather than mutated
         self._singleton_initialized = True
 
+    def subscribe(self, key, callback: Callable[[StateChange], None]) -> Callable[[], None]:
+        """Call callback with a StateChange whenever key changes; returns a function that unsubscribes."""
+        with self.lock:
+            self._subscribers = {**self._subscribers, key: self._subscribers.get(key, ()) + (callback,)}
+
+        def unsubscribe():
+            with self.lock:
+                callbacks = tuple(existing for existing in self._subscribers.get(key, ()) if existing != callback)
+                self._subscribers = {**self._subscribers, key: callbacks}
+
+        return unsubscribe
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group updates so they are published together. Inside it get() reads the pending state of this
+        thread; nested transactions join the outer one. Do not await inside a transaction.
+        """
+        if getattr(self._local, 'pending', None) is not None:
+            yield self
+            return
+        with self.lock:
+            self._local.pending = _PendingState(self.track_state)
+            try:
+                yield self
+                changes = self._publish(self._local.pending.state)
+            finally:
+                self._local.pending = None
+        self._notify(changes)
+
+    def _publish(self, state):
+        """Swap in the new snapshot; returns the changes of the subscribed keys."""
+        old_state = self.track_state
+        self.track_state = MappingProxyType(state)
+        self.version += 1
+        changes = []
+        for key, callbacks in self._subscribers.items():
+            old, new = old_state.get(key), state.get(key)
+            if callbacks and old is not new and old != new:
+                changes.append((StateChange(key, old, new, self.version), callbacks))
+        return changes
+
+    @staticmethod
+    def _notify(changes):
+        for change, callbacks in changes:
+            for callback in callbacks:
+                try:
+                    callback(change)
+                except Exception as e:
+                    logger.exception(f"App state subscriber {callback} failed on {change.key}: {e}")
+
     def get(self, key=None, sub_key=None, default=None):
+        pending = getattr(self._local, 'pending', None)
+        state = self.track_state if pending is None else pending.state
         if key is None:
-            return self.track_state
-        result = self.track_state.get(key, default)
+            return state
+        result = state.get(key, default)
         if sub_key is None:
             return result
         return result.get(sub_key, default) if isinstance(result, dict) else default
 
-    @update_lock
     def set(self, key, value, sub_key=None):
-        if sub_key is None:
-            self.track_state[key] = value
-        else:
-            if key not in self.track_state:
-                self.track_state[key] = {}
-            self.track_state[key][sub_key] = value
+        with self.transaction():
+            self._local.pending.set(key, value, sub_key)
 
-    @update_lock
     def remove(self, key, sub_key=None):
-        if sub_key is None:
-            self.track_state.pop(key, None)
-        else:
-            if key in self.track_state:
-                self.track_state[key].pop(sub_key, None)
+        with self.transaction():
+            self._local.pending.remove(key, sub_key)
+
+    def save_snapshot(self, path):
+        """Pickle track_state with its schema version and trading day, replacing the file atomically."""
+        payload = {'schema_version': SNAPSHOT_SCHEMA_VERSION, 'trading_day': today_indian(),
+                   'saved_at': timestamp_indian(), 'track_state': dict(self.track_state)}
+        data = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(path.name + '.tmp')
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+        logger.info(f"App state snapshot saved to {path} ({len(data)} bytes)")
+
+    def load_snapshot(self, path) -> bool:
+        """
+        Restore track_state from a snapshot taken earlier on the same trading day.
+        Returns False, leaving the state untouched, if there is none or it is stale or incompatible.
+        """
+        path = Path(path)
+        if not path.exists():
+            return False
+        try:
+            payload = pickle.loads(path.read_bytes())
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable app state snapshot {path}: {e}")
+            return False
+
+        if payload.get('schema_version') != SNAPSHOT_SCHEMA_VERSION:
+            logger.info(f"Ignoring app state snapshot with schema version {payload.get('schema_version')}")
+            return False
+        if payload.get('trading_day') != today_indian():
+            logger.info(f"Ignoring app state snapshot from {payload.get('trading_day')}")
+            return False
+
+        with self.lock:
+            changes = self._publish(payload['track_state'])
+        self._notify(changes)
+        logger.info(f"App state restored from snapshot saved at {payload['saved_at']}")
+        return True
 
     def set_instruments(self, value=None, sub_key=None):
-        self.set(Xref.SYMBOL_INSTR_XREF, value, sub_key)
-        self.set(Xref.INSTR_SYMBOL_XREF, reverse_dict(value, reverse_key='instrument_token', use_type=None), sub_key)
-
-    # Specific set methods
+        with self.transaction():
+            instr_symbol_xref = reverse_dict(value, reverse_key='instrument_token', use_type=None)
+            self.set(Xref.SYMBOL_INSTR_XREF, value, sub_key)
+            self.set(Xref.INSTR_SYMBOL_XREF, instr_symbol_xref, sub_key)
+            if sub_key is None:
+                self._set_exchange_codes(instr_symbol_xref)
+
+    def _set_exchange_codes(self, instr_symbol_xref):
+        """Encode the exchange of every instrument once, so the track list never compares strings."""
+        tokens = np.fromiter(instr_symbol_xref.keys(), dtype=np.int64, count=len(instr_symbol_xref))
+        exchanges = np.array([(symbol or '').rpartition(':')[2] for symbol in instr_symbol_xref.values()],
+                             dtype=object)
+        order = np.argsort(tokens)
+        names, codes = np.unique(exchanges[order], return_inverse=True)
+        self.set(Xref.INSTR_TOKENS, tokens[order])
+        self.set(Xref.INSTR_EXCHANGE_CODES, codes.astype(np.int32))
+        self.set(Xref.EXCHANGE_CODES, {name: code for code, name in enumerate(names.tolist())})
+
+    def _exchange_codes_of(self, tokens):
+        """Exchange code of each token, -1 for tokens that are not in the instrument list."""
+        if self.get(Xref.INSTR_TOKENS) is None:
+            self._set_exchange_codes(self.get(Xref.INSTR_SYMBOL_XREF) or {})
+        all_tokens, all_codes = self.get(Xref.INSTR_TOKENS), self.get(Xref.INSTR_EXCHANGE_CODES)
+        if not len(all_tokens):
+            return np.full(len(tokens), -1, dtype=np.int32)
+        positions = np.minimum(np.searchsorted(all_tokens, tokens), len(all_tokens) - 1)
+        return np.where(all_tokens[positions] == tokens, all_codes[positions], -1)
+
+    # Specific set methods; each publishes the records together with their xrefs
     def set_positions(self, value=None, sub_key=None):
-        self.set(Xref.POSITIONS, value, sub_key)
-        symbol_instr_xref = self.get(Xref.SYMBOL_INSTR_XREF)
-        symbol_id_xref, instr_id_xref = create_instr_symbol_xref(value, symbol_instr_xref,
-                                                                 reverse_key='symbol_exchange')
-        self.set(Xref.SYMBOL_POSITIONS, symbol_id_xref, sub_key)
-        self.set(Xref.INSTR_POSITIONS, instr_id_xref, sub_key)
+        self._set_with_xrefs(value, sub_key, Xref.POSITIONS, Xref.SYMBOL_POSITIONS, Xref.INSTR_POSITIONS)
 
     def set_holdings(self, value=None, sub_key=None):
-        self.set(Xref.HOLDINGS, value, sub_key)
-        symbol_instr_xref = self.get(Xref.SYMBOL_INSTR_XREF)
-        symbol_id_xref, instr_id_xref = create_instr_symbol_xref(value, symbol_instr_xref,
-                                                                 reverse_key='symbol_exchange')
-        self.set(Xref.SYMBOL_HOLDINGS, symbol_id_xref, sub_key)
-        self.set(Xref.INSTR_HOLDINGS, instr_id_xref, sub_key)
+        self._set_with_xrefs(value, sub_key, Xref.HOLDINGS, Xref.SYMBOL_HOLDINGS, Xref.INSTR_HOLDINGS)
 
     def set_watchlist(self, value=None, sub_key=None):
-        self.set(Xref.WATCHLISTS, value, sub_key)
-        symbol_instr_xref = self.get(Xref.SYMBOL_INSTR_XREF)
-        symbol_id_xref, instr_id_xref = create_instr_symbol_xref(value, symbol_instr_xref,
-                                                                 reverse_key='symbol_exchange')
-        self.set(Xref.SYMBOL_WATCHLISTS, symbol_id_xref, sub_key)
-        self.set(Xref.INSTR_WATCHLISTS, instr_id_xref, sub_key)
+        self._set_with_xrefs(value, sub_key, Xref.WATCHLISTS, Xref.SYMBOL_WATCHLISTS, Xref.INSTR_WATCHLISTS)
+
+    def _set_with_xrefs(self, value, sub_key, key, symbol_key, instr_key):
+        with self.transaction():
+            self.set(key, value, sub_key)
+            symbol_instr_xref = self.get(Xref.SYMBOL_INSTR_XREF)
+            symbol_id_xref, instr_id_xref = create_instr_symbol_xref(value, symbol_instr_xref,
+                                                                     reverse_key='symbol_exchange')
+            self.set(symbol_key, symbol_id_xref, sub_key)
+            self.set(instr_key, instr_id_xref, sub_key)
 
     @track_it()
     def set_track_list(self, unique_exchanges):
-        track_instr_xref_by_category = defaultdict(dict)
-        track_instr_xref_xchange = defaultdict(set)
-
-        track_instr_set = defaultdict(set)
-
-        # Populate cross-reference and token sets
-        for key, val in self.get(Xref.INSTR_POSITIONS).items():
-            track_instr_xref_by_category[key]['p'] = val
-            track_instr_set[key].update(val)
-
-        for key, val in self.get(Xref.INSTR_HOLDINGS).items():
-            track_instr_xref_by_category[key]['h'] = val
-            track_instr_set[key].update(val)
-
-        for key, val in self.get(Xref.INSTR_WATCHLISTS).items():
-            track_instr_xref_by_category[key]['w'] = val
-            track_instr_set[key].update(val)
-
-        # Finalize dicts
-        track_instr_xref_by_category = dict(track_instr_xref_by_category)
-        track_instr_set = dict(track_instr_set)
-
-        # Prepare for exchange-specific mapping
-
-        exchange_specific_instr = set()
-        instr_symbol_xref = self.get(Xref.INSTR_SYMBOL_XREF)
-
-        for exchange in unique_exchanges:
-            if exchange != '*':
-                for token in track_instr_set:
-                    symbol = instr_symbol_xref.get(token)
-                    if symbol and symbol.endswith(f':{exchange}'):
-                        track_instr_xref_xchange[exchange].add(token)
-                        exchange_specific_instr.add(token)
-
-        # Assign tokens without a specific exchange under '*'
-        wildcard_instr = set(track_instr_set.keys()) - exchange_specific_instr
-        track_instr_xref_xchange['*'].update(wildcard_instr)
-
-        track_instr_symbol_xref = {i: instr_symbol_xref[i] for i in track_instr_set}
+        """
+        Rebuild the track list from the positions, holdings and watchlist xrefs. Tokens are grouped by
+        exchange with integer exchange codes; tokens on none of unique_exchanges go under '*'.
+        """
+        with self.transaction():
+            instr_xrefs = {category: self.get(keys[2]) or {} for category, keys in CATEGORY_KEYS.items()}
+            tracked = np.unique(np.concatenate(
+                [np.fromiter(xref.keys(), dtype=np.int64, count=len(xref)) for xref in instr_xrefs.values()]))
+            tracked_tokens = tracked.tolist()
+
+            track_instr_xref_by_category = {token: {} for token in tracked_tokens}
+            for category, xref in instr_xrefs.items():
+                for token, record_ids in xref.items():
+                    track_instr_xref_by_category[token][category] = record_ids
+
+            codes = self._exchange_codes_of(tracked)
+            exchange_codes = self.get(Xref.EXCHANGE_CODES)
+            track_instr_xref_xchange = {}
+            exchange_specific = np.zeros(len(tracked), dtype=bool)
+            for exchange in unique_exchanges:
+                code = exchange_codes.get(exchange)
+                if exchange == '*' or code is None:
+                    continue
+                in_exchange = codes == code
+                if in_exchange.any():
+                    track_instr_xref_xchange[exchange] = set(tracked[in_exchange].tolist())
+                    exchange_specific |= in_exchange
+            track_instr_xref_xchange['*'] = set(tracked[~exchange_specific].tolist())
+
+            instr_symbol_xref = self.get(Xref.INSTR_SYMBOL_XREF)
+            track_instr_symbol_xref = bidict({token: instr_symbol_xref[token] for token in tracked_tokens})
+            self.set(Xref.TRACK_INSTR_SYMBOL_XREF, track_instr_symbol_xref)
+            self.set(Xref.TRACK_INSTR_XREF_XCHANGE, track_instr_xref_xchange)
+            self.set(Xref.TRACK_INSTR_XREF_BY_CATEGORY, track_instr_xref_by_category)
+            self.set(Xref.TRACK_EXCHANGES, tuple(unique_exchanges))
+
+    # ─── Incremental track list updates ─────────────────────────────────────────
+
+    def upsert_tracked(self, category, record_id, record):
+        """Add or replace one position ('p'), holding ('h') or watchlist ('w') record and its xrefs."""
+        records_key = CATEGORY_KEYS[category][0]
+        with self.transaction():
+            old = (self.get(records_key) or {}).get(record_id)
+            self.set(records_key, record, record_id)
+            if old and old['symbol_exchange'] == record['symbol_exchange']:
+                return
+            if old:
+                self._untrack(category, record_id, old['symbol_exchange'])
+            self._track(category, record_id, record['symbol_exchange'])
+
+    def remove_tracked(self, category, record_id):
+        """Remove one position, holding or watchlist record and drop its token once nothing refers to it."""
+        records_key = CATEGORY_KEYS[category][0]
+        with self.transaction():
+            old = (self.get(records_key) or {}).get(record_id)
+            if old is None:
+                return
+            self.remove(records_key, record_id)
+            self._untrack(category, record_id, old['symbol_exchange'])
+
+    def _track(self, category, record_id, symbol):
+        _, symbol_key, instr_key = CATEGORY_KEYS[category]
+        instrument = self.get(Xref.SYMBOL_INSTR_XREF, symbol)
+        if not instrument:
+            logger.warning(f"{symbol} is not in the instrument list; not tracked")
+            return
+        token = instrument['instrument_token']
+        self.set(symbol_key, (self.get(symbol_key, symbol) or set()) | {record_id}, symbol)
+        self.set(instr_key, (self.get(instr_key, token) or set()) | {record_id}, token)
+        self._retrack_token(token)
+
+    def _untrack(self, category, record_id, symbol):
+        _, symbol_key, instr_key = CATEGORY_KEYS[category]
+        instrument = self.get(Xref.SYMBOL_INSTR_XREF, symbol)
+        if not instrument:
+            return
+        token = instrument['instrument_token']
+        for key, sub_key in ((symbol_key, symbol), (instr_key, token)):
+            record_ids = (self.get(key, sub_key) or set()) - {record_id}
+            if record_ids:
+                self.set(key, record_ids, sub_key)
+            else:
+                self.remove(key, sub_key)
+        self._retrack_token(token)
+
+    def _retrack_token(self, token):
+        """Bring the track list entries of one token in line with its category xrefs."""
+        categories = {category: record_ids for category, keys in CATEGORY_KEYS.items()
+                      if (record_ids := self.get(keys[2], token))}
+        was_tracked = token in (self.get(Xref.TRACK_INSTR_XREF_BY_CATEGORY) or {})
+        if categories:
+            self.set(Xref.TRACK_INSTR_XREF_BY_CATEGORY, categories, token)
+        else:
+            self.remove(Xref.TRACK_INSTR_XREF_BY_CATEGORY, token)
+        if bool(categories) == was_tracked:
+            return
 
-        # Convert to regular dict if needed
-        track_instr_xref_xchange = dict(track_instr_xref_xchange)
+        code = self._exchange_codes_of(np.array([token], dtype=np.int64))[0]
+        exchange = next((name for name, exchange_code in self.get(Xref.EXCHANGE_CODES).items()
+                         if exchange_code == code), None)
+        if exchange not in (self.get(Xref.TRACK_EXCHANGES) or ()) or exchange == '*':
+            exchange = '*'
+        exchange_tokens = set(self.get(Xref.TRACK_INSTR_XREF_XCHANGE, exchange) or ())
+        track_instr_symbol_xref = bidict(self.get(Xref.TRACK_INSTR_SYMBOL_XREF) or {})
+        if categories:
+            exchange_tokens.add(token)
+            track_instr_symbol_xref[token] = self.get(Xref.INSTR_SYMBOL_XREF)[token]
+        else:
+            exchange_tokens.discard(token)
+            track_instr_symbol_xref.pop(token, None)
 
-        self.set(Xref.TRACK_INSTR_SYMBOL_XREF, bidict(track_instr_symbol_xref))
-        self.set(Xref.TRACK_INSTR_XREF_XCHANGE, track_instr_xref_xchange)
-        self.set(Xref.TRACK_INSTR_XREF_BY_CATEGORY, track_instr_xref_by_category)
+        if exchange_tokens or exchange == '*':
+            self.set(Xref.TRACK_INSTR_XREF_XCHANGE, exchange_tokens, exchange)
+        else:
+            self.remove(Xref.TRACK_INSTR_XREF_XCHANGE, exchange)
+        self.set(Xref.TRACK_INSTR_SYMBOL_XREF, track_instr_symbol_xref)
 
 
 # Singleton instance
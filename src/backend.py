@@ -4,7 +4,12 @@ import threading
 from flask import Flask, jsonify  # Import current_app for accessing app context
 
 from src.app_initializer import app_initializer
+from src.core.broker_sync import broker_sync
+from src.core.write_behind import write_behind
+from src.helpers.database_manager import db
 from src.helpers.logger import get_logger
+from src.settings.parameter_manager import parms
+from src.thread_scheduler import thread_scheduler
 # Assuming TickQueueManager might be populated by app_initializer
 from src.ticks.tick_queue_manager import TickQueueManager
 
@@ -48,6 +53,24 @@ def get_ticks():
         return jsonify({"error": "An internal error occurred"}), 500
 
 
+@app.route('/metrics/db_pool', methods=['GET'])
+def get_db_pool_metrics():
+    """Connection pool metrics of the sync and async engines."""
+    return jsonify(db.get_pool_metrics())
+
+
+@app.route('/metrics/write_behind', methods=['GET'])
+def get_write_behind_metrics():
+    """Queue depth, lag and flush counters of the write-behind queue."""
+    return jsonify(write_behind.metrics())
+
+
+@app.route('/metrics/broker_sync', methods=['GET'])
+def get_broker_sync_metrics():
+    """Polling interval, changes and failures of each broker sync feed."""
+    return jsonify(broker_sync.metrics())
+
+
 # Backend process, including Flask server
 async def backend_process():
     logger.info("Starting backend process...")
@@ -60,6 +83,16 @@ async def backend_process():
 
     logger.info("app_initializer setup complete.")
 
+    # Batch state upserts off the request path
+    await write_behind.start()
+
+    # Keep positions, holdings and orders current intraday, after any warm-start refresh
+    if parms.BROKER_SYNC_ENABLED:
+        await broker_sync.start(after=app_initializer.refresh_task)
+
+    # Run the thread_list / thread_schedule jobs at their schedule openings
+    await thread_scheduler.start()
+
     # --- Create the TickQueueManager instance ONCE after setup ---
     # This is crucial. Create the instance here and store it.
     # If app_initializer.setup() returns the instance, get it from there.
@@ -115,6 +148,10 @@ async def backend_process():
     except KeyboardInterrupt:
         logger.info("Main loop interrupted by user (Ctrl+C).")
     finally:
+        thread_scheduler.shutdown()
+        await broker_sync.stop()
+        await write_behind.stop()
+        app_initializer.save_app_state()
         logger.info("Main thread exiting.")
         # Any cleanup logic can go here
 
@@ -0,0 +1,284 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Optional
+
+from src.app_state_manager import app_state, CATEGORY_KEYS
+from src.core.singleton_base import SingletonBase
+from src.core.write_behind import write_behind
+from src.core.zerodha_kite_connect import ZerodhaKiteConnect
+from src.helpers.date_time_utils import timestamp_indian
+from src.helpers.lazy_import import lazy_import
+from src.helpers.logger import get_logger
+from src.helpers.rate_limiter import AsyncRateLimiter
+from src.services.service_holdings import service_holdings
+from src.services.service_positions import service_positions
+from src.settings.parameter_manager import parms
+
+logger = get_logger(__name__)
+
+pd = lazy_import("pandas")
+
+POSITION_KEY_COLUMNS = ('type', 'account', 'tradingsymbol', 'exchange', 'product')
+HOLDING_KEY_COLUMNS = tuple(service_holdings.conflict_cols)
+
+# An order is re-written only when one of these moves
+ORDER_SIGNATURE_COLUMNS = ('status', 'quantity', 'price', 'trigger_price', 'average_price', 'filled_quantity',
+                           'pending_quantity', 'cancelled_quantity', 'exchange_update_timestamp')
+
+
+def _comparable(value):
+    """Kite returns floats and text timestamps, the DB Decimals and datetimes; compare them as Kite sends them."""
+    if isinstance(value, (float, Decimal)):
+        return round(float(value), 4)
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return value
+
+
+def _differs(current: dict, fresh: dict) -> bool:
+    return any(_comparable(current.get(column)) != _comparable(value) for column, value in fresh.items())
+
+
+def _order_signature(order) -> tuple:
+    return tuple(_comparable(order.get(column)) for column in ORDER_SIGNATURE_COLUMNS)
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    return getattr(error, 'code', None) == 429 or 'too many requests' in str(error).lower()
+
+
+@dataclass
+class SyncFeed:
+    """One polled Kite endpoint and its adaptive schedule."""
+    name: str
+    fetch: Callable[[], Any]  # Blocking Kite call
+    apply: Callable[[Any], Awaitable[int]]  # Applies a response, returns the number of changes
+    base_interval: float
+    interval: float = 0.0
+    next_run: float = 0.0
+    polls: int = 0
+    changes: int = 0
+    failures: int = 0
+    last_error: Optional[str] = None
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)  # One poll of the feed at a time
+
+
+class BrokerSync(SingletonBase):
+    """
+    Intraday sync of positions, holdings and orders from the Kite REST API.
+
+    Each feed is polled on its own interval through one rate limiter (KITE_SYNC_MIN_INTERVAL between
+    calls). Responses are diffed against AppState (orders against the version stored) and only the
+    differences are applied: changed rows go through the write-behind queue, new and closed rows are
+    inserted and deleted directly so their ids are known, and AppState is updated in one transaction
+    per poll. A poll with changes resets the feed to its base interval, a quiet poll stretches it by
+    SYNC_IDLE_BACKOFF and a failure doubles it (more when Kite reports a rate limit), all capped at
+    SYNC_MAX_INTERVAL.
+    """
+
+    def __init__(self):
+        if getattr(self, '_singleton_initialized', False):
+            logger.debug(f"Instance for {self.__class__.__name__} already initialized.")
+            return
+        self.feeds = {feed.name: feed for feed in (
+            SyncFeed('positions', lambda: self.get_kite_conn().positions(), self.apply_positions,
+                     parms.SYNC_POSITIONS_INTERVAL),
+            SyncFeed('holdings', lambda: self.get_kite_conn().holdings(), self.apply_holdings,
+                     parms.SYNC_HOLDINGS_INTERVAL),
+            SyncFeed('orders', lambda: self.get_kite_conn().orders(), self.apply_orders,
+                     parms.SYNC_ORDERS_INTERVAL),
+        )}
+        self.order_signatures = {}  # order_id -> signature of the version in the table
+        self._signatures_loaded = False
+        self.limiter = AsyncRateLimiter(1, parms.KITE_SYNC_MIN_INTERVAL)
+        self._task = None
+        self._singleton_initialized = True
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @staticmethod
+    def get_kite_conn():
+        return ZerodhaKiteConnect().get_kite_conn(test_conn=False)
+
+    # ─── Scheduling ─────────────────────────────────────────────────────────────
+
+    async def start(self, after: Optional[asyncio.Task] = None):
+        """Start polling, once after (e.g. a warm-start refresh rebuilding the same tables) has finished."""
+        if self.running:
+            return
+        now = time.monotonic()
+        for feed in self.feeds.values():
+            feed.interval = feed.base_interval
+            feed.next_run = now + feed.base_interval  # Startup has just fetched them
+        self._task = asyncio.create_task(self._run(after), name="broker_sync")
+        logger.info("Broker sync started: " + ", ".join(
+            f"{feed.name} every {feed.base_interval}s" for feed in self.feeds.values()))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._signatures_loaded = False
+            logger.info("Broker sync stopped")
+
+    async def _run(self, after):
+        if after is not None:
+            await asyncio.wait([after])
+        while True:
+            due = [feed for feed in self.feeds.values() if feed.next_run <= time.monotonic()]
+            if due:
+                await asyncio.gather(*(self.poll(feed) for feed in due))
+            next_run = min(feed.next_run for feed in self.feeds.values())
+            await asyncio.sleep(max(next_run - time.monotonic(), 0.05))
+
+    async def sync_now(self, name) -> int:
+        """Poll one feed right away; the scheduled jobs use it instead of rebuilding the table."""
+        return await self.poll(self.feeds[name])
+
+    async def poll(self, feed: SyncFeed) -> int:
+        """Fetch and apply one feed. A scheduled sync_now and the loop wait for each other on the feed's lock."""
+        changes = 0
+        async with feed.lock:
+            try:
+                async with self.limiter:
+                    response = await asyncio.to_thread(feed.fetch)
+                changes = await feed.apply(response)
+            except Exception as e:
+                feed.failures += 1
+                feed.last_error = str(e)
+                factor = parms.SYNC_RATE_LIMIT_BACKOFF if _is_rate_limited(e) else 2
+                feed.interval = min(feed.interval * factor, parms.SYNC_MAX_INTERVAL)
+                logger.warning(f"Broker sync of {feed.name} failed ({feed.failures} in a row), "
+                               f"next try in {feed.interval:.1f}s: {e}")
+            else:
+                feed.polls += 1
+                feed.failures = 0
+                feed.changes += changes
+                if changes:
+                    feed.interval = feed.base_interval
+                    logger.debug(f"Broker sync applied {changes} {feed.name} changes")
+                else:
+                    feed.interval = min(feed.interval * parms.SYNC_IDLE_BACKOFF, parms.SYNC_MAX_INTERVAL)
+            feed.next_run = time.monotonic() + feed.interval
+        return changes
+
+    # ─── Diffing ────────────────────────────────────────────────────────────────
+
+    async def apply_positions(self, response) -> int:
+        return await self._apply_records('p', service_positions, service_positions.normalize(response),
+                                         POSITION_KEY_COLUMNS)
+
+    async def apply_holdings(self, response) -> int:
+        return await self._apply_records('h', service_holdings, service_holdings.normalize(response),
+                                         HOLDING_KEY_COLUMNS)
+
+    @staticmethod
+    async def _apply_records(category, service, records, key_columns) -> int:
+        """Apply the difference between the fetched records and AppState to the table and AppState."""
+        table_columns = {column.name for column in service.model.__table__.columns} - {'id'}
+        fresh = {}
+        for record in records:
+            record = {column: value for column, value in record.items() if column in table_columns}
+            fresh[tuple(record.get(column) for column in key_columns)] = record
+
+        current = {tuple(record.get(column) for column in key_columns): (record_id, record)
+                   for record_id, record in (app_state.get(CATEGORY_KEYS[category][0]) or {}).items()}
+        changed = [(current[key][0], {**current[key][1], **record}, record) for key, record in fresh.items()
+                   if key in current and _differs(current[key][1], record)]
+        added = [record for key, record in fresh.items() if key not in current]
+        removed = [current[key][0] for key in current.keys() - fresh.keys()]
+        if not (changed or added or removed):
+            return 0
+
+        now = timestamp_indian()
+        for record_id, _, record in changed:
+            service.upsert_later({**record, 'id': record_id, 'upd_timestamp': now}, key_cols=['id'])
+        if removed:
+            await write_behind.flush()  # A queued update must not bring a deleted row back
+            await service.delete_by_ids(removed)
+        added_ids = [await service.insert_record(record) for record in added]
+
+        with app_state.transaction():  # Subscribers see the whole poll as one change
+            for record_id, merged, _ in changed:
+                app_state.upsert_tracked(category, record_id, merged)
+            for record_id in removed:
+                app_state.remove_tracked(category, record_id)
+            for record_id, record in zip(added_ids, added):
+                if record_id is not None:
+                    app_state.upsert_tracked(category, record_id, {**record, 'id': record_id})
+        logger.info(f"{service.table_name}: {len(changed)} changed, {len(added)} new, {len(removed)} closed")
+        return len(changed) + len(added) + len(removed)
+
+    async def load_order_signatures(self):
+        """Seed the signatures from the table, so a restart does not rewrite every order of the day."""
+        from src.services.service_orders import service_orders
+
+        rows = await service_orders.get_existing_records(['order_id', *ORDER_SIGNATURE_COLUMNS])
+        self.order_signatures = {row[0]: tuple(_comparable(value) for value in row[1:]) for row in rows}
+        self._signatures_loaded = True
+        logger.info(f"Loaded the signatures of {len(self.order_signatures)} stored orders")
+
+    def parents_first(self, orders) -> list:
+        """
+        Split orders into batches in which every parent_order_id is already stored or in an earlier batch,
+        since the column references orders.order_id. Parents that are neither (e.g. Kite no longer returns
+        them) are cleared, as the table does when a parent is deleted.
+        """
+        known = set(self.order_signatures)
+        order_ids = {order['order_id'] for order in orders}
+        orphans = {order['order_id'] for order in orders
+                   if order.get('parent_order_id') and order['parent_order_id'] not in known | order_ids}
+        if orphans:
+            logger.warning(f"Storing orders {sorted(orphans)} without their parent orders, which are not synced")
+        pending = [{**order, 'parent_order_id': None} if order['order_id'] in orphans else order for order in orders]
+
+        batches = []
+        while pending:
+            batch = [order for order in pending
+                     if not order.get('parent_order_id') or order['parent_order_id'] in known]
+            batch = batch or pending  # Only a parent cycle could leave nothing ready
+            known.update(order['order_id'] for order in batch)
+            batches.append(batch)
+            pending = [order for order in pending if order['order_id'] not in known]
+        return batches
+
+    async def apply_orders(self, orders) -> int:
+        """Upsert the orders that are new or whose status, prices or fills moved since they were stored."""
+        if not self._signatures_loaded:
+            await self.load_order_signatures()
+        changed = [order for order in orders if self.order_signatures.get(order['order_id']) != _order_signature(order)]
+        if not changed:
+            return 0
+
+        from src.services.service_orders import service_orders  # Loads pandas only once orders are synced
+
+        for batch in self.parents_first(changed):
+            records_df = pd.DataFrame(batch)
+            records_df['account'] = parms.DEF_ACCOUNT
+            await service_orders.bulk_insert_orders(records_df)
+            for order in batch:
+                self.order_signatures[order['order_id']] = _order_signature(order)
+        return len(changed)
+
+    # ─── Metrics ────────────────────────────────────────────────────────────────
+
+    def metrics(self) -> dict:
+        now = time.monotonic()
+        return {feed.name: {'interval_s': round(feed.interval, 1),
+                            'next_poll_in_s': round(max(feed.next_run - now, 0), 1) if self.running else None,
+                            'polls': feed.polls, 'changes': feed.changes, 'failures': feed.failures,
+                            'last_error': feed.last_error}
+                for feed in self.feeds.values()}
+
+
+# Singleton instance
+broker_sync = BrokerSync()
@@ -1,4 +1,3 @@
-import threading
 import time
 from functools import wraps
 from inspect import iscoroutinefunction
@@ -72,30 +71,3 @@ def lock_it_for_update(method):
         with self.lock:
             return method(self, *args, **kwargs)
     return wrapper
-
-
-
-def update_lock(method):
-    """
-    Decorator that ensures method execution is thread-safe using global and per-element locks.
-    The element key is assumed to be the first positional argument.
-    """
-    @wraps(method)
-    def wrapper(self, *args, **kwargs):
-        key = args[0] if args else None  # get key if passed
-
-        with self.lock:
-            if key:
-                if key not in self.element_locks:
-                    self.element_locks[key] = threading.Lock()
-                lock = self.element_locks[key]
-            else:
-                lock = self.lock
-
-        with lock:
-            return method(self, *args, **kwargs)
-
-    return wrapper
-
-
-
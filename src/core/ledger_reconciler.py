@@ -0,0 +1,54 @@
+import pandas as pd
+
+from src.helpers.date_time_utils import INDIAN_TIMEZONE
+from src.helpers.logger import get_logger
+
+logger = get_logger(__name__)
+
+AMOUNT_COLUMNS = ['debit', 'credit', 'net_balance']
+
+
+def reconcile_balances(ledger: pd.DataFrame, tolerance: float = 0.01) -> pd.DataFrame:
+    """
+    Check running net_balance continuity per account.
+
+    Within an account, net_balance minus the cumulative sum of (credit - debit) must stay constant;
+    wherever that offset moves by more than the tolerance, the entry is flagged as a balance gap and
+    gap_amount holds the unexplained difference. Entries without a posting_date (opening/closing
+    summary rows) are left out. Entries are ordered by posting_date, then by id (report order).
+    """
+    ledger = ledger.dropna(subset=['posting_date']).sort_values(['account', 'posting_date', 'id'], kind='stable')
+    ledger = ledger.reset_index(drop=True)
+    for column in AMOUNT_COLUMNS:
+        ledger[column] = pd.to_numeric(ledger[column], errors='coerce').astype(float).fillna(0.0)
+
+    flow = ledger['credit'] - ledger['debit']
+    offset = ledger['net_balance'] - flow.groupby(ledger['account']).cumsum()
+    drift = offset.groupby(ledger['account']).diff().fillna(0.0)
+
+    ledger['balance_gap'] = drift.abs() > tolerance
+    ledger['gap_amount'] = drift.where(ledger['balance_gap'], 0.0)
+    return ledger
+
+
+def daily_cash_flow(ledger: pd.DataFrame) -> pd.DataFrame:
+    """Daily credit, debit, net flow, closing balance and gap count per account from a reconciled ledger."""
+    flow_date = pd.to_datetime(ledger['posting_date'], utc=True).dt.tz_convert(INDIAN_TIMEZONE).dt.date
+    daily = ledger.assign(flow_date=flow_date).groupby(['account', 'flow_date'], sort=True).agg(
+        credit=('credit', 'sum'),
+        debit=('debit', 'sum'),
+        closing_balance=('net_balance', 'last'),
+        entries=('net_balance', 'size'),
+        balance_gaps=('balance_gap', 'sum'),
+    ).reset_index()
+    daily['net_flow'] = daily['credit'] - daily['debit']
+    return daily.round({'credit': 4, 'debit': 4, 'net_flow': 4, 'closing_balance': 4})
+
+
+def log_gaps(ledger: pd.DataFrame, samples: int = 5):
+    gaps = ledger[ledger['balance_gap']]
+    if gaps.empty:
+        logger.info(f"Ledger balances reconciled: {len(ledger)} entries, no gaps")
+        return
+    logger.warning(f"Ledger balance gaps: {len(gaps)} of {len(ledger)} entries; first ones:\n"
+                   f"{gaps[['account', 'posting_date', 'particulars', 'net_balance', 'gap_amount']].head(samples)}")
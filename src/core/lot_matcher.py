@@ -0,0 +1,113 @@
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+LONG = 'LONG'
+SHORT = 'SHORT'
+
+
+@dataclass
+class OpenLot:
+    side: str
+    quantity: int
+    price: float
+    trade_id: int
+    time: object
+    row_id: int
+
+
+@dataclass
+class ClosedLot:
+    side: str
+    quantity: int
+    open_price: float
+    open_trade_id: int
+    open_time: object
+    open_row_id: int
+    close_price: float
+    close_trade_id: int
+    close_time: object
+    close_row_id: int
+
+    @property
+    def realized_pnl(self) -> float:
+        direction = 1 if self.side == LONG else -1
+        return direction * (self.close_price - self.open_price) * self.quantity
+
+
+class FifoLotQueue:
+    """
+    Open lots of one (account, symbol) as parallel NumPy arrays with a head pointer.
+
+    All open lots are on the same side. A trade on the opposite side consumes lots from the head
+    (oldest first); whatever is left of it opens on its own side once the queue is empty.
+    Capacity is fixed up front (existing open lots + trades to process), so nothing is reallocated.
+    """
+
+    def __init__(self, capacity: int):
+        self.quantity = np.zeros(capacity, dtype=np.int64)
+        self.price = np.zeros(capacity, dtype=np.float64)
+        self.trade_id = np.zeros(capacity, dtype=np.int64)
+        self.row_id = np.zeros(capacity, dtype=np.int64)
+        self.time = np.empty(capacity, dtype=object)
+        self.head = 0
+        self.tail = 0
+        self.side: Optional[str] = None
+
+    def __len__(self):
+        return self.tail - self.head
+
+    def push(self, side, quantity, price, trade_id, time, row_id):
+        if not len(self):
+            self.head = self.tail = 0  # Reuse the arrays from the start once emptied
+            self.side = side
+        i = self.tail
+        self.quantity[i], self.price[i], self.trade_id[i] = quantity, price, trade_id
+        self.time[i], self.row_id[i] = time, row_id
+        self.tail += 1
+
+    def close(self, quantity, price, trade_id, time, row_id) -> Tuple[List[ClosedLot], int]:
+        """Match up to quantity against the oldest lots; returns the closed lots and the unmatched rest."""
+        closed = []
+        while quantity and len(self):
+            i = self.head
+            matched = min(quantity, int(self.quantity[i]))
+            closed.append(ClosedLot(self.side, matched, float(self.price[i]), int(self.trade_id[i]), self.time[i],
+                                    int(self.row_id[i]), price, trade_id, time, row_id))
+            self.quantity[i] -= matched
+            quantity -= matched
+            if not self.quantity[i]:
+                self.head += 1
+        return closed, quantity
+
+    def open_lots(self) -> List[OpenLot]:
+        return [OpenLot(self.side, int(self.quantity[i]), float(self.price[i]), int(self.trade_id[i]), self.time[i],
+                        int(self.row_id[i]))
+                for i in range(self.head, self.tail)]
+
+
+def match_fifo(trades: Sequence[dict], open_lots: Sequence[OpenLot] = ()) -> Tuple[List[ClosedLot], List[OpenLot]]:
+    """
+    FIFO-match trades of one (account, symbol), continuing from its open lots.
+
+    trades must be ordered by execution time and carry trade_type ('buy'/'sell'), quantity, price,
+    trade_id, order_execution_time and id (the report_tradebook row id).
+    """
+    queue = FifoLotQueue(len(open_lots) + len(trades))
+    for lot in open_lots:
+        queue.push(lot.side, lot.quantity, lot.price, lot.trade_id, lot.time, lot.row_id)
+
+    closed_lots = []
+    for trade in trades:
+        side = LONG if trade['trade_type'] == 'buy' else SHORT
+        price = float(trade['price'])
+        quantity = int(trade['quantity'])
+        if len(queue) and queue.side != side:
+            closed, quantity = queue.close(quantity, price, trade['trade_id'], trade['order_execution_time'],
+                                           trade['id'])
+            closed_lots.extend(closed)
+        if quantity:
+            queue.push(side, quantity, price, trade['trade_id'], trade['order_execution_time'], trade['id'])
+
+    return closed_lots, queue.open_lots()
@@ -0,0 +1,213 @@
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.helpers.date_time_utils import current_time_indian, timestamp_indian, INDIAN_TIMEZONE
+from src.helpers.logger import get_logger
+
+logger = get_logger(__name__)
+
+WILDCARD = '*'
+WEEKDAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+MAX_LOOKAHEAD_DAYS = 366
+
+
+def parse_schedule_time(value) -> Optional[time]:
+    """Parse an 'HH:MM' schedule string. Returns None for '*' or malformed values."""
+    if isinstance(value, time):
+        return value
+    if not value or value == WILDCARD:
+        return None
+    try:
+        hours, minutes = value.split(':')
+        return time(int(hours), int(minutes))
+    except (ValueError, AttributeError):
+        logger.warning(f"Invalid time format '{value}'")
+        return None
+
+
+def market_day_keys(trading_day: date) -> Tuple[str, str, str]:
+    """market_day values matching a trading day, in order of precedence: exact date, weekday, '*'."""
+    return trading_day.strftime("%Y-%m-%d"), trading_day.strftime("%A"), WILDCARD
+
+
+def resolve_day_records(records: Iterable[dict], trading_day: date) -> List[dict]:
+    """
+    Select the schedule_time records that apply on a trading day.
+
+    For every (schedule, exchange) pair only the most specific market_day is kept
+    (exact date > weekday > '*'). All records at that level are kept, so split sessions work.
+    """
+    precedence = {key: rank for rank, key in enumerate(market_day_keys(trading_day))}
+    best: Dict[Tuple[str, str], Tuple[int, List[dict]]] = {}
+
+    for record in records:
+        rank = precedence.get(record['market_day'])
+        if rank is None:
+            continue
+        pair = (record['schedule'], record['exchange'])
+        current = best.get(pair)
+        if current is None or rank < current[0]:
+            best[pair] = (rank, [record])
+        elif rank == current[0]:
+            current[1].append(record)
+
+    return [record for _, pair_records in best.values() for record in pair_records]
+
+
+def _parse_market_date(market_day: str) -> Optional[date]:
+    try:
+        return datetime.strptime(market_day, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_indian(at: Optional[datetime]) -> datetime:
+    """Defaults to now; aware datetimes are converted to IST, naive ones are taken as IST."""
+    if at is None:
+        return timestamp_indian()
+    return at.astimezone(INDIAN_TIMEZONE) if at.tzinfo else at
+
+
+def _compile_bounds(records: Iterable[dict]) -> Tuple[time, ...]:
+    """
+    Flatten the open windows of a set of records into a sorted tuple of boundaries
+    (open1, close1, open2, close2, ...). Overlapping windows are merged.
+    """
+    windows = []
+    for record in records:
+        start_time = parse_schedule_time(record['start_time'])
+        end_time = parse_schedule_time(record['end_time'])
+        if record['is_market_open'] and start_time and end_time and start_time < end_time:
+            windows.append((start_time, end_time))
+
+    merged: List[List[time]] = []
+    for start_time, end_time in sorted(windows):
+        if merged and start_time <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end_time)
+        else:
+            merged.append([start_time, end_time])
+    return tuple(bound for window in merged for bound in window)
+
+
+class MarketCalendar:
+    """
+    Immutable market calendar compiled once from all schedule_time records.
+
+    Each (exchange, schedule) pair holds a weekly template (weekday rows, else '*' rows) and
+    exact-date overrides such as holidays. A day's open windows are stored as a sorted tuple of
+    boundaries, so "open at t?" and "next transition after t?" are a bisect, O(log n).
+    Windows are half-open: open at start_time, closed from end_time.
+    """
+
+    __slots__ = ('_weekly', '_overrides')
+
+    def __init__(self, records: Iterable[dict]):
+        grouped: Dict[Tuple[str, str], Dict[str, List[dict]]] = {}
+        for record in records:
+            key = (record['exchange'], record['schedule'])
+            grouped.setdefault(key, {}).setdefault(record['market_day'], []).append(record)
+
+        weekly = {}
+        overrides = {}
+        for key, by_day in grouped.items():
+            default = _compile_bounds(by_day[WILDCARD]) if WILDCARD in by_day else None
+            weekly[key] = tuple(
+                _compile_bounds(by_day[weekday]) if weekday in by_day else default for weekday in WEEKDAYS
+            )
+            key_overrides = {}
+            for market_day, day_records in by_day.items():
+                market_date = _parse_market_date(market_day)
+                if market_date:
+                    key_overrides[market_date] = _compile_bounds(day_records)
+            overrides[key] = MappingProxyType(key_overrides)
+
+        object.__setattr__(self, '_weekly', MappingProxyType(weekly))
+        object.__setattr__(self, '_overrides', MappingProxyType(overrides))
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def get_bounds(self, exchange: str, schedule: str, day: date) -> Tuple[time, ...]:
+        """
+        Boundaries of the open windows for a day. Precedence is exact date > weekday > '*', first for
+        the exchange itself and then for the '*' exchange.
+        """
+        for key in ((exchange, schedule), (WILDCARD, schedule)):
+            bounds = self._overrides.get(key, {}).get(day)
+            if bounds is None and key in self._weekly:
+                bounds = self._weekly[key][day.weekday()]
+            if bounds is not None:
+                return bounds
+        return ()
+
+    def is_open(self, exchange: str = WILDCARD, schedule: str = 'MARKET', at: Optional[datetime] = None) -> bool:
+        """True if the exchange is open for the schedule at the given instant (defaults to now, IST)."""
+        at = _to_indian(at)
+        bounds = self.get_bounds(exchange, schedule, at.date())
+        return bisect_right(bounds, at.time()) % 2 == 1
+
+    def next_transition(self, exchange: str = WILDCARD, schedule: str = 'MARKET',
+                        at: Optional[datetime] = None) -> Optional[Tuple[datetime, bool]]:
+        """
+        Next open/close instant strictly after `at`, as (instant, is_open_after).
+        Returns None if the calendar has no opening within MAX_LOOKAHEAD_DAYS.
+        """
+        at = _to_indian(at)
+        day = at.date()
+        bounds = self.get_bounds(exchange, schedule, day)
+        index = bisect_right(bounds, at.time())
+        if index < len(bounds):
+            return datetime.combine(day, bounds[index], tzinfo=INDIAN_TIMEZONE), index % 2 == 0
+
+        for offset in range(1, MAX_LOOKAHEAD_DAYS + 1):
+            next_day = day + timedelta(days=offset)
+            bounds = self.get_bounds(exchange, schedule, next_day)
+            if bounds:
+                return datetime.combine(next_day, bounds[0], tzinfo=INDIAN_TIMEZONE), True
+        return None
+
+    def next_open(self, exchange: str = WILDCARD, schedule: str = 'MARKET',
+                  at: Optional[datetime] = None) -> Optional[datetime]:
+        """Next instant after `at` at which the schedule opens."""
+        transition = self.next_transition(exchange, schedule, at)
+        if transition and not transition[1]:
+            transition = self.next_transition(exchange, schedule, transition[0])
+        return transition[0] if transition else None
+
+    def get_exchanges(self, schedule: Optional[str] = None) -> List[str]:
+        return sorted({exchange for exchange, key_schedule in self._weekly
+                       if schedule is None or key_schedule == schedule})
+
+    def __repr__(self):
+        return f"<MarketCalendar(keys={sorted(self._weekly)})>"
+
+
+class DaySchedule:
+    """
+    One trading day of a MarketCalendar: the schedule_time records that apply on it, with windows and
+    open checks answered by the calendar, so both use the same merged, half-open windows.
+    """
+
+    def __init__(self, trading_day: date, records: Iterable[dict], calendar: Optional[MarketCalendar] = None):
+        records = list(records)
+        self.trading_day = trading_day
+        self.records = resolve_day_records(records, trading_day)
+        self.calendar = calendar or MarketCalendar(records)
+
+    def get_windows(self, exchange: str = WILDCARD, schedule: str = 'MARKET') -> Tuple[Tuple[time, time], ...]:
+        """Open windows for an exchange, falling back to the '*' exchange when it has no own records."""
+        bounds = self.calendar.get_bounds(exchange, schedule, self.trading_day)
+        return tuple(zip(bounds[::2], bounds[1::2]))
+
+    def is_open(self, exchange: str = WILDCARD, t: Optional[time] = None, schedule: str = 'MARKET') -> bool:
+        """True if the exchange is open for the schedule at time t (defaults to now, IST)."""
+        at = datetime.combine(self.trading_day, t or current_time_indian(), tzinfo=INDIAN_TIMEZONE)
+        return self.calendar.is_open(exchange, schedule, at)
+
+    def get_exchanges(self) -> List[str]:
+        return sorted({record['exchange'] for record in self.records})
+
+    def __repr__(self):
+        return f"<DaySchedule(trading_day={self.trading_day}, records={len(self.records)})>"
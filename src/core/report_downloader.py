@@ -1,5 +1,9 @@
+import asyncio
 import os
+import queue
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import timedelta, datetime
 
 from selenium import webdriver
@@ -10,29 +14,95 @@ from selenium.webdriver.firefox.service import Service
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import Select
 from selenium.webdriver.support.ui import WebDriverWait
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
 from webdriver_manager.firefox import GeckoDriverManager
 
+from src.core.report_fetcher import ReportFetcher
 from src.helpers.date_time_utils import today_indian
 from src.helpers.logger import get_logger
+from src.helpers.step_timer import StepTimer
 from src.helpers.utils import generate_totp, delete_folder_contents
 from src.settings import constants_manager as const
 from src.settings.parameter_manager import parms, ACCOUNT_CREDENTIALS
 
 logger = get_logger(__name__)  # Initialize logger
 
+TEMP_DOWNLOAD_SUFFIXES = ('.part', '.crdownload', '.tmp')
+
+# Shared by the scripts below: the download links matching an XPath, and the elements whose own text holds an
+# error token, each with a signature that changes when the page re-renders the element with a new result
+_RESULT_ELEMENTS_JS = '''
+const [xpath, tokens] = arguments;
+const links = [];
+const snapshot = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+for (let i = 0; i < snapshot.snapshotLength; i++) {
+    const el = snapshot.snapshotItem(i);
+    links.push([el, (el.getAttribute('href') || '') + '|' + el.textContent]);
+}
+const errors = [];
+const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+while (walker.nextNode()) {
+    const text = walker.currentNode.nodeValue.toLowerCase();
+    if (walker.currentNode.parentElement && tokens.some(token => text.includes(token.toLowerCase()))) {
+        errors.push([walker.currentNode.parentElement, walker.currentNode.nodeValue]);
+    }
+}
+'''
+
+# Marks the results already on the page before a submit, so they are not taken for the new one
+MARK_PREVIOUS_RESULTS_JS = _RESULT_ELEMENTS_JS + '''
+for (const [el, signature] of links.concat(errors)) { el.dataset.previousResult = signature; }
+'''
+
+# ['link', element] or ['error', text] once the submitted report shows a result that was not marked, else null
+NEW_RESULT_JS = _RESULT_ELEMENTS_JS + '''
+const isNew = ([el, signature]) => el.dataset.previousResult !== signature;
+const error = errors.find(isNew);
+if (error) { return ['error', error[1]]; }
+const link = links.find(entry => isNew(entry) && entry[0].offsetParent !== null && !entry[0].disabled);
+return link ? ['link', link[0]] : null;
+'''
+
+
+class DownloadEventHandler(FileSystemEventHandler):
+    """Queues the paths of files created in, or renamed into, the download directory."""
+
+    def __init__(self, events: queue.Queue):
+        self.events = events
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.events.put(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.events.put(event.dest_path)
+
+
 class ReportDownloader:
-    driver = None
-    report_start_date = None
-    report_end_date = None
-    account = None
-    credential = None
-    failed_reports = []  # Track failed downloads
-    download_path = None
-    refresh_reports = None
+    """
+    Downloads the Console reports of one account with its own browser and download directory,
+    so several accounts can be processed side by side. login_download_reports runs all accounts.
+    """
     tokens = ['Something went wrong', "Report's empty", 'Console under maintenance', 'too many']
-
-    @classmethod
-    def setup_driver(cls):
+    _driver_lock = threading.Lock()
+    _driver_path = None
+
+    def __init__(self, account, credential, report_start_dates, report_end_date, refresh_reports, download_root):
+        self.driver = None
+        self.account = account
+        self.credential = credential
+        self.report_start_dates = report_start_dates  # Report name -> first date to download
+        self.report_end_date = report_end_date
+        self.refresh_reports = refresh_reports
+        self.download_path = os.path.join(download_root, account)
+        self.failed_reports = []  # Track failed downloads
+        self.download_events = queue.Queue()
+        self.observer = None
+        self.timer = StepTimer(f"report download {account}")
+
+    def setup_driver(self):
         """Setup Firefox WebDriver with auto-download settings."""
         options = Options()
         options.add_argument("--no-sandbox")
@@ -44,9 +114,9 @@ class ReportDownloader:
 
         # Set Download Preferences
 
-        logger.info(f"Download path: {cls.download_path}")
+        logger.info(f"Download path: {self.download_path}")
         options.set_preference("browser.download.folderList", 2)  # Use custom directory
-        options.set_preference("browser.download.dir", cls.download_path)  # Ensure absolute path
+        options.set_preference("browser.download.dir", self.download_path)  # Ensure absolute path
         options.set_preference("browser.download.useDownloadDir", True)
         options.set_preference("browser.download.panel.shown", False)  # Hide download panel
         options.set_preference("browser.helperApps.neverAsk.saveToDisk",
@@ -55,166 +125,200 @@ class ReportDownloader:
         # Disable Built-in PDF Viewer (Prevents Download Errors)
         options.set_preference("pdfjs.disabled", True)
 
-        cls.driver = webdriver.Firefox(service=Service(GeckoDriverManager().install()), options=options)
+        self.driver = webdriver.Firefox(service=Service(self.get_driver_path()), options=options)
 
     @classmethod
-    def highlight_element(cls, element):
+    def get_driver_path(cls):
+        """Resolve geckodriver once; concurrent installs from several workers would race."""
+        with cls._driver_lock:
+            if cls._driver_path is None:
+                cls._driver_path = GeckoDriverManager().install()
+        return cls._driver_path
+
+    def highlight_element(self, element):
         """Highlight a Selenium WebElement for debugging."""
         if parms.SELENIUM_DEBUG:
-            cls.driver.execute_script("arguments[0].style.border='3px solid red'", element)
+            self.driver.execute_script("arguments[0].style.border='3px solid red'", element)
 
-    @classmethod
-    def login_kite(cls):
+    def login_kite(self):
         """Automates Zerodha Kite login using Selenium (Firefox)."""
-        logger.info(f"Logging into Zerodha Kite for user {cls.account}...")
+        logger.info(f"Logging into Zerodha Kite for user {self.account}...")
 
-        cls.driver.get(parms.KITE_URL)
-        WebDriverWait(cls.driver, 5).until(EC.presence_of_element_located((By.ID, "userid")))
+        self.driver.get(parms.KITE_URL)
+        WebDriverWait(self.driver, 5).until(EC.presence_of_element_located((By.ID, "userid")))
 
         try:
-            userid_field = cls.driver.find_element(By.ID, "userid")
-            cls.highlight_element(userid_field)
-            userid_field.send_keys(cls.account)
-            logger.info(f"Entered User ID for {cls.account}")
-
-            password_field = cls.driver.find_element(By.ID, "password")
-            cls.highlight_element(password_field)
-            password_field.send_keys(cls.credential['PASSWORD'])
-            logger.info(f"Entered Password for {cls.account}")
-
-            login_button = cls.driver.find_element(By.XPATH, '//button[@type="submit"]')
-            cls.highlight_element(login_button)
+            userid_field = self.driver.find_element(By.ID, "userid")
+            self.highlight_element(userid_field)
+            userid_field.send_keys(self.account)
+            logger.info(f"Entered User ID for {self.account}")
+
+            password_field = self.driver.find_element(By.ID, "password")
+            self.highlight_element(password_field)
+            password_field.send_keys(self.credential['PASSWORD'])
+            logger.info(f"Entered Password for {self.account}")
+
+            login_button = self.driver.find_element(By.XPATH, '//button[@type="submit"]')
+            self.highlight_element(login_button)
             login_button.click()
-            logger.info(f"Submitted login credentials for {cls.account}")
+            logger.info(f"Submitted login credentials for {self.account}")
 
             # Wait for TOTP field
-            WebDriverWait(cls.driver, 10).until(EC.presence_of_element_located((By.XPATH, "//input[@type='number']")))
-            totp_field = cls.driver.find_element(By.XPATH, "//input[@type='number']")
-            cls.highlight_element(totp_field)
+            WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.XPATH, "//input[@type='number']")))
+            totp_field = self.driver.find_element(By.XPATH, "//input[@type='number']")
+            self.highlight_element(totp_field)
 
             for attempt in range(parms.MAX_KITE_CONN_RETRY_COUNT):
-                ztotp = generate_totp(cls.credential['TOTP_TOKEN'])
+                ztotp = generate_totp(self.credential['TOTP_TOKEN'])
                 logger.info(f"Generated TOTP: {ztotp}")
                 totp_field.send_keys(ztotp)
                 # Wait for dashboard URL change
-                WebDriverWait(cls.driver, 3).until(lambda d: "dashboard" in d.current_url)
+                WebDriverWait(self.driver, 3).until(lambda d: "dashboard" in d.current_url)
 
-                if "dashboard" in cls.driver.current_url:
-                    logger.info(f"Login Successful for acount {cls.account}")
+                if "dashboard" in self.driver.current_url:
+                    logger.info(f"Login Successful for acount {self.account}")
                     return
                 else:
                     logger.warning(
-                        f"Invalid TOTP! Retrying for account: {cls.account} (Attempt {attempt + 1}/{parms.MAX_KITE_CONN_RETRY_COUNT})")
+                        f"Invalid TOTP! Retrying for account: {self.account} (Attempt {attempt + 1}/{parms.MAX_KITE_CONN_RETRY_COUNT})")
                 if attempt == parms.MAX_KITE_CONN_RETRY_COUNT - 1:
-                    raise ValueError(f"TOTP Authentication Failed for accunt {cls.account}")
+                    raise ValueError(f"TOTP Authentication Failed for accunt {self.account}")
 
         except Exception as e:
-            msg = f"Login Failed for account {cls.account} with exception: {e}"
+            msg = f"Login Failed for account {self.account} with exception: {e}"
             logger.error(msg)
             raise Exception(msg)
 
-    @classmethod
-    def check_for_error_text_js(cls):
-        """Returns True if 'something went wrong' or 'empty' is present anywhere in the page source."""
-
-        page_text = cls.driver.execute_script("return document.body.innerText;").lower()
-
-        results = [token.lower() in page_text for token in cls.tokens]
-
-        if any(results):
-            logger.warning('Report is empty or something went wrong')
-            return True
-        return False
-
-    @classmethod
-    def wait_for_download_link(cls, item):
-        time.sleep(1)
-        if cls.check_for_error_text_js():
+    def mark_previous_results(self, item):
+        """Mark the links and error messages left by the previous submission, before submitting the next."""
+        self.driver.execute_script(MARK_PREVIOUS_RESULTS_JS, item['href'], self.tokens)
+
+    def wait_for_download_link(self, item):
+        """
+        Wait until the submitted report shows a download link or an error/empty message that was not
+        already on the page (see mark_previous_results). Returns the link, or None for an error or empty report.
+        """
+        kind, result = WebDriverWait(self.driver, 20).until(
+            lambda driver: driver.execute_script(NEW_RESULT_JS, item['href'], self.tokens))
+        if kind == 'error':
+            logger.warning(f'Report is empty or something went wrong: {result.strip()}')
             return None
-
-        download_csv_link = WebDriverWait(cls.driver, 20).until(
-            EC.element_to_be_clickable((By.XPATH, item['href'])))
-
-        return download_csv_link
-
-    @classmethod
-    def wait_for_download(cls, timeout=60):
-        end_time = time.time() + timeout
-        while time.time() < end_time:
-            new_files = set(os.listdir(parms.REPORT_DOWNLOAD_DIR)) - cls.files_in_dir
-            if bool(new_files):
-                for file in new_files:
-                    if not (file.endswith(".crdownload") or file.endswith(".part")):
-                        return file
-            else:
-                time.sleep(1)
+        return result
+
+    def start_download_watch(self):
+        self.observer = Observer()
+        self.observer.schedule(DownloadEventHandler(self.download_events), self.download_path, recursive=False)
+        self.observer.start()
+
+    def stop_download_watch(self):
+        if self.observer is not None:
+            self.observer.stop()
+            self.observer.join()
+            self.observer = None
+
+    def clear_download_events(self):
+        while not self.download_events.empty():
+            self.download_events.get_nowait()
+
+    @staticmethod
+    def is_download_complete(path):
+        """Browsers write to a temporary file first; the download is done once no partial sibling is left."""
+        if path.endswith(TEMP_DOWNLOAD_SUFFIXES) or not os.path.isfile(path):
+            return False
+        if any(os.path.exists(path + suffix) for suffix in TEMP_DOWNLOAD_SUFFIXES):
+            return False
+        return os.path.getsize(path) > 0
+
+    def wait_for_download(self, timeout=60):
+        """Block on file system events until a completed download shows up."""
+        deadline = time.monotonic() + timeout
+        pending = set()
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                pending.add(self.download_events.get(timeout=min(remaining, 1)))
+            except queue.Empty:
+                pass  # Re-check pending paths, a rename may not raise a second event
+            for path in list(pending):
+                if self.is_download_complete(path):
+                    return os.path.basename(path)
         raise TimeoutError("Download did not complete within the timeout period.")
 
-    @classmethod
-    def download_reports(cls):
+    def fetch_reports(self):
+        """Fetch the reports over HTTP, reusing the Console session cookies of this browser login."""
+        with self.timer.step('open_console'):
+            self.driver.get(next(iter(const.REPORT.values()))['url'])
+            WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+        fetcher = ReportFetcher(self.account, self.driver.get_cookies(), self.report_start_dates,
+                                self.report_end_date, self.refresh_reports, self.download_path)
+        with self.timer.step('http_fetch'):
+            return asyncio.run(fetcher.fetch_reports())
+
+    def download_reports(self):
         """Downloads reports from Zerodha Console and returns a dictionary of downloaded files."""
-        os.makedirs(parms.REPORT_DOWNLOAD_DIR, exist_ok=True)
+        os.makedirs(self.download_path, exist_ok=True)
         all_downloaded_files = {}
         max_retries = parms.MAX_RETRIES
 
         for name, item in const.REPORT.items():
-            if not cls.refresh_reports.get(name, False):
+            if not self.refresh_reports.get(name, False):
                 continue
 
             logger.info(f"Downloading: {name}")
-            cls.driver.get(item['url'])
-            WebDriverWait(cls.driver, 5).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+            with self.timer.step('open_report'):
+                self.driver.get(item['url'])
+                WebDriverWait(self.driver, 5).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
             downloaded_files = {}
-            current_start = cls.report_start_date
-            while current_start < cls.report_end_date:
-                current_end = min(current_start + timedelta(days=364), cls.report_end_date)
+            current_start = self.report_start_dates[name]
+            while current_start < self.report_end_date:
+                current_end = min(current_start + timedelta(days=364), self.report_end_date)
 
                 for segment in item['segment']['values']:  # Select both segments
 
                     for counter in range(1, max_retries + 1):
                         date_range_str = ""
                         try:
-                            cls.select_segment(downloaded_files, item, segment)
-
-                            cls.select_pnl_element(item)
-
-                            date_range_str = cls.enter_date_range(current_start, current_end, item, segment)
-
-                            arrow_button = WebDriverWait(cls.driver, 5).until(
-                                EC.element_to_be_clickable((By.XPATH, item['button'])))
-                            cls.highlight_element(arrow_button)
-                            arrow_button.click()
-                            time.sleep(5)
-                            download_csv_link = cls.wait_for_download_link(item)
+                            with self.timer.step('select_filters'):
+                                self.select_segment(downloaded_files, item, segment)
+                                self.select_pnl_element(item)
+                                date_range_str = self.enter_date_range(current_start, current_end, item, segment)
+
+                            with self.timer.step('submit'):
+                                self.mark_previous_results(item)
+                                arrow_button = WebDriverWait(self.driver, 5).until(
+                                    EC.element_to_be_clickable((By.XPATH, item['button'])))
+                                self.highlight_element(arrow_button)
+                                arrow_button.click()
+
+                            with self.timer.step('wait_for_link'):
+                                download_csv_link = self.wait_for_download_link(item)
                             if download_csv_link is None:
                                 break
 
-                            cls.highlight_element(download_csv_link)
-                            cls.files_in_dir = set(os.listdir(parms.REPORT_DOWNLOAD_DIR))
-                            time.sleep(5)
-                            download_csv_link.click()
-                            time.sleep(5)
-
-                            downloaded_file = cls.wait_for_download()
+                            with self.timer.step('download'):
+                                self.highlight_element(download_csv_link)
+                                self.clear_download_events()
+                                download_csv_link.click()
+                                downloaded_file = self.wait_for_download()
                             downloaded_files[segment].append(downloaded_file)
                             logger.info(f"Download completed for {segment} ({date_range_str}): {downloaded_file}")
                             break
                         except Exception:
-                            logger.error(f"Download failed for {name} {cls.account} - {segment} - ({date_range_str})")
+                            logger.error(f"Download failed for {name} {self.account} - {segment} - ({date_range_str})")
+                            if counter == max_retries:
+                                self.failed_reports.append((name, segment, date_range_str))
 
                 current_start = current_end + timedelta(days=1)
             all_downloaded_files[name] = downloaded_files
-        logger.info(f'Downloaded files for {cls.account} all segments: {all_downloaded_files}')
+        logger.info(f'Downloaded files for {self.account} all segments: {all_downloaded_files}')
 
         if not all_downloaded_files:
             logger.warning("No reports were downloaded.")
         return all_downloaded_files
 
-    @classmethod
-    def enter_date_range(cls, current_start, current_end, item, segment):
-        date_range = WebDriverWait(cls.driver, 25).until(
+    def enter_date_range(self, current_start, current_end, item, segment):
+        date_range = WebDriverWait(self.driver, 25).until(
             EC.element_to_be_clickable((By.XPATH, item['date_range'])))
-        cls.highlight_element(date_range)
+        self.highlight_element(date_range)
         date_range_str = f'{current_start.strftime("%Y-%m-%d")} ~ {current_end.strftime("%Y-%m-%d")}'
         date_range.send_keys(Keys.CONTROL + "a")
         date_range.send_keys(Keys.DELETE)
@@ -223,70 +327,109 @@ class ReportDownloader:
 
         return date_range_str
 
-    @classmethod
-    def select_pnl_element(cls, item):
+    def select_pnl_element(self, item):
         if item['P&L'] is not None:
-            dropdown = WebDriverWait(cls.driver, 10).until(
+            dropdown = WebDriverWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.XPATH, item['P&L']['element'])))
-            cls.highlight_element(dropdown)
+            self.highlight_element(dropdown)
             select = Select(dropdown)
             select.select_by_visible_text(item['P&L']['values'][0])
             logger.info(f"Selected {item['P&L']['element']} in dropdown.")
 
-    @classmethod
-    def select_segment(cls, downloaded_files, item, segment):
+    def select_segment(self, downloaded_files, item, segment):
         if segment not in downloaded_files:
             downloaded_files[segment] = []
-        dropdown = WebDriverWait(cls.driver, 10).until(
+        dropdown = WebDriverWait(self.driver, 10).until(
             EC.presence_of_element_located((By.XPATH, item['segment']['element'])))
-        cls.highlight_element(dropdown)
+        self.highlight_element(dropdown)
         select = Select(dropdown)
         select.select_by_visible_text(segment)
         logger.info(f"Selected {segment} in dropdown.")
 
+    def run(self):
+        """Login and download the reports of this account, always closing the browser."""
+        os.makedirs(self.download_path, exist_ok=True)
+        self.start_download_watch()
+        try:
+            with self.timer.step('setup_driver'):
+                self.setup_driver()
+            with self.timer.step('login'):
+                self.login_kite()
+            logger.info(f"Proceeding with downloads for account {self.account}...")
+            if parms.REPORT_FETCH_MODE == 'http':
+                try:
+                    return self.fetch_reports()
+                except Exception as e:
+                    logger.warning(f"HTTP report fetch failed for {self.account}, using the browser: {e}")
+            downloaded_files = self.download_reports()
+            failed = {name for name, _, _ in self.failed_reports}
+            return {name: files for name, files in downloaded_files.items() if name not in failed}
+        finally:
+            if self.driver is not None:
+                self.driver.quit()
+                self.driver = None
+            self.stop_download_watch()
+            self.timer.log_summary()
+
     @classmethod
-    def login_download_reports(cls):
-        """Login and download reports for multiple users, returning a dictionary of downloaded files."""
-        cls.initialize()
+    def login_download_reports(cls, watermarks=None):
+        """
+        Login and download reports for all accounts in parallel, returning a dictionary of downloaded
+        files per account. Accounts run on a pool of REPORT_DOWNLOAD_WORKERS browsers; a failed account
+        is logged and does not stop the others, and a report with failed downloads is left out.
+
+        watermarks maps (account, report) to the last ingested date; those reports start from it
+        instead of the configured start date.
+        """
+        settings = cls.initialize()
+        report_start_date = settings.pop('report_start_date')
+        watermarks = watermarks or {}
         user_downloads = {}
 
-        for account, credential in ACCOUNT_CREDENTIALS.items():
-            cls.account = account
-            cls.credential = credential
-            cls.setup_driver()
-            try:
-                cls.login_kite()
-                logger.info(f"Proceeding with downloads for account {cls.account}...")
-                user_downloads[account] = cls.download_reports()  # Store downloaded files for each account
-            finally:
-                if cls.driver is not None:
-                    cls.driver.quit()
+        max_workers = max(1, min(parms.REPORT_DOWNLOAD_WORKERS, len(ACCOUNT_CREDENTIALS)))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='report_download') as executor:
+            futures = {}
+            for account, credential in ACCOUNT_CREDENTIALS.items():
+                report_start_dates = {name: watermarks.get((account, name), report_start_date)
+                                      for name in const.REPORT}
+                logger.info(f"Report start dates for {account}: {report_start_dates}")
+                downloader = cls(account, credential, report_start_dates=report_start_dates, **settings)
+                futures[executor.submit(downloader.run)] = account
+            for future in as_completed(futures):
+                account = futures[future]
+                try:
+                    user_downloads[account] = future.result()
+                except Exception as e:
+                    logger.error(f"Report download failed for account {account}: {e}")
 
         return user_downloads  # Return dictionary of downloaded files per account
 
-    @classmethod
-    def initialize(cls):
-
-        cls.download_path = os.path.abspath(parms.REPORT_DOWNLOAD_DIR)
+    @staticmethod
+    def initialize():
+        """Settings shared by every account of a run."""
+        download_root = os.path.abspath(parms.REPORT_DOWNLOAD_DIR)
         if parms.DELETE_REPORTS_BEFORE_REFRESH:
-            delete_folder_contents(cls.download_path)
+            delete_folder_contents(download_root)
 
-        cls.report_start_date = parms.REPORT_START_DATE
-        if cls.report_start_date is None:
-            cls.report_start_date = today_indian() - timedelta(parms.REPORT_LOOKBACK_DAYS)
+        report_start_date = parms.REPORT_START_DATE
+        if report_start_date is None:
+            report_start_date = today_indian() - timedelta(parms.REPORT_LOOKBACK_DAYS)
         else:
-            cls.report_start_date = datetime(int(cls.report_start_date[:4]), int(cls.report_start_date[5:7]),
-                                             int(cls.report_start_date[8:])).date()
+            report_start_date = datetime(int(report_start_date[:4]), int(report_start_date[5:7]),
+                                         int(report_start_date[8:])).date()
+
+        report_end_date = today_indian()
 
-        cls.report_end_date = today_indian()
+        refresh_reports = {"TRADEBOOK": parms.REFRESH_TRADEBOOK,
+                           "PNL": parms.REFRESH_PNL,
+                           "LEDGER": parms.REFRESH_LEDGER}
 
-        cls.refresh_reports = {"TRADEBOOK": parms.REFRESH_TRADEBOOK,
-                               "PNL": parms.REFRESH_PNL,
-                               "LEDGER": parms.REFRESH_LEDGER}
+        logger.info(f'Report start date: {report_start_date}')
+        logger.info(f'Report end date: {report_end_date}')
+        logger.info(f'Report list: {refresh_reports}')
 
-        logger.info(f'Report start date: {cls.report_start_date}')
-        logger.info(f'Report end date: {cls.report_end_date}')
-        logger.info(f'Report list: {cls.refresh_reports}')
+        return dict(report_start_date=report_start_date, report_end_date=report_end_date,
+                    refresh_reports=refresh_reports, download_root=download_root)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,120 @@
+import asyncio
+import os
+from datetime import timedelta
+
+import httpx
+
+from src.helpers.logger import get_logger
+from src.helpers.rate_limiter import AsyncRateLimiter
+from src.helpers.step_timer import StepTimer
+from src.settings import constants_manager as const
+from src.settings.parameter_manager import parms
+
+logger = get_logger(__name__)
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class ReportFetchError(Exception):
+    """Raised when a report chunk could not be fetched over HTTP."""
+
+
+class ReportFetcher:
+    """
+    Fetches Console reports over HTTP with the session cookies of a browser login.
+
+    Every report/segment/364-day chunk is one GET on the endpoint configured under REPORT[name]['api'],
+    fetched concurrently through a rate limiter. Files are written to the account's download directory
+    with names matching the report's file_regex, so ReportUploader picks them up unchanged. Names carry the
+    segment and date range of the chunk, so a rerun from other watermarks never overwrites earlier files.
+    """
+
+    def __init__(self, account, cookies, report_start_dates, report_end_date, refresh_reports, download_path,
+                 base_url=None):
+        self.account = account
+        self.cookies = {cookie['name']: cookie['value'] for cookie in cookies}
+        self.report_start_dates = report_start_dates  # Report name -> first date to fetch
+        self.report_end_date = report_end_date
+        self.refresh_reports = refresh_reports
+        self.download_path = download_path
+        self.base_url = base_url or parms.REPORT_API_URL
+        self.limiter = AsyncRateLimiter(parms.REPORT_FETCH_CONCURRENCY, parms.REPORT_FETCH_MIN_INTERVAL)
+        self.timer = StepTimer(f"report fetch {account}")
+
+    def get_chunks(self):
+        """(name, item, segment, start, end) for every request of the run."""
+        chunks = []
+        for name, item in const.REPORT.items():
+            if not self.refresh_reports.get(name, False):
+                continue
+            current_start = self.report_start_dates[name]
+            while current_start < self.report_end_date:
+                current_end = min(current_start + timedelta(days=364), self.report_end_date)
+                for segment in item['segment']['values']:
+                    chunks.append((name, item, segment, current_start, current_end))
+                current_start = current_end + timedelta(days=1)
+        return chunks
+
+    def get_file_name(self, item, segment, start_date, end_date):
+        api = item['api']
+        return api['file_name'].format(prefix=item['prefix'], account=self.account, segment=api['segments'][segment],
+                                       from_date=start_date.strftime("%Y%m%d"), to_date=end_date.strftime("%Y%m%d"),
+                                       ext=api['ext'])
+
+    async def fetch_chunk(self, client, name, item, segment, start_date, end_date):
+        api = item['api']
+        params = dict(api['params'], segment=api['segments'][segment],
+                      from_date=start_date.strftime("%Y-%m-%d"), to_date=end_date.strftime("%Y-%m-%d"))
+
+        for attempt in range(1, parms.MAX_RETRIES + 1):
+            async with self.limiter:
+                with self.timer.step(name):
+                    response = await client.get(api['path'], params=params)
+
+            if response.status_code in RETRY_STATUS_CODES and attempt < parms.MAX_RETRIES:
+                logger.warning(f"{name} {self.account} {segment} returned {response.status_code}, "
+                               f"retrying ({attempt}/{parms.MAX_RETRIES})")
+                await asyncio.sleep(parms.RETRY_DELAY * 2 ** (attempt - 1))
+                continue
+            break
+
+        if response.status_code != 200 or 'text/html' in response.headers.get('content-type', ''):
+            raise ReportFetchError(f"{name} {self.account} {segment} ({start_date} ~ {end_date}) "
+                                   f"returned {response.status_code}")
+        if not response.content:
+            logger.warning(f"Report's empty: {name} {self.account} {segment} ({start_date} ~ {end_date})")
+            return segment, None
+
+        file_name = self.get_file_name(item, segment, start_date, end_date)
+        file_path = os.path.join(self.download_path, file_name)
+        with open(file_path + '.part', 'wb') as f:
+            f.write(response.content)
+        os.replace(file_path + '.part', file_path)  # Uploader never sees a partial file
+        logger.info(f"Fetched {name} for {segment} ({start_date} ~ {end_date}): {file_name}")
+        return segment, file_name
+
+    async def fetch_reports(self):
+        """Fetch all chunks; returns {report: {segment: [files]}} like ReportDownloader.download_reports."""
+        os.makedirs(self.download_path, exist_ok=True)
+        chunks = self.get_chunks()
+        headers = {'User-Agent': parms.REPORT_FETCH_USER_AGENT}
+
+        async with httpx.AsyncClient(base_url=self.base_url, cookies=self.cookies, headers=headers,
+                                     timeout=parms.REPORT_FETCH_TIMEOUT, follow_redirects=False) as client:
+            results = await asyncio.gather(
+                *(self.fetch_chunk(client, *chunk) for chunk in chunks), return_exceptions=True)
+
+        all_fetched_files = {}
+        failures = []
+        for (name, item, segment, *_), result in zip(chunks, results):
+            segment_files = all_fetched_files.setdefault(name, {}).setdefault(segment, [])
+            if isinstance(result, Exception):
+                failures.append(str(result))
+            elif result[1]:
+                segment_files.append(result[1])
+
+        self.timer.log_summary()
+        if failures:
+            raise ReportFetchError(f"{len(failures)} of {len(chunks)} report requests failed: {failures}")
+        logger.info(f'Fetched files for {self.account} all segments: {all_fetched_files}')
+        return all_fetched_files
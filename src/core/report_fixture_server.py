@@ -0,0 +1,63 @@
+"""
+Stand-in for the Console report endpoints, serving recorded report files for local testing.
+
+A GET on a configured REPORT api path answers with <REPORT_FIXTURE_DIR>/<prefix>-<segment>.<ext>
+(e.g. tradebook-EQ.csv), or 404 when no recording exists. Point REPORT_API_URL at it:
+
+    python -m src.core.report_fixture_server 8765
+    REPORT_API_URL=http://127.0.0.1:8765
+"""
+import mimetypes
+import os
+import sys
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+from src.helpers.logger import get_logger
+from src.settings import constants_manager as const
+from src.settings.parameter_manager import parms
+
+logger = get_logger(__name__)
+
+FIXTURE_ROUTES = {item['api']['path']: item for item in const.REPORT.values()}
+
+
+class ReportFixtureHandler(BaseHTTPRequestHandler):
+    fixture_dir = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        item = FIXTURE_ROUTES.get(url.path)
+        segment = parse_qs(url.query).get('segment', [''])[0]
+        if item is None:
+            self.send_error(404, f"Unknown report path {url.path}")
+            return
+
+        file_path = os.path.join(self.fixture_dir, f"{item['prefix']}-{segment}.{item['api']['ext']}")
+        if not os.path.isfile(file_path):
+            self.send_error(404, f"No recorded fixture {os.path.basename(file_path)}")
+            return
+
+        with open(file_path, 'rb') as f:
+            content = f.read()
+        self.send_response(200)
+        self.send_header('Content-Type', mimetypes.guess_type(file_path)[0] or 'application/octet-stream')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        logger.debug(f"Fixture server: {format % args}")
+
+
+def create_fixture_server(port=0, fixture_dir=None):
+    """Build (but do not start) a fixture server; port 0 picks a free port."""
+    handler = type('BoundReportFixtureHandler', (ReportFixtureHandler,),
+                   {'fixture_dir': fixture_dir or parms.REPORT_FIXTURE_DIR})
+    return ThreadingHTTPServer(('127.0.0.1', port), handler)
+
+
+if __name__ == "__main__":
+    server = create_fixture_server(int(sys.argv[1]) if len(sys.argv) > 1 else 8765)
+    logger.info(f"Serving report fixtures from {server.RequestHandlerClass.fixture_dir} on {server.server_address}")
+    server.serve_forever()
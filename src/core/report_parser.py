@@ -0,0 +1,66 @@
+"""
+Report file parsing, run in worker processes by ReportUploader.
+
+Only pandas/pyarrow are imported here so that spawned workers start quickly and never touch the
+database, the logger handlers or the browser stack. Problems are returned to the caller for logging.
+"""
+from typing import List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+
+# Empty cells become nulls as with pandas, and a timestamp format that never matches leaves timestamps as
+# text like the services expect
+_CONVERT_OPTIONS = pa_csv.ConvertOptions(strings_can_be_null=True, timestamp_parsers=['#%Y#'])
+
+
+def pandas_column_names(names) -> List[str]:
+    """Column names as pandas.read_csv gives them: 'Unnamed: N' for blank headers, 'name.N' for repeats."""
+    result, seen = [], {}
+    for index, name in enumerate(names):
+        name = name or f'Unnamed: {index}'
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        result.append(f'{name}.{count}' if count else name)
+    return result
+
+
+def read_csv(file_path) -> pd.DataFrame:
+    """
+    Read a CSV with pyarrow's multithreaded reader into the frame pandas.read_csv would give, except
+    that date/time columns keep their original text.
+    """
+    table = pa_csv.read_csv(file_path, convert_options=_CONVERT_OPTIONS)
+    table = table.rename_columns(pandas_column_names(table.column_names))
+    for index, field in enumerate(table.schema):
+        if pa.types.is_date(field.type):
+            table = table.set_column(index, field.name, pc.cast(table.column(index), pa.string()))
+    return table.to_pandas()
+
+
+def parse_report_file(key, file_name, file_path, file_extension,
+                      account) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+    """
+    Parse one report file into a NumPy-backed frame tagged with its account.
+    Returns (frame, None), with an empty frame for a file without data, or (None, reason) when the file
+    cannot be read or parsed.
+    """
+    try:
+        data_df = read_csv(file_path) if file_extension == 'csv' else pd.read_excel(file_path)
+    except Exception as e:
+        return None, f"Error reading file {file_path}: {e}"
+
+    if data_df.empty:
+        return data_df.assign(account=account), None
+
+    if key == 'pnl':
+        try:
+            header_row_idx = data_df[data_df["Unnamed: 1"] == "Symbol"].index[0]
+            data_df.columns = data_df.iloc[header_row_idx]
+            data_df = data_df.iloc[header_row_idx + 1:].reset_index(drop=True)
+        except (IndexError, KeyError):
+            return None, f"Header row missing in {file_name}"
+
+    return data_df.assign(account=account), None
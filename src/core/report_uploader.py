@@ -1,11 +1,14 @@
 import asyncio
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 
 import pandas as pd
 
+from src.core.report_parser import parse_report_file
 from src.helpers.logger import get_logger
-from src.helpers.utils import read_file_content
+from src.helpers.utils import file_content_hash
+from src.services.service_report_file_log import service_report_file_log
 from src.services.service_report_profit_loss import service_report_profit_loss
 from src.services.service_report_ledger_entries import service_report_ledger_entries
 from src.services.service_report_tradebook import service_report_tradebook
@@ -17,6 +20,7 @@ logger = get_logger(__name__)
 
 class ReportUploader:
     _initialized = False
+    _parse_pool = None
 
     @classmethod
     def __initialize(cls, refresh=False):
@@ -26,9 +30,107 @@ class ReportUploader:
         cls._initialized = True
         logger.info("ReportUploader initialized")
 
+    @staticmethod
+    def list_report_files(download_dir):
+        """(file name, path) of every report, including the per-account download directories."""
+        return [(file_name, os.path.join(root, file_name))
+                for root, _, file_names in os.walk(download_dir) for file_name in file_names]
+
+    @classmethod
+    def get_parse_pool(cls):
+        """Worker processes for report parsing (REPORT_PARSE_WORKERS, None = one per core), created on first use."""
+        if cls._parse_pool is None:
+            cls._parse_pool = ProcessPoolExecutor(max_workers=parms.REPORT_PARSE_WORKERS)
+        return cls._parse_pool
+
+    @classmethod
+    def shutdown_parse_pool(cls):
+        if cls._parse_pool is not None:
+            cls._parse_pool.shutdown(wait=True, cancel_futures=True)
+            cls._parse_pool = None
+
+    @classmethod
+    async def read_report(cls, key, file_name, file_path, match):
+        """Parse one report file in the process pool, keeping the event loop free."""
+        loop = asyncio.get_running_loop()
+        data_df, problem = await loop.run_in_executor(
+            cls.get_parse_pool(), parse_report_file, key, file_name, file_path, match.groups()[-1], match.group(2))
+        if problem:
+            logger.warning(problem)
+        return data_df
+
+    @staticmethod
+    def normalize_frame(data_df):
+        """Normalise column names and turn every NaN/NaT into None, once per chunk."""
+        data_df.columns = (
+            data_df.columns.str.lower()
+            .str.replace(".", "", regex=False)
+            .str.replace("&", "n", regex=False)
+            .str.replace(r"[ &]+", "_", regex=True)
+        )
+        return data_df.astype(object).where(data_df.notna(), None)
+
+    @classmethod
+    async def upload_chunk(cls, key, service, chunk):
+        """
+        Parse a bounded chunk of files across processes, concatenate once and insert it. Files are logged
+        as uploaded only once they have parsed and the insert has succeeded. Returns the (account, report)
+        pairs of files that failed either way, so their watermarks stay put and they are read again next run.
+        """
+        frames = await asyncio.gather(*(
+            cls.read_report(key, file_name, file_path, match) for file_name, file_path, match, _ in chunk
+        ))
+
+        parsed = [(entry, data_df) for entry, data_df in zip(chunk, frames) if data_df is not None]
+        failed = {(match.group(2), key.upper()) for (_, _, match, _), data_df in zip(chunk, frames) if data_df is None}
+        data_frames = [data_df for _, data_df in parsed if not data_df.empty]
+        if data_frames:
+            data_records = cls.normalize_frame(pd.concat(data_frames, ignore_index=True))
+            try:
+                await service.validate_insert_records(data_records)
+            except Exception as e:
+                logger.error(f"Upload of {len(chunk)} {key} files failed, they will be retried: {e}")
+                return {(match.group(2), key.upper()) for _, _, match, _ in chunk}
+
+        if parsed:
+            await service_report_file_log.log_files([
+                {'content_hash': content_hash, 'account': match.group(2), 'report': key.upper(),
+                 'file_name': file_name, 'row_count': len(data_df)}
+                for (file_name, _, match, content_hash), data_df in parsed
+            ])
+        return failed
+
+    @staticmethod
+    def match_new_files(pattern, all_files, known_hashes):
+        """Report files matching the pattern whose content has not been uploaded before."""
+        compiled_pattern = re.compile(pattern)
+        pending = []
+        for file_name, file_path in all_files:
+            match = compiled_pattern.match(file_name)
+            if not match:
+                continue
+            content_hash = file_content_hash(file_path)
+            if content_hash in known_hashes:
+                logger.debug(f"Skipping already uploaded {file_name}")
+                continue
+            known_hashes.add(content_hash)  # Same content under another name is read once
+            pending.append((file_name, file_path, match, content_hash))
+        return pending
+
+    @classmethod
+    async def upload_report(cls, key, pattern, service, all_files, known_hashes):
+        pending = await asyncio.to_thread(cls.match_new_files, pattern, all_files, known_hashes)
+
+        chunk_size = parms.REPORT_UPLOAD_CHUNK_FILES
+        failed = set()
+        for start in range(0, len(pending), chunk_size):
+            failed |= await cls.upload_chunk(key, service, pending[start:start + chunk_size])
+        logger.info(f"Uploaded {len(pending)} {key} files" + (f", failed for {sorted(failed)}" if failed else ""))
+        return failed
+
     @classmethod
     async def upload_reports(cls):
-        """Main function to process reports."""
+        """Main function to process reports; returns the (account, report) pairs whose upload failed."""
         try:
             cls.__initialize()  # Ensure one-time setup
 
@@ -50,56 +152,23 @@ class ReportUploader:
                 "ledger": service_report_ledger_entries
             }
 
-            all_files = sorted(os.listdir(parms.REPORT_DOWNLOAD_DIR),
-                               key=lambda x: x.replace('.csv', '').replace('xlsx', ''))
-            tasks = []
-
-            for key, pattern in regex_patterns.items():
-                if not refresh_reports[key]:
-                    continue
-
-                compiled_pattern = re.compile(pattern)
-                data_records = pd.DataFrame()
-
-                for file_name in all_files:
-                    match = compiled_pattern.match(file_name)
-                    if match:
-                        file_extension = match.groups()[-1]
-                        data_df = read_file_content(os.path.join(parms.REPORT_DOWNLOAD_DIR, file_name), file_extension)
-                        data_df = data_df.map(lambda x: None if pd.isna(x) else x)
-
-                        if data_df is None or data_df.empty:
-                            logger.warning(f"No data in {file_name}")
-                            continue
-
-                        if key == 'pnl':
-                            try:
-                                header_row_idx = data_df[data_df["Unnamed: 1"] == "Symbol"].index[0]
-                                data_df.columns = data_df.iloc[header_row_idx]
-                                data_df = data_df.iloc[header_row_idx + 1:].reset_index(drop=True)
-                            except IndexError:
-                                logger.warning(f"Header row missing in {file_name}")
-                                continue
-
-                        data_df = data_df.assign(account=match.group(2))
-                        data_df.columns = (
-                            data_df.columns.str.lower()
-                            .str.replace(".", "", regex=False)
-                            .str.replace("&", "n", regex=False)
-                            .str.replace(r"[ &]+", "_", regex=True)
-                        )
-                        data_records = pd.concat([data_records, data_df], ignore_index=True)
-
-                if not data_records.empty:
-                    service = service_xref[key]
-                    tasks.append(service.validate_insert_records(data_records))
-
-            await asyncio.gather(*tasks)
+            known_hashes = await service_report_file_log.get_known_hashes()
+
+            all_files = sorted(cls.list_report_files(parms.REPORT_DOWNLOAD_DIR),
+                               key=lambda x: x[0].replace('.csv', '').replace('xlsx', ''))
+
+            failed = await asyncio.gather(*(
+                cls.upload_report(key, pattern, service_xref[key], all_files, known_hashes)
+                for key, pattern in regex_patterns.items() if refresh_reports[key]
+            ))
             logger.info("Report upload process completed")
+            return set().union(*failed)
 
         except Exception as e:
             logger.exception(f"Main process failed: {e}")
             raise
+        finally:
+            cls.shutdown_parse_pool()  # Idle workers are not kept between daily runs
 
 
 if __name__ == "__main__":
@@ -0,0 +1,163 @@
+import asyncio
+import hashlib
+import inspect
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple, Union
+
+from src.helpers.logger import get_logger
+from src.helpers.step_timer import StepTimer
+
+logger = get_logger(__name__)
+
+
+def fingerprint_of(*inputs) -> str:
+    """Stable digest of a step's inputs, e.g. the default records it seeds."""
+    payload = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class Step:
+    """
+    One startup step.
+
+    action is awaited once every step in depends_on has finished (or was skipped).
+    fingerprint, if given, digests the step's inputs (it may be a coroutine function, and may return
+    None to force the step); the step is skipped when it matches the last successful run. enabled,
+    if given, is checked when the step becomes ready; a disabled step counts as skipped and does not
+    hold up its dependents.
+    """
+    name: str
+    action: Callable[[], Awaitable]
+    depends_on: Tuple[str, ...] = ()
+    fingerprint: Optional[Callable[[], Union[str, None, Awaitable[Optional[str]]]]] = None
+    enabled: Optional[Callable[[], bool]] = None
+
+
+class StartupDag:
+    """
+    Runs declared steps as soon as their dependencies are done, so independent steps overlap.
+
+    Per-step wall times are logged through a StepTimer. Fingerprints of successful steps are kept in
+    state_file between runs. If a step fails its dependents are not started, and run() raises the
+    first failure once the remaining steps have settled.
+    """
+
+    def __init__(self, name: str, steps: Iterable[Step], state_file: Optional[str] = None):
+        self.name = name
+        self.steps: Dict[str, Step] = {}
+        for step in steps:
+            if step.name in self.steps:
+                raise ValueError(f"Duplicate startup step '{step.name}'")
+            self.steps[step.name] = step
+        self.state_file = Path(state_file) if state_file else None
+        self.order = self.topological_order()
+        self.timer = StepTimer(name)
+        self.results: Dict[str, str] = {}  # step -> completed / skipped / unchanged / failed / blocked
+
+    def topological_order(self):
+        """Steps in dependency order; rejects unknown dependencies and cycles."""
+        for step in self.steps.values():
+            unknown = set(step.depends_on) - set(self.steps)
+            if unknown:
+                raise ValueError(f"Startup step '{step.name}' depends on unknown steps {sorted(unknown)}")
+
+        order, visiting, done = [], set(), set()
+
+        def visit(name, path):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Startup steps form a cycle: {' -> '.join(path + [name])}")
+            visiting.add(name)
+            for dependency in self.steps[name].depends_on:
+                visit(dependency, path + [name])
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+
+        for name in self.steps:
+            visit(name, [])
+        return order
+
+    def load_fingerprints(self) -> Dict[str, str]:
+        if not self.state_file or not self.state_file.exists():
+            return {}
+        try:
+            return json.loads(self.state_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable startup state {self.state_file}: {e}")
+            return {}
+
+    def save_fingerprints(self, fingerprints: Dict[str, str]):
+        if not self.state_file:
+            return
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            self.state_file.write_text(json.dumps(fingerprints, indent=2, sort_keys=True), encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Could not save startup state {self.state_file}: {e}")
+
+    async def run_step(self, step: Step, done: Dict[str, asyncio.Future], previous: Dict[str, str],
+                       current: Dict[str, str]):
+        if step.depends_on:
+            await asyncio.wait([done[dependency] for dependency in step.depends_on])
+        if any(self.results.get(dependency) in ('failed', 'blocked') for dependency in step.depends_on):
+            self.results[step.name] = 'blocked'
+            return
+
+        start_time = time.perf_counter()
+        try:  # A failing enabled or fingerprint check fails the step too, so its dependents stay blocked
+            if step.enabled is not None and not step.enabled():
+                self.results[step.name] = 'skipped'
+                return
+
+            fingerprint = step.fingerprint() if step.fingerprint else None
+            if inspect.isawaitable(fingerprint):
+                fingerprint = await fingerprint
+            if fingerprint is not None and previous.get(step.name) == fingerprint:
+                current[step.name] = fingerprint
+                self.results[step.name] = 'unchanged'
+                return
+
+            await step.action()
+        except Exception:
+            self.results[step.name] = 'failed'
+            raise
+        finally:
+            self.timer.add(step.name, time.perf_counter() - start_time)
+
+        if fingerprint is not None:
+            current[step.name] = fingerprint
+        self.results[step.name] = 'completed'
+
+    async def run(self, skip_unchanged: bool = True):
+        previous = self.load_fingerprints() if skip_unchanged else {}
+        current: Dict[str, str] = {}
+        self.results = {}
+
+        loop = asyncio.get_running_loop()
+        done = {name: loop.create_future() for name in self.order}
+
+        async def run_and_signal(step):
+            try:
+                await self.run_step(step, done, previous, current)
+            finally:
+                done[step.name].set_result(None)
+
+        outcomes = await asyncio.gather(*(run_and_signal(self.steps[name]) for name in self.order),
+                                        return_exceptions=True)
+
+        self.save_fingerprints({**previous, **current} if skip_unchanged else current)
+        self.timer.log_summary()
+        by_result = {}
+        for name in self.order:
+            by_result.setdefault(self.results.get(name, 'blocked'), []).append(name)
+        logger.info(f"{self.name} steps: {by_result}")
+
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
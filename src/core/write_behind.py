@@ -0,0 +1,190 @@
+import asyncio
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Optional, Sequence, Tuple
+
+from src.core.singleton_base import SingletonBase
+from src.helpers.logger import get_logger
+from src.settings.parameter_manager import parms
+
+logger = get_logger(__name__)
+
+
+class WriteBehindQueue(SingletonBase):
+    """
+    Write-behind persistence for high-frequency state updates.
+
+    put() queues an upsert for any ServiceBase model and returns immediately; it is thread-safe, so
+    the ticker thread can call it too. Repeated updates to the same key are coalesced into one record
+    (later values win). Pending records are written with bulk upserts every
+    WRITE_BEHIND_FLUSH_INTERVAL seconds, or as soon as WRITE_BEHIND_BATCH_SIZE keys are pending.
+    A failed batch is re-queued behind any newer updates and dropped after WRITE_BEHIND_MAX_RETRIES.
+    """
+
+    def __init__(self):
+        if getattr(self, '_singleton_initialized', False):
+            logger.debug(f"Instance for {self.__class__.__name__} already initialized.")
+            return
+        self._lock = threading.Lock()
+        # (service, key columns) -> key -> (first queued at, attempts, record)
+        self._pending: Dict[Tuple[object, Tuple[str, ...]], Dict[tuple, Tuple[float, int, dict]]] = {}
+        self._depth = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.queued = 0
+        self.coalesced = 0
+        self.flushed = 0
+        self.failed_batches = 0
+        self.dropped = 0
+        self.last_flush_seconds = 0.0
+        self.last_flush_lag = 0.0
+        self.max_flush_lag = 0.0
+        self._singleton_initialized = True
+
+    # ─── Producers ──────────────────────────────────────────────────────────────
+
+    def put(self, service, record: dict, key_cols: Optional[Sequence[str]] = None):
+        """Queue an upsert of record, keyed by key_cols (default: the service's conflict columns, else its PK)."""
+        key_cols = tuple(key_cols or service.conflict_cols or service._pk_names)
+        missing = [column for column in key_cols if column not in record]
+        if missing:
+            raise ValueError(f"Record for {service.table_name} is missing key columns {missing}")
+        key = tuple(record[column] for column in key_cols)
+
+        with self._lock:
+            entries = self._pending.setdefault((service, key_cols), {})
+            existing = entries.get(key)
+            if existing:
+                entries[key] = (existing[0], existing[1], {**existing[2], **record})
+                self.coalesced += 1
+            else:
+                entries[key] = (time.monotonic(), 0, dict(record))
+                self._depth += 1
+            self.queued += 1
+            full = self._depth >= parms.WRITE_BEHIND_BATCH_SIZE
+        if full:
+            self._wake()
+
+    def _wake(self):
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _requeue(self, service, key_cols, items):
+        with self._lock:
+            entries = self._pending.setdefault((service, key_cols), {})
+            for key, (queued_at, attempts, record) in items.items():
+                if attempts + 1 > parms.WRITE_BEHIND_MAX_RETRIES:
+                    self.dropped += 1
+                    logger.error(f"Dropping write-behind record for {service.table_name} {key} after "
+                                 f"{attempts + 1} failed attempts")
+                    continue
+                newer = entries.get(key)
+                if newer:  # Updated again meanwhile; the newer values still win
+                    entries[key] = (queued_at, attempts + 1, {**record, **newer[2]})
+                else:
+                    entries[key] = (queued_at, attempts + 1, record)
+                    self._depth += 1
+
+    # ─── Flushing ───────────────────────────────────────────────────────────────
+
+    async def flush(self) -> int:
+        """Write everything pending now; returns the number of records written."""
+        async with self._flush_lock or asyncio.Lock():
+            with self._lock:
+                pending, self._pending, self._depth = self._pending, {}, 0
+            if not pending:
+                return 0
+
+            start_time = time.perf_counter()
+            written = 0
+            for (service, key_cols), entries in pending.items():
+                # One statement needs the same columns in every row
+                by_columns = defaultdict(dict)
+                for key, entry in entries.items():
+                    by_columns[frozenset(entry[2])][key] = entry
+
+                for columns, items in by_columns.items():
+                    update_columns = [column for column in columns if column not in key_cols]
+                    try:
+                        await service.bulk_insert_records(
+                            records=[record for _, _, record in items.values()], index_elements=list(key_cols),
+                            update_on_conflict=True, skip_update_if_exists=not update_columns,
+                            update_columns=update_columns, return_records=False, raise_on_error=True)
+                    except Exception as e:
+                        self.failed_batches += 1
+                        logger.error(f"Write-behind flush of {len(items)} {service.table_name} records failed: {e}")
+                        self._requeue(service, key_cols, items)
+                        continue
+
+                    written += len(items)
+                    lag = time.monotonic() - min(queued_at for queued_at, _, _ in items.values())
+                    self.last_flush_lag = lag
+                    self.max_flush_lag = max(self.max_flush_lag, lag)
+
+            self.flushed += written
+            self.last_flush_seconds = time.perf_counter() - start_time
+            logger.debug(f"Write-behind flushed {written} records in {self.last_flush_seconds:.3f}s")
+            return written
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=parms.WRITE_BEHIND_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.exception(f"Write-behind flush loop error: {e}")
+
+    async def start(self):
+        """Start the periodic flush on the running event loop."""
+        if self._task is not None and not self._task.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._run(), name="write_behind")
+        logger.info(f"Write-behind queue started (interval {parms.WRITE_BEHIND_FLUSH_INTERVAL}s, "
+                    f"batch {parms.WRITE_BEHIND_BATCH_SIZE})")
+
+    async def stop(self):
+        """Stop the flush loop and write whatever is still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        self._loop = None
+        logger.info("Write-behind queue stopped")
+
+    # ─── Metrics ────────────────────────────────────────────────────────────────
+
+    def metrics(self) -> dict:
+        with self._lock:
+            queued_times = [queued_at for entries in self._pending.values() for queued_at, _, _ in entries.values()]
+            depth = self._depth
+        return {
+            'queue_depth': depth,
+            'oldest_pending_s': round(time.monotonic() - min(queued_times), 3) if queued_times else 0.0,
+            'queued': self.queued,
+            'coalesced': self.coalesced,
+            'flushed': self.flushed,
+            'failed_batches': self.failed_batches,
+            'dropped': self.dropped,
+            'last_flush_s': round(self.last_flush_seconds, 3),
+            'last_flush_lag_s': round(self.last_flush_lag, 3),
+            'max_flush_lag_s': round(self.max_flush_lag, 3),
+        }
+
+
+# Singleton instance
+write_behind = WriteBehindQueue()
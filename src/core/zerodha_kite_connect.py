@@ -1,4 +1,4 @@
-import threading
+import asyncio
 
 import requests
 from kiteconnect import KiteConnect
@@ -36,46 +36,60 @@ class ZerodhaKiteConnect(SingletonBase):
 
         self._initialized = True
 
-        self.init_kite_conn()
-
     def init_kite_conn(self, test_conn=False):
         """Returns KiteConnect instance, initializing it if necessary."""
         with ZerodhaKiteConnect._lock:
             if not test_conn and self.kite:
                 return
+            self._connect(service_access_tokens.get_stored_access_token(self.account))
+
+    async def init_kite_conn_async(self, test_conn=False):
+        """
+        Async variant of init_kite_conn: the stored token is read through the async session and the
+        blocking validation/login runs in a worker thread, so other startup steps keep running.
+        """
+        if not test_conn and self.kite:
+            return
+        stored_token = await service_access_tokens.get_stored_access_token_async(self.account)
+        await asyncio.to_thread(self._locked_connect, stored_token)
+
+    def _locked_connect(self, stored_token):
+        with ZerodhaKiteConnect._lock:
+            self._connect(stored_token)
 
-            stored_token = service_access_tokens.get_stored_access_token(self.account)
-            if stored_token:
-                self._access_token = stored_token
-                self.kite = KiteConnect(api_key=self.api_key)
-                self.kite.set_access_token(self._access_token)
-                try:
-                    self.kite.profile()
-                    logger.info("Stored access token is fetched and successfully validated")
-                    return
-                except Exception:
-                    logger.warning("Stored access token is invalid. Re-authenticating...")
+    def _connect(self, stored_token):
+        """Validate the stored token, or log in afresh and generate a new one."""
+        if stored_token:
+            self._access_token = stored_token
+            self.kite = KiteConnect(api_key=self.api_key)
+            self.kite.set_access_token(self._access_token)
+            try:
+                self.kite.profile()
+                logger.info("Stored access token is fetched and successfully validated")
+                return
+            except Exception:
+                logger.warning("Stored access token is invalid. Re-authenticating...")
 
-            request_id, session = self.login()
+        request_id, session = self.login()
 
-            self.totp_authenticate(request_id, session)
+        self.totp_authenticate(request_id, session)
 
+        try:
+            self.kite = KiteConnect(api_key=self.api_key)
+            kite_url = self.kite.login_url()
+            logger.info("Kite login URL received.")
+            session.get(kite_url)
+            request_token = ""
+        except Exception as e:
+            # Extract request token from URL exception
             try:
-                self.kite = KiteConnect(api_key=self.api_key)
-                kite_url = self.kite.login_url()
-                logger.info("Kite login URL received.")
-                session.get(kite_url)
-                request_token = ""
-            except Exception as e:
-                # Extract request token from URL exception
-                try:
-                    request_token = str(e).split("request_token=")[1].split("&")[0].split()[0]
-                    logger.info(f"Request Token received: {request_token}")
-                except Exception:
-                    logger.error("Failed to extract request token.")
-                    raise
-
-            self.setup_access_token(request_token)
+                request_token = str(e).split("request_token=")[1].split("&")[0].split()[0]
+                logger.info(f"Request Token received: {request_token}")
+            except Exception:
+                logger.error("Failed to extract request token.")
+                raise
+
+        self.setup_access_token(request_token)
 
     def get_kite_conn(self,test_conn=True):
         self.init_kite_conn(test_conn=test_conn)
@@ -3,13 +3,13 @@ from contextlib import asynccontextmanager
 from pathlib import Path
 from threading import Lock
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, text, select, literal, make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, Session, scoped_session
-from sqlalchemy_utils import database_exists, create_database
 
 from src.core.singleton_base import SingletonBase
 from src.helpers.logger import get_logger
+from src.helpers.pool_metrics import PoolMetrics, TimedQueuePool, TimedAsyncAdaptedQueuePool
 from src.models.base import Base
 from src.settings.parameter_manager import parms
 
@@ -17,19 +17,35 @@ logger = get_logger(__name__)
 
 
 class DatabaseManager(SingletonBase):
-    """Singleton Database Utility Class for handling both Sync and Async database connections."""
+    """
+    Singleton Database Utility Class for handling both Sync and Async database connections.
+
+    Nothing connects at import: engines and tables are set up by initialize(), which runs on the
+    first session request unless the application calls it earlier.
+    """
     _instance = None
     _lock = Lock()
+    _init_lock = Lock()
 
     def __init__(self):
         if getattr(self, '_singleton_initialized', False):
             logger.debug(f"Instance for {self.__class__.__name__} already initialized.")
             return
-        self._setup_database_urls()
-        self._initialize_engines_and_sessions()
-        self._setup_database_tables()
-        self._initialized = True
-        logger.info("Database and Parameters initialized successfully")
+        self._initialized = False
+        self._singleton_initialized = True
+
+    def initialize(self):
+        """Create the database if needed, the engines and session factories, and the tables. Runs once."""
+        if self._initialized:
+            return
+        with self._init_lock:
+            if self._initialized:
+                return
+            self._setup_database_urls()
+            self._initialize_engines_and_sessions()
+            self._setup_database_tables()
+            self._initialized = True
+            logger.info("Database and Parameters initialized successfully")
 
     def _setup_database_urls(self):
         """Setup database URLs based on configuration."""
@@ -42,38 +58,98 @@ class DatabaseManager(SingletonBase):
                 db_path.touch()
                 logger.info(f"Created new SQLite database at {db_path}")
         else:
-            self.DB_URL = f"postgresql://{parms.POSTGRES_URL}"
-            self.DB_ASYNC_URL = f"postgresql+asyncpg://{parms.POSTGRES_URL}"
+            from sqlalchemy_utils import database_exists, create_database  # Only needed for PostgreSQL
+
+            self.DB_URL, self.DB_ASYNC_URL = self.postgres_urls(parms.POSTGRES_URL)
             if not database_exists(self.DB_URL):
                 create_database(self.DB_URL)
                 logger.info("Created new PostgreSQL database")
 
+    @staticmethod
+    def postgres_urls(postgres_url):
+        """Sync and asyncpg URLs for POSTGRES_URL, keeping any query options it already carries."""
+        db_url = make_url(f"postgresql://{postgres_url}")
+        async_url = db_url.set(drivername="postgresql+asyncpg").update_query_dict(
+            {'prepared_statement_cache_size': str(parms.DB_PREPARED_STATEMENT_CACHE_SIZE)})
+        return (db_url.render_as_string(hide_password=False),
+                async_url.render_as_string(hide_password=False))
+
     def _initialize_engines_and_sessions(self):
         """Initialize database engines and session factories."""
-        self._engine = create_engine(self.DB_URL, echo=parms.DB_DEBUG, pool_size=10, max_overflow=5, pool_timeout=30,
-                                     pool_recycle=1800)
-        self._async_engine = create_async_engine(self.DB_ASYNC_URL, echo=parms.DB_DEBUG, future=True, pool_size=10,
-                                                 max_overflow=5, pool_timeout=30, pool_recycle=1800)
+        self._engine = create_engine(self.DB_URL, echo=parms.DB_DEBUG, **self._pool_options('SYNC'))
+        self._async_engine = create_async_engine(self.DB_ASYNC_URL, echo=parms.DB_DEBUG, future=True,
+                                                 **self._pool_options('ASYNC'))
+        self.pool_metrics = {
+            'sync': PoolMetrics('sync').attach(self._engine.pool),
+            'async': PoolMetrics('async').attach(self._async_engine.sync_engine.pool),
+        }
 
         self._sync_session_factory = scoped_session(
             sessionmaker(bind=self._engine, autocommit=False, autoflush=False, expire_on_commit=False))
         self._async_session_factory = async_sessionmaker(bind=self._async_engine, class_=AsyncSession,
                                                          expire_on_commit=False)
 
+    def _pool_options(self, engine):
+        """
+        Pool arguments for the SYNC or ASYNC engine from parameters. SQLite keeps SQLAlchemy's own pool.
+        For asyncpg, DB_STATEMENT_CACHE_SIZE sizes asyncpg's statement cache (0 behind pgbouncer) and
+        DB_PREPARED_STATEMENT_CACHE_SIZE the dialect's prepared statement cache.
+        """
+        if parms.SQLITE_DB:
+            return {}
+        options = {
+            'poolclass': TimedAsyncAdaptedQueuePool if engine == 'ASYNC' else TimedQueuePool,
+            'pool_size': getattr(parms, f'DB_{engine}_POOL_SIZE'),
+            'max_overflow': getattr(parms, f'DB_{engine}_MAX_OVERFLOW'),
+            'pool_timeout': parms.DB_POOL_TIMEOUT,
+            'pool_recycle': parms.DB_POOL_RECYCLE,
+            'pool_pre_ping': bool(parms.DB_POOL_PRE_PING),
+        }
+        if engine == 'ASYNC':
+            options['connect_args'] = {'statement_cache_size': parms.DB_STATEMENT_CACHE_SIZE}
+        return options
+
+    def get_pool_metrics(self) -> dict:
+        """Checked-out, overflow, checkout wait and connection age per engine."""
+        if not self._initialized:
+            return {}
+        return {name: metrics.snapshot() for name, metrics in self.pool_metrics.items()}
+
     def _setup_database_tables(self):
-        """Setup database tables."""
-        Base.metadata.reflect(self._engine)
+        """
+        Bring the schema up to date through the versioned migrations. When it is already current
+        this is a single version query. DROP_TABLES still drops everything first.
+        """
+        from src.migrations.runner import run_migrations
+
         if parms.DROP_TABLES:
+            Base.metadata.reflect(self._engine)
             Base.metadata.drop_all(self._engine)
-        Base.metadata.create_all(self._engine)
+        run_migrations(self._engine)
+
+    def table_has_rows(self, model) -> bool:
+        """Whether the model's table holds at least one row, in one LIMIT 1 query."""
+        self.initialize()
+        with self._engine.connect() as connection:
+            return connection.execute(select(literal(1)).select_from(model.__table__).limit(1)).first() is not None
+
+    def schema_fingerprint(self) -> tuple:
+        """Database URL and schema version; startup seeding is redone when either changes."""
+        from src.migrations.runner import get_schema_version
+
+        self.initialize()
+        return self.DB_URL, get_schema_version(self._engine)
 
     def get_sync_session(self) -> Session:
         """Get a synchronous database session."""
+        self.initialize()
         return self._sync_session_factory()
 
     @asynccontextmanager
     async def get_async_session(self):
         """Get an async session using a proper async context manager."""
+        if not self._initialized:
+            await asyncio.to_thread(self.initialize)  # Reflection and create_all are blocking
         session = self._async_session_factory()
         try:
             yield session
@@ -82,6 +158,7 @@ class DatabaseManager(SingletonBase):
 
     def test_connection(self) -> bool:
         """Test database connection."""
+        self.initialize()
         try:
             with self._engine.connect() as conn:
                 conn.execute(text("SELECT 1"))
@@ -1,9 +1,13 @@
 from datetime import datetime
+from typing import Iterable, Optional, Tuple
 from zoneinfo import ZoneInfo
 
+from src.helpers.lazy_import import lazy_import
 from src.settings import constants_manager as const  # Importing timezone settings
 from src.helpers.logger import get_logger
 
+pd = lazy_import("pandas")
+
 logger = get_logger(__name__)
 
 # Define constants for timezones
@@ -60,6 +64,38 @@ def convert_to_timezone(date_str, format='%Y-%m-%d', return_date=True, tz=INDIAN
         return None
 
 
+def convert_series_to_timezone(values: 'pd.Series', format='%Y-%m-%d', return_date=True, tz=INDIAN_TIMEZONE):
+    """
+    Vectorised convert_to_timezone for a whole column: one pd.to_datetime with an explicit format,
+    localized to tz. Unparseable values become None and are reported once per column.
+    """
+    parsed = pd.to_datetime(values, format=format, errors='coerce')
+    invalid = parsed.isna() & values.notna()
+    if invalid.any():
+        logger.warning(f"{invalid.sum()} invalid date values in {values.name} for format {format}: "
+                       f"{values[invalid].unique()[:5].tolist()}")
+
+    if parsed.dt.tz is None:
+        parsed = parsed.dt.tz_localize(tz)
+    else:
+        parsed = parsed.dt.tz_convert(tz)
+
+    if return_date is None:
+        converted = parsed
+    else:
+        converted = parsed.dt.date if return_date else parsed.dt.time
+    return converted.astype(object).where(parsed.notna(), None)
+
+
+def convert_columns_to_timezone(data: 'pd.DataFrame', columns: Iterable[Tuple[str, str, Optional[bool]]],
+                                tz=INDIAN_TIMEZONE) -> 'pd.DataFrame':
+    """Apply convert_series_to_timezone to every (column, format, return_date) present in the frame."""
+    for col, fmt, return_date in columns:
+        if col in data:
+            data[col] = convert_series_to_timezone(data[col], format=fmt, return_date=return_date, tz=tz)
+    return data
+
+
 # Test Code in __main__
 if __name__ == "__main__":
     logger.info(f"EST timestamp: {timestamp_est()}")
@@ -0,0 +1,75 @@
+"""
+Startup import report, the `python -X importtime` output summarised per package.
+
+    python -m src.helpers.import_profiler src.backend --top 15
+
+The module is imported in a fresh interpreter so nothing is cached. The report lists the slowest
+packages by self time and the total, and warns when the total exceeds IMPORT_TIME_BUDGET_MS.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from src.helpers.logger import get_logger
+from src.settings.parameter_manager import parms
+
+logger = get_logger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def parse_import_times(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """(module, self µs, cumulative µs, nesting depth) for every line of -X importtime output."""
+    entries = []
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append((module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+
+def measure_imports(module_name: str, python=sys.executable) -> List[Tuple[str, int, int, int]]:
+    result = subprocess.run([python, "-X", "importtime", "-c", f"import {module_name}"],
+                            cwd=PROJECT_ROOT, capture_output=True, text=True,
+                            env={**os.environ, "PYTHONPATH": str(PROJECT_ROOT)})
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module_name} failed:\n{result.stderr[-2000:]}")
+    return parse_import_times(result.stderr)
+
+
+def summarize(entries) -> Tuple[Dict[str, int], int]:
+    """Self time per top-level package, in µs, and the total import time."""
+    by_package = defaultdict(int)
+    for module, self_us, _, _ in entries:
+        package = module.split('.')[0] if not module.startswith('src.') else '.'.join(module.split('.')[:3])
+        by_package[package] += self_us
+    return dict(by_package), sum(self_us for _, self_us, _, _ in entries)
+
+
+def report(module_name: str, top: int = 15) -> int:
+    """Log the import breakdown of module_name; returns the total import time in milliseconds."""
+    by_package, total_us = summarize(measure_imports(module_name))
+    lines = [f"{package:<45} {self_us / 1000:8.1f} ms"
+             for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:top]]
+    total_ms = round(total_us / 1000)
+    logger.info(f"Import time of {module_name}: {total_ms} ms\n" + "\n".join(lines))
+
+    budget_ms = getattr(parms, 'IMPORT_TIME_BUDGET_MS', None)
+    if budget_ms and total_ms > budget_ms:
+        logger.warning(f"Import time of {module_name} is {total_ms} ms, over the {budget_ms} ms budget")
+    return total_ms
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-package import time of a module")
+    parser.add_argument("module", nargs="?", default="src.backend")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    report(args.module, args.top)
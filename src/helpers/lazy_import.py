@@ -0,0 +1,26 @@
+import importlib.util
+import sys
+import threading
+
+_lock = threading.Lock()
+
+
+def lazy_import(name):
+    """
+    Return a module that is only executed on first attribute access (importlib.util.LazyLoader).
+
+    Use it at module level for heavy dependencies that only some code paths need, e.g.
+    `pd = lazy_import("pandas")`. Annotations must then be strings, or they trigger the import.
+    """
+    with _lock:
+        if name in sys.modules:
+            return sys.modules[name]
+        spec = importlib.util.find_spec(name)
+        if spec is None:
+            raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+        loader = importlib.util.LazyLoader(spec.loader)
+        spec.loader = loader
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        loader.exec_module(module)
+        return module
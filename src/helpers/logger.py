@@ -3,13 +3,13 @@ import os
 import queue
 from logging.handlers import QueueHandler, QueueListener
 from src.settings.parameter_manager import parms as parm
-from twilio.rest import Client
 
 def send_twilio_alert(message):
     """Sends an alert via Twilio if an error occurs and TWILIO_ALERT is enabled."""
     if not parm.TWILIO_ALERT:
         return
     try:
+        from twilio.rest import Client  # Imported on the first alert only
         client = Client(parm.TWILIO_ACCOUNT_SID, parm.TWILIO_AUTH_TOKEN)
         client.messages.create(
             body=message,
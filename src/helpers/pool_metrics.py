@@ -0,0 +1,112 @@
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+from src.helpers.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PoolMetrics:
+    """
+    Connection pool counters fed by SQLAlchemy pool events.
+
+    connect/checkout/checkin/invalidate events count connections and keep their creation time, so
+    snapshot() can report connection age. Checkout wait time is recorded by the Timed* pool classes,
+    since no pool event fires before a caller starts waiting.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.pool = None
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.max_connection_age = 0.0
+        self._created = {}  # id(dbapi connection) -> creation time
+
+    def attach(self, pool):
+        self.pool = pool
+        pool.metrics = self
+        event.listen(pool, 'connect', self.on_connect)
+        event.listen(pool, 'checkout', self.on_checkout)
+        event.listen(pool, 'checkin', self.on_checkin)
+        event.listen(pool, 'invalidate', self.on_invalidate)
+        event.listen(pool, 'close', self.on_close)
+        return self
+
+    def on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+            self._created[id(dbapi_connection)] = time.monotonic()
+
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+            created = self._created.get(id(dbapi_connection))
+            if created is not None:
+                self.max_connection_age = max(self.max_connection_age, time.monotonic() - created)
+
+    def on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checkins += 1
+
+    def on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def on_close(self, dbapi_connection, connection_record):
+        with self._lock:
+            self._created.pop(id(dbapi_connection), None)
+
+    def record_wait(self, seconds):
+        with self._lock:
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            ages = [now - created for created in self._created.values()]
+            metrics = {
+                'pool': self.pool.__class__.__name__ if self.pool else None,
+                'connects': self.connects,
+                'checkouts': self.checkouts,
+                'checkins': self.checkins,
+                'invalidations': self.invalidations,
+                'wait_avg_ms': round(1000 * self.wait_total / self.checkouts, 3) if self.checkouts else 0.0,
+                'wait_max_ms': round(1000 * self.wait_max, 3),
+                'open_connections': len(ages),
+                'connection_age_max_s': round(max(ages), 1) if ages else 0.0,
+                'connection_age_max_at_checkout_s': round(self.max_connection_age, 1),
+            }
+        if isinstance(self.pool, QueuePool):
+            metrics.update(size=self.pool.size(), checked_out=self.pool.checkedout(), overflow=self.pool.overflow())
+        return metrics
+
+
+class _TimedCheckoutMixin:
+    """Times how long a checkout waits for a free connection."""
+
+    def _do_get(self):
+        start_time = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics = getattr(self, 'metrics', None)
+            if metrics is not None:
+                metrics.record_wait(time.perf_counter() - start_time)
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
@@ -0,0 +1,36 @@
+import asyncio
+import time
+
+from src.helpers.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AsyncRateLimiter:
+    """
+    Caps concurrent calls and spaces their starts at least min_interval seconds apart.
+    Use as `async with limiter:` around each request.
+    """
+
+    def __init__(self, max_concurrent: int, min_interval: float = 0.0):
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.min_interval = min_interval
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    async def __aenter__(self):
+        await self.semaphore.acquire()
+        try:
+            async with self._lock:
+                now = time.monotonic()
+                delay = self._next_start - now
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self._next_start = max(now, self._next_start) + self.min_interval
+        except BaseException:
+            self.semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.semaphore.release()
@@ -0,0 +1,35 @@
+import time
+from contextlib import contextmanager
+
+from src.helpers.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class StepTimer:
+    """Accumulates wall time per named step and logs a breakdown, e.g. for a download or startup run."""
+
+    def __init__(self, name):
+        self.name = name
+        self.steps = {}  # step -> (call count, total seconds)
+
+    @contextmanager
+    def step(self, step_name):
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(step_name, time.perf_counter() - start_time)
+
+    def add(self, step_name, elapsed):
+        count, total = self.steps.get(step_name, (0, 0.0))
+        self.steps[step_name] = (count + 1, total + elapsed)
+
+    def total(self):
+        return sum(total for _, total in self.steps.values())
+
+    def log_summary(self):
+        breakdown = "; ".join(f"{step_name}: {total:.3f}s/{count}"
+                              for step_name, (count, total) in sorted(self.steps.items(),
+                                                                      key=lambda item: -item[1][1]))
+        logger.info(f"Timing for {self.name} ({self.total():.3f}s): {breakdown}")
@@ -1,14 +1,17 @@
+import hashlib
 import shutil
 from collections import defaultdict
 from decimal import Decimal, ROUND_DOWN
 from pathlib import Path
 
-import pandas as pd
-import pyotp
+from src.helpers.lazy_import import lazy_import
+
+pd = lazy_import("pandas")
 
 
 def generate_totp(totp_key):
     """Generate a valid TOTP using the secret key."""
+    import pyotp  # Only needed at login
     return pyotp.TOTP(totp_key).now()
 
 
@@ -56,6 +59,29 @@ def read_file_content(file_path, file_extension):
         return ""
 
 
+def file_content_hash(file_path, chunk_size=1 << 20):
+    """SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def row_key_hashes(df, columns, decimal_columns=(), decimals=4):
+    """
+    Signed 64-bit hash of each row's natural key, computed vectorially for a compact ON CONFLICT target.
+    Decimal columns are rounded first so 12.5, '12.50' and Decimal('12.5000') hash alike; None and NaN hash as ''.
+    """
+    def key_text(values, is_decimal):
+        if is_decimal:
+            values = pd.to_numeric(values, errors='coerce').astype(float).round(decimals)
+        return values.astype(str).where(values.notna(), '')
+
+    key_df = pd.DataFrame({column: key_text(df[column], column in decimal_columns) for column in columns})
+    return pd.util.hash_pandas_object(key_df, index=False).to_numpy().view('int64')
+
+
 def parse_value(value: str, target_type: type = None):
     """Converts a string into its appropriate data type or a specified type."""
 
@@ -0,0 +1,14 @@
+"""
+Baseline: create every table of the current models that does not exist yet.
+
+Databases created before versioned migrations start here too, so the migrations after this one
+must be idempotent against a schema that is already at the latest model definitions.
+"""
+import src.models  # noqa: F401 - registers every model on Base.metadata
+from src.models.base import Base
+
+DESCRIPTION = "baseline tables from the current models"
+
+
+def upgrade(connection):
+    Base.metadata.create_all(connection)
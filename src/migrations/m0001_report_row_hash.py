@@ -0,0 +1,84 @@
+"""
+Move report_profit_loss and report_ledger_entries dedup onto a 64-bit row_hash.
+
+Adds and backfills row_hash with the same hashing the upload path uses, removes rows that
+collapse onto the same hash, and replaces the wide composite unique constraints and their
+duplicate btree indexes with a single unique constraint on row_hash.
+"""
+import pandas as pd
+from sqlalchemy import inspect, text
+
+from src.helpers.date_time_utils import INDIAN_TIMEZONE
+from src.helpers.logger import get_logger
+from src.helpers.utils import row_key_hashes
+from src.models.report_ledger_entries import LEDGER_KEY_COLUMNS, LEDGER_AMOUNT_COLUMNS
+from src.models.report_profit_loss import PNL_KEY_COLUMNS, PNL_AMOUNT_COLUMNS
+
+logger = get_logger(__name__)
+
+DESCRIPTION = "row_hash dedup keys for report_profit_loss and report_ledger_entries"
+
+TABLES = {
+    'report_profit_loss': {
+        'key_columns': PNL_KEY_COLUMNS, 'amount_columns': PNL_AMOUNT_COLUMNS, 'date_columns': [],
+        'old_constraint': 'uq_account_symbol', 'old_index': 'idx_account_symbol7', 'new_constraint': 'uq_pnl_row_hash',
+    },
+    'report_ledger_entries': {
+        'key_columns': LEDGER_KEY_COLUMNS, 'amount_columns': LEDGER_AMOUNT_COLUMNS, 'date_columns': ['posting_date'],
+        'old_constraint': 'uq_account_symbol3', 'old_index': 'idx_account_symbol8',
+        'new_constraint': 'uq_ledger_row_hash',
+    },
+}
+
+BATCH_SIZE = 1000
+
+
+def backfill_row_hash(connection, table, key_columns, amount_columns, date_columns):
+    """Hash the natural key of every row; returns the number of duplicate rows removed."""
+    df = pd.read_sql(text(f"SELECT id, {', '.join(key_columns)} FROM {table}"), connection)
+    if df.empty:
+        return 0
+    for column in date_columns:  # Uploads hash the IST date, not the stored timestamp
+        dates = pd.to_datetime(df[column], utc=True).dt.tz_convert(INDIAN_TIMEZONE).dt.date
+        df[column] = dates.astype(object).where(dates.notna(), None)
+    df = df.astype(object).where(df.notna(), None)
+    df['row_hash'] = row_key_hashes(df, key_columns, amount_columns)
+
+    duplicates = df[df.duplicated('row_hash')]['id'].tolist()
+    for start in range(0, len(duplicates), BATCH_SIZE):
+        ids = duplicates[start:start + BATCH_SIZE]
+        connection.execute(text(f"DELETE FROM {table} WHERE id IN ({', '.join(map(str, ids))})"))
+
+    updates = df.drop_duplicates('row_hash')[['id', 'row_hash']].astype(object).to_dict(orient='records')
+    for start in range(0, len(updates), BATCH_SIZE):
+        connection.execute(text(f"UPDATE {table} SET row_hash = :row_hash WHERE id = :id"),
+                           updates[start:start + BATCH_SIZE])
+    return len(duplicates)
+
+
+def upgrade(connection):
+    inspector = inspect(connection)
+    is_postgres = connection.dialect.name == 'postgresql'
+    existing_tables = set(inspector.get_table_names())
+
+    for table, spec in TABLES.items():
+        if table not in existing_tables:
+            continue  # create_all builds it with row_hash
+
+        if 'row_hash' not in {column['name'] for column in inspector.get_columns(table)}:
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN row_hash BIGINT"))
+        removed = backfill_row_hash(connection, table, spec['key_columns'], spec['amount_columns'],
+                                    spec['date_columns'])
+
+        connection.execute(text(f"DROP INDEX IF EXISTS {spec['old_index']}"))
+        if is_postgres:
+            connection.execute(text(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {spec['old_constraint']}"))
+            connection.execute(text(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {spec['new_constraint']}"))
+            connection.execute(text(f"ALTER TABLE {table} ALTER COLUMN row_hash SET NOT NULL"))
+            connection.execute(text(f"ALTER TABLE {table} ADD CONSTRAINT {spec['new_constraint']} UNIQUE (row_hash)"))
+        else:
+            # SQLite cannot drop table constraints; the old one stays, the new key becomes a unique index
+            connection.execute(text(f"CREATE UNIQUE INDEX IF NOT EXISTS {spec['new_constraint']} "
+                                    f"ON {table} (row_hash)"))
+        logger.info(f"{table}: row_hash backfilled, {removed} duplicate rows removed, indexes rebuilt")
+
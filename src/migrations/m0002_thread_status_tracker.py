@@ -0,0 +1,41 @@
+"""
+Track the duration of scheduled runs and keep one thread_status_tracker row per (thread, account).
+
+Adds the duration column, removes older rows that would collide on (thread, account), keeping
+the latest, and narrows the unique constraint from (thread, account, timestamp).
+"""
+from sqlalchemy import inspect, text
+
+from src.helpers.logger import get_logger
+
+logger = get_logger(__name__)
+
+DESCRIPTION = "thread_status_tracker duration and unique (thread, account)"
+
+TABLE = 'thread_status_tracker'
+CONSTRAINT = 'uq_algo_thread_account'
+
+
+def upgrade(connection):
+    inspector = inspect(connection)
+    if TABLE not in inspector.get_table_names():
+        return
+
+    if 'duration' not in {column['name'] for column in inspector.get_columns(TABLE)}:
+        connection.execute(text(f"ALTER TABLE {TABLE} ADD COLUMN duration FLOAT"))
+
+    unique_keys = [set(constraint['column_names']) for constraint in inspector.get_unique_constraints(TABLE)]
+    unique_keys += [set(index['column_names']) for index in inspector.get_indexes(TABLE) if index['unique']]
+    if {'thread', 'account'} in unique_keys:
+        return
+
+    removed = connection.execute(text(
+        f"DELETE FROM {TABLE} WHERE id NOT IN (SELECT MAX(id) FROM {TABLE} GROUP BY thread, account)"
+    )).rowcount
+    if connection.dialect.name == 'postgresql':
+        connection.execute(text(f"ALTER TABLE {TABLE} DROP CONSTRAINT IF EXISTS {CONSTRAINT}"))
+        connection.execute(text(f"ALTER TABLE {TABLE} ADD CONSTRAINT {CONSTRAINT} UNIQUE (thread, account)"))
+    else:
+        # SQLite cannot alter constraints; the old, wider one stays next to this index
+        connection.execute(text(f"CREATE UNIQUE INDEX IF NOT EXISTS {CONSTRAINT} ON {TABLE} (thread, account)"))
+    logger.info(f"{TABLE}: {removed} superseded rows removed, unique on (thread, account)")
@@ -0,0 +1,17 @@
+"""
+Per-thread limit on concurrent runs: thread_schedule.max_instances, falling back to
+SCHEDULER_JOB_MAX_INSTANCES when null.
+"""
+from sqlalchemy import inspect, text
+
+DESCRIPTION = "thread_schedule max_instances"
+
+TABLE = 'thread_schedule'
+
+
+def upgrade(connection):
+    inspector = inspect(connection)
+    if TABLE not in inspector.get_table_names():
+        return
+    if 'max_instances' not in {column['name'] for column in inspector.get_columns(TABLE)}:
+        connection.execute(text(f"ALTER TABLE {TABLE} ADD COLUMN max_instances INTEGER"))
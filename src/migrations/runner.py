@@ -0,0 +1,69 @@
+import importlib
+import time
+from typing import Optional
+
+from sqlalchemy import text, select, insert, func
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from src.helpers.logger import get_logger
+from src.models.schema_version import SchemaVersion
+
+logger = get_logger(__name__)
+
+# Applied in order; the list index is the schema version. Only ever append.
+MIGRATIONS = [
+    'm0000_baseline',
+    'm0001_report_row_hash',
+    'm0002_thread_status_tracker',
+    'm0003_thread_schedule_max_instances',
+]
+LATEST_VERSION = len(MIGRATIONS) - 1
+
+MIGRATION_LOCK_KEY = 20250401  # PostgreSQL advisory lock serialising concurrent boots
+
+
+def get_schema_version(engine) -> Optional[int]:
+    """Current schema version in one query; None before the first migration."""
+    try:
+        with engine.connect() as connection:
+            return connection.execute(text("SELECT MAX(version) FROM schema_version")).scalar()
+    except (OperationalError, ProgrammingError):
+        return None
+
+
+def run_migrations(engine) -> int:
+    """
+    Bring the schema to LATEST_VERSION. All pending migrations run in one transaction (DDL is
+    transactional on PostgreSQL) and each applied version is recorded in schema_version.
+    """
+    current = get_schema_version(engine)
+    if current is not None and current >= LATEST_VERSION:
+        if current > LATEST_VERSION:
+            logger.warning(f"Schema version {current} is newer than this code ({LATEST_VERSION})")
+        logger.info(f"Schema is at version {current}")
+        return current
+
+    with engine.begin() as connection:
+        if connection.dialect.name == 'postgresql':
+            connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {'key': MIGRATION_LOCK_KEY})
+        SchemaVersion.__table__.create(connection, checkfirst=True)
+        current = connection.execute(select(func.max(SchemaVersion.version))).scalar()  # Again, under the lock
+
+        for version in range(-1 if current is None else current, LATEST_VERSION):
+            version += 1
+            migration = importlib.import_module(f"src.migrations.{MIGRATIONS[version]}")
+            start_time = time.perf_counter()
+            migration.upgrade(connection)
+            duration = time.perf_counter() - start_time
+            connection.execute(insert(SchemaVersion).values(
+                version=version, description=migration.DESCRIPTION, duration=duration))
+            logger.info(f"Applied migration {version} ({MIGRATIONS[version]}) in {duration:.3f}s")
+
+    logger.info(f"Schema migrated to version {LATEST_VERSION}")
+    return LATEST_VERSION
+
+
+if __name__ == "__main__":
+    from src.helpers.database_manager import db
+
+    db.initialize()  # Migrates as part of the set-up
@@ -5,11 +5,16 @@ from .holdings import Holdings
 from .orders import Orders
 from .parameter_table import ParameterTable
 from .positions import Positions
+from .report_file_log import ReportFileLog
+from .report_ledger_daily import ReportLedgerDaily
 from .report_ledger_entries import ReportLedgerEntries
 from .report_profit_loss import ReportProfitLoss
+from .report_sync_state import ReportSyncState
+from .report_trade_lots import ReportTradeLots
 from .report_tradebook import ReportTradebook
 from .schedule_list import ScheduleList
 from .schedule_time import ScheduleTime
+from .schema_version import SchemaVersion
 from .instrument_list import InstrumentList
 from .thread_list import ThreadList
 from .thread_schedule import ThreadSchedule
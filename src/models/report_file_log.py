@@ -0,0 +1,35 @@
+from sqlalchemy import Column, String, DateTime, Integer, text, UniqueConstraint, Index, func
+
+from src.helpers.date_time_utils import timestamp_indian
+from src.helpers.logger import get_logger
+from src.settings.constants_manager import Source
+from .base import Base
+
+logger = get_logger(__name__)
+
+
+class ReportFileLog(Base):
+    """Report files already uploaded, identified by the SHA-256 of their content."""
+    __tablename__ = "report_file_log"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    content_hash = Column(String(64), nullable=False)
+    account = Column(String(10), nullable=False)
+    report = Column(String(20), nullable=False)
+    file_name = Column(String(255), nullable=False)
+    row_count = Column(Integer, nullable=False, default=0)
+    source = Column(String(50), nullable=False, server_default=Source.REPORTS)
+    timestamp = Column(DateTime(timezone=True), nullable=False, default=timestamp_indian,
+                       server_default=text("CURRENT_TIMESTAMP"))
+    upd_timestamp = Column(DateTime(timezone=True), nullable=False, default=timestamp_indian,
+                           onupdate=func.now(), server_default=text("CURRENT_TIMESTAMP"))
+    notes = Column(String(255), nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint('content_hash', name='uq_report_file_hash'),
+        Index('idx_report_file_account', 'account', 'report'),
+    )
+
+    def __repr__(self):
+        return (f"<ReportFileLog(id={self.id}, account='{self.account}', report='{self.report}', "
+                f"file_name='{self.file_name}', content_hash='{self.content_hash}', row_count={self.row_count})>")
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, String, Date, DateTime, DECIMAL, Integer, ForeignKey, text, UniqueConstraint, func
+
+from src.helpers.date_time_utils import timestamp_indian
+from src.helpers.logger import get_logger
+from src.settings.constants_manager import Source
+from .base import Base
+
+logger = get_logger(__name__)
+
+
+class ReportLedgerDaily(Base):
+    """Daily cash flow and closing balance per account, materialised from report_ledger_entries."""
+    __tablename__ = "report_ledger_daily"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    account = Column(String(10), ForeignKey("broker_accounts.account", ondelete="CASCADE"), nullable=False)
+    flow_date = Column(Date, nullable=False)
+    credit = Column(DECIMAL(20, 4), nullable=False, default=0.00)
+    debit = Column(DECIMAL(20, 4), nullable=False, default=0.00)
+    net_flow = Column(DECIMAL(20, 4), nullable=False, default=0.00)
+    closing_balance = Column(DECIMAL(20, 4), nullable=False, default=0.00)
+    entries = Column(Integer, nullable=False, default=0)
+    balance_gaps = Column(Integer, nullable=False, default=0)
+    source = Column(String(50), nullable=False, server_default=Source.REPORTS)
+    timestamp = Column(DateTime(timezone=True), nullable=False, default=timestamp_indian,
+                       server_default=text("CURRENT_TIMESTAMP"))
+    upd_timestamp = Column(DateTime(timezone=True), nullable=False, default=timestamp_indian,
+                           onupdate=func.now(), server_default=text("CURRENT_TIMESTAMP"))
+    notes = Column(String(255), nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint('account', 'flow_date', name='uq_ledger_daily'),
+    )
+
+    def __repr__(self):
+        return (f"<ReportLedgerDaily(account='{self.account}', flow_date={self.flow_date}, "
+                f"net_flow={self.net_flow}, closing_balance={self.closing_balance}, "
+                f"balance_gaps={self.balance_gaps})>")
@@ -1,5 +1,5 @@
 from sqlalchemy import (
-    Column, String, DECIMAL, Integer, select, DateTime, text, ForeignKey, CheckConstraint, Index,
+    Column, String, DECIMAL, Integer, BigInteger, select, DateTime, text, ForeignKey, CheckConstraint, Index,
     UniqueConstraint, func
 )
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -11,6 +11,10 @@ from .base import Base
 
 logger = get_logger(__name__)
 
+LEDGER_KEY_COLUMNS = ['account', 'particulars', 'posting_date', 'cost_center', 'voucher_type', 'debit', 'credit',
+                      'net_balance']
+LEDGER_AMOUNT_COLUMNS = ['debit', 'credit', 'net_balance']
+
 
 class ReportLedgerEntries(Base):
     __tablename__ = "report_ledger_entries"
@@ -25,6 +29,7 @@ class ReportLedgerEntries(Base):
     debit = Column(DECIMAL(20, 4), default=0.00, nullable=True)  # Corrected
     credit = Column(DECIMAL(20, 4), default=0.00, nullable=True)  # Corrected
     net_balance = Column(DECIMAL(20, 4), default=0.00)  # Corrected
+    row_hash = Column(BigInteger, nullable=False)  # 64-bit hash of the natural key, see LEDGER_KEY_COLUMNS
     source = Column(String(50), nullable=False, server_default="REPORTS")
     timestamp = Column(DateTime(timezone=True), nullable=False, default=timestamp_indian,
                        server_default=text("CURRENT_TIMESTAMP"))
@@ -39,10 +44,7 @@ class ReportLedgerEntries(Base):
     __table_args__ = (
         CheckConstraint("debit >= 0", name="check_debit_non_negative"),
         CheckConstraint("credit >= 0", name="check_credit_non_negative"),
-        UniqueConstraint('account', 'particulars', 'posting_date', 'cost_center',
-                         'voucher_type', 'debit', 'credit', 'net_balance', name='uq_account_symbol3'),
-        Index("idx_account_symbol8", 'account', 'particulars', 'posting_date',
-              'cost_center', 'voucher_type', 'debit', 'credit', 'net_balance'),
+        UniqueConstraint('row_hash', name='uq_ledger_row_hash'),
         Index("idx_account_date1", "account", "posting_date"),
         Index("idx_voucher_type", "voucher_type"),
     )
@@ -56,8 +58,6 @@ class ReportLedgerEntries(Base):
 
     @classmethod
     async def get_existing_records(cls, session: AsyncSession):
-        """Fetch all existing ledger entry IDs from the table."""
-        result = await session.execute(
-            select(cls.particulars, cls.posting_date, cls.cost_center, cls.voucher_type, cls.debit, cls.credit,
-                   cls.net_balance))
-        return {row for row in result.fetchall()}
+        """Fetch the row hashes of all existing ledger entries."""
+        result = await session.execute(select(cls.row_hash))
+        return set(result.scalars().all())
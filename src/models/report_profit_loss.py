@@ -1,5 +1,5 @@
 from sqlalchemy import (
-    Column, String, DECIMAL, Integer, DateTime, text, ForeignKey, CheckConstraint, Index, UniqueConstraint, func
+    Column, String, DECIMAL, Integer, BigInteger, DateTime, text, ForeignKey, CheckConstraint, Index, UniqueConstraint, func
 )
 from sqlalchemy.orm import relationship
 
@@ -10,6 +10,8 @@ from .base import Base
 logger = get_logger(__name__)
 
 QUANTITY_TYPES = ["LONG", "SHORT"]
+PNL_KEY_COLUMNS = ['account', 'symbol', 'isin', 'quantity', 'buy_value', 'sell_value']
+PNL_AMOUNT_COLUMNS = ['quantity', 'buy_value', 'sell_value']
 
 
 class ReportProfitLoss(Base):
@@ -32,6 +34,7 @@ class ReportProfitLoss(Base):
     open_value = Column(DECIMAL(20, 4), nullable=False)  # Corrected
     unrealized_pnl = Column(DECIMAL(20, 4), nullable=False)  # Corrected
     unrealized_pnl_pct = Column(DECIMAL(20, 4), nullable=False)  # Corrected
+    row_hash = Column(BigInteger, nullable=False)  # 64-bit hash of the natural key, see PNL_KEY_COLUMNS
     source = Column(String(50), nullable=False, server_default="REPORTS")
     timestamp = Column(DateTime(timezone=True), nullable=False, default=timestamp_indian,
                        server_default=text("CURRENT_TIMESTAMP"))
@@ -49,8 +52,7 @@ class ReportProfitLoss(Base):
         CheckConstraint("sell_value >= 0", name="check_sell_value_non_negative"),
         CheckConstraint("open_quantity >= 0", name="check_open_quantity_non_negative"),
         CheckConstraint(f"open_quantity_type IN {tuple(QUANTITY_TYPES)}", name="check_quantity_type_valid"),
-        UniqueConstraint("account", "symbol", 'isin', 'quantity', 'buy_value', 'sell_value', name='uq_account_symbol'),
-        Index("idx_account_symbol7", "account", "symbol", 'isin', 'quantity', 'buy_value', 'sell_value'),
+        UniqueConstraint('row_hash', name='uq_pnl_row_hash'),
         Index("idx_symbol4", "symbol"),
         Index("idx_isin1", "isin"),
         Index("idx_timestamp", "timestamp"),
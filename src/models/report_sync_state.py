@@ -0,0 +1,32 @@
+from sqlalchemy import Column, String, Date, DateTime, Integer, ForeignKey, text, UniqueConstraint, func
+
+from src.helpers.date_time_utils import timestamp_indian
+from src.helpers.logger import get_logger
+from src.settings.constants_manager import Source
+from .base import Base
+
+logger = get_logger(__name__)
+
+
+class ReportSyncState(Base):
+    """High-water mark of report ingestion per account and report."""
+    __tablename__ = "report_sync_state"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    account = Column(String(10), ForeignKey("broker_accounts.account", ondelete="CASCADE"), nullable=False)
+    report = Column(String(20), nullable=False)
+    last_synced_date = Column(Date, nullable=False)
+    source = Column(String(50), nullable=False, server_default=Source.REPORTS)
+    timestamp = Column(DateTime(timezone=True), nullable=False, default=timestamp_indian,
+                       server_default=text("CURRENT_TIMESTAMP"))
+    upd_timestamp = Column(DateTime(timezone=True), nullable=False, default=timestamp_indian,
+                           onupdate=func.now(), server_default=text("CURRENT_TIMESTAMP"))
+    notes = Column(String(255), nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint('account', 'report', name='uq_report_sync_state'),
+    )
+
+    def __repr__(self):
+        return (f"<ReportSyncState(id={self.id}, account='{self.account}', report='{self.report}', "
+                f"last_synced_date={self.last_synced_date}, upd_timestamp={self.upd_timestamp})>")
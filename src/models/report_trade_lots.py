@@ -0,0 +1,56 @@
+from sqlalchemy import (
+    Column, String, DECIMAL, Integer, BigInteger, DateTime, ForeignKey, CheckConstraint, Index, text, func
+)
+
+from src.helpers.date_time_utils import timestamp_indian
+from src.helpers.logger import get_logger
+from src.settings.constants_manager import Source
+from .base import Base
+
+logger = get_logger(__name__)
+
+LOT_SIDES = ["LONG", "SHORT"]
+LOT_STATUSES = ["OPEN", "CLOSED"]
+
+
+class ReportTradeLots(Base):
+    """FIFO-matched lots derived from report_tradebook; OPEN rows are the unmatched remainder per symbol."""
+    __tablename__ = "report_trade_lots"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    account = Column(String(10), ForeignKey("broker_accounts.account", ondelete="CASCADE"), nullable=False)
+    symbol = Column(String(50), nullable=False)
+    exchange = Column(String(10), nullable=False)
+    segment = Column(String(10), nullable=False)
+    side = Column(String(5), nullable=False)
+    status = Column(String(6), nullable=False)
+    quantity = Column(Integer, nullable=False)
+    open_trade_id = Column(BigInteger, nullable=False)
+    open_row_id = Column(Integer, nullable=False)  # report_tradebook.id
+    open_time = Column(DateTime(timezone=True), nullable=False)
+    open_price = Column(DECIMAL(20, 4), nullable=False)
+    close_trade_id = Column(BigInteger, nullable=True)
+    close_row_id = Column(Integer, nullable=True)
+    close_time = Column(DateTime(timezone=True), nullable=True)
+    close_price = Column(DECIMAL(20, 4), nullable=True)
+    realized_pnl = Column(DECIMAL(20, 4), nullable=True)
+    holding_days = Column(Integer, nullable=True)
+    source = Column(String(50), nullable=False, server_default=Source.REPORTS)
+    timestamp = Column(DateTime(timezone=True), nullable=False, default=timestamp_indian,
+                       server_default=text("CURRENT_TIMESTAMP"))
+    upd_timestamp = Column(DateTime(timezone=True), nullable=False, default=timestamp_indian,
+                           onupdate=func.now(), server_default=text("CURRENT_TIMESTAMP"))
+    notes = Column(String(255), nullable=True)
+
+    __table_args__ = (
+        CheckConstraint(f"side IN {tuple(LOT_SIDES)}", name="check_valid_lot_side"),
+        CheckConstraint(f"status IN {tuple(LOT_STATUSES)}", name="check_valid_lot_status"),
+        CheckConstraint("quantity > 0", name="check_lot_quantity_positive"),
+        Index("idx_lots_account_symbol", "account", "symbol", "status"),
+        Index("idx_lots_close_time", "account", "close_time"),
+    )
+
+    def __repr__(self):
+        return (f"<ReportTradeLots(id={self.id}, account='{self.account}', symbol='{self.symbol}', "
+                f"side='{self.side}', status='{self.status}', quantity={self.quantity}, "
+                f"realized_pnl={self.realized_pnl})>")
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, DateTime, Float, Integer, text
+
+from src.helpers.date_time_utils import timestamp_indian
+from src.helpers.logger import get_logger
+from .base import Base
+
+logger = get_logger(__name__)
+
+
+class SchemaVersion(Base):
+    """One row per applied schema migration; the highest version is the current schema."""
+    __tablename__ = "schema_version"
+
+    version = Column(Integer, primary_key=True, autoincrement=False)
+    description = Column(String(255), nullable=False)
+    duration = Column(Float, nullable=True)  # Seconds taken by the migration
+    timestamp = Column(DateTime(timezone=True), nullable=False, default=timestamp_indian,
+                       server_default=text("CURRENT_TIMESTAMP"))
+
+    def __repr__(self):
+        return f"<SchemaVersion(version={self.version}, description='{self.description}', timestamp={self.timestamp})>"
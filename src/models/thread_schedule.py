@@ -17,6 +17,7 @@ class ThreadSchedule(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     thread = Column(String(30), ForeignKey("thread_list.thread", ondelete="CASCADE"), nullable=False)
     schedule = Column(String(10), ForeignKey("schedule_list.schedule", ondelete="CASCADE"), nullable=False)
+    max_instances = Column(Integer, nullable=True)  # Concurrent runs allowed; SCHEDULER_JOB_MAX_INSTANCES if null
     source = Column(String(50), nullable=False, server_default=Source.MANUAL)
     timestamp = Column(DateTime(timezone=True), nullable=False, default=timestamp_indian,
                        server_default=text("CURRENT_TIMESTAMP"))
@@ -35,4 +36,4 @@ class ThreadSchedule(Base):
 
     def __repr__(self):
         return (f"<ThreadSchedule(id={self.id}, thread='{self.thread}', "
-                f"schedule='{self.schedule}', source='{self.source}')>")
+                f"schedule='{self.schedule}', max_instances={self.max_instances}, source='{self.source}')>")
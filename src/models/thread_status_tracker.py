@@ -1,5 +1,5 @@
 from sqlalchemy import (
-    Column, String, DateTime, text, Integer, ForeignKey, Index, UniqueConstraint, func
+    Column, String, DateTime, text, Integer, Float, ForeignKey, Index, UniqueConstraint, func
 )
 from sqlalchemy.orm import relationship
 
@@ -22,6 +22,7 @@ class ThreadStatusTracker(Base):
     thread_status = Column(String(20), nullable=False, default=ThreadStatus.IN_PROGRESS)
     run_count = Column(Integer, nullable=False, default=0)
     error_count = Column(Integer, nullable=False, default=0)
+    duration = Column(Float, nullable=True)  # Seconds taken by the last run
     source = Column(String(50), nullable=False, server_default="API")
     timestamp = Column(DateTime(timezone=True), nullable=False, default=timestamp_indian,
                        server_default=text("CURRENT_TIMESTAMP"))
@@ -36,7 +37,7 @@ class ThreadStatusTracker(Base):
     schedule_list_rel = relationship("ScheduleList", back_populates="thread_status_tracker_rel", passive_deletes=True, )
 
     __table_args__ = (
-        UniqueConstraint('thread', 'account', 'timestamp', name='uq_algo_thread_account'),
+        UniqueConstraint('thread', 'account', name='uq_algo_thread_account'),
         Index('idx_thread_status', 'thread', 'thread_status'),
     )
 
@@ -44,5 +45,5 @@ class ThreadStatusTracker(Base):
         return (f"<ThreadStatus(id={self.id}, thread={self.thread}, "
                 f"account='{self.account}', schedule='{self.schedule}', "
                 f"thread_status={self.thread_status}, run_count={self.run_count}, "
-                f"error_count={self.error_count}, source='{self.source}', "
-                f"updated_at={self.timestamp})", f"updated_at={self.upd_timestamp})>")
+                f"error_count={self.error_count}, duration={self.duration}, source='{self.source}', "
+                f"timestamp={self.timestamp}, upd_timestamp={self.upd_timestamp})>")
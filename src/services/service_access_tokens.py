@@ -1,6 +1,8 @@
 from datetime import timedelta
 from typing import Any
 
+from sqlalchemy import select
+
 from src.core.singleton_base import SingletonBase
 from src.helpers.cipher_utils import encrypt_text, decrypt_text
 from src.helpers.database_manager import db
@@ -24,6 +26,16 @@ class ServiceAccessTokens(SingletonBase, ServiceBase):
             return
         super().__init__(self.model, self.conflict_cols)
 
+    def _valid_token(self, token_entry, account: str) -> Any | None:
+        """Return the decrypted token if the stored entry has not expired."""
+        if token_entry and token_entry.token is not None:
+            age = timestamp_indian() - token_entry.timestamp
+            if age < timedelta(hours=parms.ACCESS_TOKEN_VALIDITY):
+                logger.info('Using access token from database')
+                return decrypt_text(token_entry.token)
+            logger.info(f'Stored token has expired for {account}')
+        return None
+
     def get_stored_access_token(self, account: str) -> tuple[Any, Any] | None:
         """
         Retrieve stored access token for a given account.
@@ -31,18 +43,22 @@ class ServiceAccessTokens(SingletonBase, ServiceBase):
         try:
             with db.get_sync_session() as session:
                 token_entry = session.query(self.model).filter_by(account=account).first()
-
-                if token_entry and token_entry.token is not None:
-                    age = timestamp_indian() - token_entry.timestamp
-                    if age < timedelta(hours=parms.ACCESS_TOKEN_VALIDITY):
-                        logger.info('Using access token from database')
-                        return decrypt_text(token_entry.token)
-                    logger.info(f'Stored token has expired for {account}')
+                return self._valid_token(token_entry, account)
         except Exception as e:
             logger.error(f"Error retrieving access token: {e}")
             raise
 
-        return None
+    async def get_stored_access_token_async(self, account: str) -> Any | None:
+        """
+        Retrieve stored access token for a given account without blocking the event loop.
+        """
+        try:
+            async with db.get_async_session() as session:
+                result = await session.execute(select(self.model).filter_by(account=account))
+                return self._valid_token(result.scalars().first(), account)
+        except Exception as e:
+            logger.error(f"Error retrieving access token: {e}")
+            raise
 
     def check_update_access_token(self, new_token: str, account: str) -> None:
         """
@@ -1,8 +1,7 @@
 import inspect
 from typing import List, Set, Tuple, Any, Dict, Union, Optional, Type, TypeVar
 
-import pandas as pd
-from sqlalchemy import select, delete, Column
+from sqlalchemy import select, delete, update, bindparam, and_, Column, tuple_
 from sqlalchemy.dialects.postgresql import insert as pg_insert  # Use alias to avoid conflict if needed
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -12,23 +11,26 @@ from sqlalchemy.orm import DeclarativeBase  # Assuming use of declarative base f
 from src.core.decorators import track_it
 # Assuming db and logger setup are correct
 from src.helpers.database_manager import db
+from src.helpers.lazy_import import lazy_import
 from src.helpers.logger import get_logger
 from src.helpers.utils import rec_to_dict
 
 logger = get_logger(__name__)
 
+pd = lazy_import("pandas")  # Loaded the first time a DataFrame or Series is actually handled
+
 # Generic Type Variable for the SQLAlchemy model
 ModelType = TypeVar("ModelType", bound=DeclarativeBase)  # Bound to DeclarativeBase or your base class
 
 
-def _normalize_record(record: Union[Dict[str, Any], pd.Series]) -> Dict[str, Any]:
+def _normalize_record(record: Union[Dict[str, Any], 'pd.Series']) -> Dict[str, Any]:
     """Convert input record (dict or Series) to a dictionary."""
+    if isinstance(record, dict):
+        return record
     if isinstance(record, pd.Series):
         # Convert pandas dtypes carefully if needed (e.g., timestamps)
         # For simplicity, basic to_dict is often sufficient
         return record.to_dict()
-    if isinstance(record, dict):
-        return record
     raise TypeError(f"Unsupported record type: {type(record)}. Must be dict or pd.Series.")
 
 
@@ -69,6 +71,18 @@ class ServiceBase:
     def get_records(self):
         return self.records
 
+    def upsert_later(self, record: Union[Dict[str, Any], 'pd.Series'], key_cols: Optional[List[str]] = None):
+        """
+        Queues an upsert on the write-behind queue and returns immediately. Updates to the same key
+        are coalesced and written in batches; use it for high-frequency state rather than one-off writes.
+
+        Args:
+            record: Column values, including the key columns.
+            key_cols: Unique columns to upsert on. Defaults to conflict_cols, then the primary key.
+        """
+        from src.core.write_behind import write_behind
+        write_behind.put(self, _normalize_record(record), key_cols)
+
 
     async def _execute_and_commit(self, session: AsyncSession, stmt: Any, operation_desc: str) -> Any:
         """Helper to execute a statement and commit, with standardized error handling."""
@@ -105,6 +119,17 @@ class ServiceBase:
             # Clear the cached records
             self.records = []
 
+    async def delete_by_ids(self, record_ids: List[Any]) -> None:
+        """Delete the records with the given primary key values (tuples of them for composite keys)."""
+        if not record_ids:
+            return
+
+        pk = getattr(self.model, self._pk_name) if self._pk_name else tuple_(*self._pk_columns)
+        stmt = delete(self.model).where(pk.in_(list(record_ids)))
+        async with db.get_async_session() as session:
+            await self._execute_and_commit(session, stmt, f"delete {len(record_ids)} records from {self.table_name}")
+            self.records = []
+
     async def get_by_id(self, record_id: Any) -> Optional[ModelType]:
         """
         Fetch a record by its primary key.
@@ -121,7 +146,7 @@ class ServiceBase:
             result = await session.execute(stmt)
             return result.scalars().first()
 
-    async def insert_record(self, record: Union[Dict[str, Any], pd.Series]) -> Optional[Any]:
+    async def insert_record(self, record: Union[Dict[str, Any], 'pd.Series']) -> Optional[Any]:
         """
         Insert a single record and return its primary key value(s).
         Returns the PK value for single PK, or a tuple for composite PK.
@@ -173,6 +198,8 @@ class ServiceBase:
         """
         Update a record identified by its primary key (single column only).
 
+        Issues a single `UPDATE ... WHERE pk = :pk` instead of loading the ORM object first.
+
         Returns:
             True if the update was successful, False if the record was not found.
         Raises:
@@ -187,47 +214,126 @@ class ServiceBase:
             logger.error(f"update_record currently only supports single-column primary keys for {self.table_name}.")
             raise NotImplementedError("Composite primary key handling not implemented for update_record.")
 
+        model_columns = {c.name for c in self._model_inspect.columns}
+        values = {}
+        for key, value in update_data.items():
+            if key in model_columns:
+                values[key] = value
+            else:
+                logger.warning(f"Attribute '{key}' not found on model {self.model.__name__}, skipping.")
+        if not values:
+            return False
+
+        pk_col: Column = getattr(self.model, self._pk_name)
+        stmt = update(self.model.__table__).where(pk_col == record_id).values(values)
+
         async with db.get_async_session() as session:
-            # Fetch the record using ORM capabilities for easy update
-            record_to_update = await self.get_by_id(record_id)  # get_by_id uses its own session scope
+            result = await self._execute_and_commit(session, stmt, f"update record {record_id} in {self.table_name}")
 
-            if not record_to_update:
-                logger.warning(f"Record with PK {record_id} not found in {self.table_name} for update.")
-                return False
+        if not result.rowcount:
+            logger.warning(f"Record with PK {record_id} not found in {self.table_name} for update.")
+            return False
 
-            # Update attributes on the ORM object
-            for key, value in update_data.items():
-                if hasattr(record_to_update, key):
-                    setattr(record_to_update, key, value)
-                else:
-                    logger.warning(f"Attribute '{key}' not found on model {self.model.__name__}, skipping.")
+        logger.info(f"Updated record {record_id} in {self.table_name} with {list(values.keys())}.")
+        # Clear cached records to ensure fresh data on next fetch
+        self.records = []
+        return True
+
+    @track_it()
+    async def bulk_update(
+            self,
+            records: Union[List[Dict[str, Any]], 'pd.DataFrame'],
+            key_cols: Optional[List[str]] = None,
+            batch_size: int = 1000,
+    ) -> int:
+        """
+        Update many existing rows in one round trip per batch.
+
+        Each record carries its key columns plus the columns to update. Records are grouped by
+        the set of columns they update and sent as an executemany `UPDATE ... WHERE key = :key`,
+        which asyncpg pipelines into a single round trip per batch.
+
+        Args:
+            records: List of dictionaries or Pandas DataFrame with key and update columns.
+            key_cols: Columns identifying the row. Defaults to the primary key columns.
+            batch_size: Number of records to send per executemany call.
+
+        Returns:
+            Number of records submitted for update.
+        """
+        if not isinstance(records, (list, tuple)) and isinstance(records, pd.DataFrame):
+            records = records.to_dict(orient="records")
 
-            # Add the (potentially modified) object to the session for tracking
-            session.add(record_to_update)
+        if not records:
+            logger.info(f"No records provided for bulk update of {self.table_name}.")
+            return 0
 
-            # Commit the session - SQLAlchemy handles the UPDATE statement
+        key_cols = list(key_cols or self._pk_names)
+        table = self.model.__table__
+        model_columns = {c.name for c in self._model_inspect.columns}
+
+        invalid_keys = set(key_cols) - model_columns
+        if invalid_keys:
+            raise ValueError(f"Invalid key columns for {self.table_name}: {invalid_keys}")
+
+        # Group records by the columns they update so every executemany batch has a uniform SET clause
+        grouped: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for i, record in enumerate(records):
+            record = _normalize_record(record)
+            missing_keys = [k for k in key_cols if k not in record]
+            if missing_keys:
+                raise ValueError(f"Record {i} is missing key columns {missing_keys} for bulk update.")
+            extra_keys = set(record.keys()) - model_columns
+            if extra_keys:
+                logger.error(f"Record {i} has invalid keys not in model: {extra_keys}")
+                raise ValueError(f"Invalid keys in record {i}: {extra_keys}")
+
+            update_cols = tuple(sorted(k for k in record if k not in key_cols))
+            if not update_cols:
+                continue
+            params = {f"_key_{k}": record[k] for k in key_cols}
+            params.update({f"_upd_{k}": record[k] for k in update_cols})
+            grouped.setdefault(update_cols, []).append(params)
+
+        rec_count = 0
+        async with db.get_async_session() as session:
             try:
+                for update_cols, params in grouped.items():
+                    stmt = (
+                        update(table)
+                        .where(and_(*[table.c[k] == bindparam(f"_key_{k}") for k in key_cols]))
+                        .values({k: bindparam(f"_upd_{k}") for k in update_cols})
+                    )
+                    for i in range(0, len(params), batch_size):
+                        batch = params[i:i + batch_size]
+                        await session.execute(stmt, batch)
+                        rec_count += len(batch)
+                        logger.debug(f"Updating {self.table_name} records {i + 1}:{i + len(batch)} "
+                                     f"columns {list(update_cols)}")
                 await session.commit()
-                logger.info(f"Updated record {record_id} in {self.table_name} with {list(update_data.keys())}.")
-                # Clear cached records to ensure fresh data on next fetch
-                self.records = []
-                return True
             except SQLAlchemyError as e:
                 await session.rollback()
-                logger.error(f"Error updating record {record_id} in {self.table_name}: {e}", exc_info=True)
+                logger.error(f"Error in bulk update of {self.table_name}: {e}", exc_info=True)
                 raise
 
+        logger.info(f"Bulk updated {rec_count} records in {self.table_name}.")
+        # Clear cached records to ensure fresh data on next fetch
+        self.records = []
+        return rec_count
+
     @track_it()
     async def bulk_insert_records(
             self,
-            records: Union[List[Dict[str, Any]], pd.DataFrame] = None,
+            records: Union[List[Dict[str, Any]], 'pd.DataFrame'] = None,
             index_elements: Optional[List[str]] = None,
             update_on_conflict: bool = False,
             skip_update_if_exists: bool = False,
             batch_size: int = 500,
             update_columns: Optional[List[str]] = None,
             ignore_extra_columns: bool = False,
-    ) -> List[ModelType]:
+            return_records: bool = True,
+            raise_on_error: bool = False,
+    ) -> Optional[List[ModelType]]:
         """
         Performs bulk insert/upsert using PostgreSQL's ON CONFLICT clause.
 
@@ -243,9 +349,13 @@ class ServiceBase:
                             not in index_elements.
             ignore_extra_columns: If True, silently ignores keys not in table columns.
                                   If False, raises error on invalid keys.
+            return_records: If False, skips reloading the whole table afterwards and returns None.
+                            Use it for large tables such as the reports.
+            raise_on_error: If True, re-raises after rolling back instead of only logging,
+                            for callers that retry such as the write-behind queue.
 
         Returns:
-            List of all records after the operation completes.
+            List of all records after the operation completes, or None if return_records is False.
         """
         if records is None:
             records = []
@@ -259,7 +369,7 @@ class ServiceBase:
 
         if not records:
             logger.info("No records provided for bulk insert.")
-            return await self.get_all_records(refresh=True)
+            return await self.get_all_records(refresh=True) if return_records else None
 
         model_columns = {c.name for c in self._model_inspect.columns}
 
@@ -315,9 +425,11 @@ class ServiceBase:
             except Exception as e:
                 logger.exception(f"Error in bulk insert into {self.table_name}: {e}")
                 await session.rollback()
+                if raise_on_error:
+                    raise
 
         # Return fresh records after bulk insert
-        return await self.get_all_records(refresh=True)
+        return await self.get_all_records(refresh=True) if return_records else None
 
     async def delete_setup_table_records(self, *args, **kwargs) -> List[ModelType]:
         """
@@ -22,8 +22,9 @@ class ServiceHoldings(SingletonBase, ServiceBase):
         self.symbol_map = {}
         self.records = []
 
-    async def process_records(self, records):
-
+    @staticmethod
+    def normalize(records):
+        """Flattens the MTF details of the holdings returned by Kite into table records."""
         master_rec = {'mtf_average_price': None, 'mtf_initial_margin': None, 'mtf_quantity': None,
                       'mtf_used_quantity': None, 'mtf_value': None}
         for record in records:
@@ -36,6 +37,10 @@ class ServiceHoldings(SingletonBase, ServiceBase):
                 record[f'mtf_{k}'] = v
 
             record['symbol_exchange'] = f'{record["tradingsymbol"]}:{record["exchange"]}'
+        return records
+
+    async def process_records(self, records):
+        records = self.normalize(records)
         await self.delete_setup_table_records(records)
         self.records = records
 
@@ -17,17 +17,22 @@ class ServiceOrders(SingletonBase, ServiceBase):
         super().__init__(model)
 
     async def bulk_insert_orders(self, records_df: pd.DataFrame):
-        """Bulk insert orders data, skipping duplicates."""
+        """
+        Bulk upsert orders on order_id. Only new or changed orders need to be passed; an order seen
+        again (status, fills) is updated in place rather than the table being rebuilt.
+        """
         if records_df.empty:
             logger.info("No valid order records to process.")
             return
 
-        await self.delete_all_records()
         table_columns = {c.name for c in self.model.__table__.columns}
         valid_columns = [c for c in records_df.columns if c in table_columns]
-        records = self.validate_clean_records(records_df)[valid_columns].to_dict(orient="records")
+        records = self.validate_clean_records(records_df)[valid_columns]
+        records = records.astype(object).where(records.notna(), None).to_dict(orient="records")
 
-        await self.bulk_insert_records(records=records, index_elements=["order_id"])
+        update_columns = [c for c in valid_columns if c not in ("id", "order_id", "timestamp")]
+        await self.bulk_insert_records(records=records, index_elements=["order_id"], update_on_conflict=True,
+                                       update_columns=update_columns, return_records=False, raise_on_error=True)
 
     @staticmethod
     def validate_clean_records(df: pd.DataFrame) -> pd.DataFrame:
@@ -37,7 +42,9 @@ class ServiceOrders(SingletonBase, ServiceBase):
         df["filled_quantity"] = df["filled_quantity"].fillna(0).astype(int)
         df["pending_quantity"] = df["pending_quantity"].fillna(0).astype(int)
         df["modified"] = df["modified"].astype(bool)
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
+        for column in ("order_timestamp", "exchange_timestamp", "exchange_update_timestamp", "timestamp"):
+            if column in df:
+                df[column] = pd.to_datetime(df[column])
         return df
 
 
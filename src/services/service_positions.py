@@ -25,9 +25,9 @@ class ServicePositions(SingletonBase, ServiceBase):
         self.symbol_map = {}
         self.records = None
 
-    async def process_records(self, records):
-        """Cleans and validates positions data before inserting into DB."""
-
+    @staticmethod
+    def normalize(records):
+        """Flattens the net/day positions returned by Kite into table records."""
         result = []
         for rec_type, recs in records.items():
             for record in recs:
@@ -35,7 +35,11 @@ class ServicePositions(SingletonBase, ServiceBase):
                 record['account'] = parms.DEF_ACCOUNT
                 record['symbol_exchange'] = f'{record["tradingsymbol"]}:{record["exchange"]}'
                 result.append(record)
+        return result
 
+    async def process_records(self, records):
+        """Cleans and validates positions data before inserting into DB."""
+        result = self.normalize(records)
         await self.delete_setup_table_records(result)
         self.records = result
 
@@ -0,0 +1,39 @@
+from typing import Set, List
+
+from sqlalchemy import select
+
+from src.core.singleton_base import SingletonBase
+from src.helpers.database_manager import db
+from src.helpers.logger import get_logger
+from src.models import ReportFileLog
+from src.services.service_base import ServiceBase
+
+logger = get_logger(__name__)
+
+
+class ServiceReportFileLog(SingletonBase, ServiceBase):
+    """Service class for the log of uploaded report files."""
+
+    model = ReportFileLog
+    conflict_cols = ['content_hash']
+
+    def __init__(self):
+        """Ensure __init__ is only called once."""
+        if getattr(self, '_singleton_initialized', False):
+            logger.debug(f"Instance for {self.__class__.__name__} already initialized.")
+            return
+        super().__init__(self.model, self.conflict_cols)
+
+    async def get_known_hashes(self) -> Set[str]:
+        async with db.get_async_session() as session:
+            result = await session.execute(select(self.model.content_hash))
+            return set(result.scalars().all())
+
+    async def log_files(self, records: List[dict]):
+        """Record uploaded files; a file seen before keeps its first entry."""
+        if records:
+            await self.setup_table_records(records, skip_update_if_exists=True)
+
+
+# Singleton instance
+service_report_file_log = ServiceReportFileLog()
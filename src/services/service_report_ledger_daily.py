@@ -0,0 +1,61 @@
+import asyncio
+
+import pandas as pd
+from sqlalchemy import select
+
+from src.core.decorators import track_it
+from src.core.ledger_reconciler import reconcile_balances, daily_cash_flow, log_gaps
+from src.core.singleton_base import SingletonBase
+from src.helpers.database_manager import db
+from src.helpers.logger import get_logger
+from src.models import ReportLedgerDaily, ReportLedgerEntries
+from src.services.service_base import ServiceBase
+from src.settings.parameter_manager import parms
+
+logger = get_logger(__name__)
+
+DAILY_COLUMNS = ['credit', 'debit', 'net_flow', 'closing_balance', 'entries', 'balance_gaps']
+
+
+class ServiceReportLedgerDaily(SingletonBase, ServiceBase):
+    """Service class for the daily cash-flow and balance series derived from the ledger."""
+
+    model = ReportLedgerDaily
+    conflict_cols = ['account', 'flow_date']
+
+    def __init__(self):
+        """Ensure __init__ is only called once."""
+        if getattr(self, '_singleton_initialized', False):
+            logger.debug(f"Instance for {self.__class__.__name__} already initialized.")
+            return
+        super().__init__(self.model, self.conflict_cols)
+
+    @staticmethod
+    async def get_ledger_frame() -> pd.DataFrame:
+        async with db.get_async_session() as session:
+            result = await session.execute(select(
+                ReportLedgerEntries.id, ReportLedgerEntries.account, ReportLedgerEntries.posting_date,
+                ReportLedgerEntries.particulars, ReportLedgerEntries.debit, ReportLedgerEntries.credit,
+                ReportLedgerEntries.net_balance,
+            ))
+            return pd.DataFrame(result.mappings().all(),
+                                columns=['id', 'account', 'posting_date', 'particulars', 'debit', 'credit',
+                                         'net_balance'])
+
+    @track_it()
+    async def reconcile(self):
+        """Verify balance continuity of the whole ledger and refresh the daily series."""
+        ledger = await self.get_ledger_frame()
+        if ledger.empty:
+            logger.info("No ledger entries to reconcile")
+            return
+
+        ledger = await asyncio.to_thread(reconcile_balances, ledger, parms.LEDGER_BALANCE_TOLERANCE)
+        log_gaps(ledger)
+        daily = await asyncio.to_thread(daily_cash_flow, ledger)
+        await self.setup_table_records(daily.astype(object).to_dict(orient="records"), update_columns=DAILY_COLUMNS)
+        logger.info(f"Ledger daily series refreshed: {len(daily)} account-days")
+
+
+# Singleton instance
+service_report_ledger_daily = ServiceReportLedgerDaily()
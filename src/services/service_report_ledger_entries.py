@@ -3,9 +3,11 @@ from typing import Union, List
 import pandas as pd
 
 from src.core.singleton_base import SingletonBase
-from src.helpers.date_time_utils import convert_to_timezone
+from src.helpers.date_time_utils import convert_columns_to_timezone
 from src.helpers.logger import get_logger
+from src.helpers.utils import row_key_hashes
 from src.models import ReportLedgerEntries
+from src.models.report_ledger_entries import LEDGER_KEY_COLUMNS, LEDGER_AMOUNT_COLUMNS
 from src.services.service_base import ServiceBase
 
 logger = get_logger(__name__)
@@ -17,14 +19,7 @@ class ServiceReportLedgerEntries(SingletonBase, ServiceBase):
     """Service class for handling ReportTradebook database operations."""
 
     model = ReportLedgerEntries
-    conflict_cols = ['account',
-                     'particulars',
-                     'posting_date',
-                     'cost_center',
-                     'voucher_type',
-                     'debit',
-                     'credit',
-                     'net_balance']
+    conflict_cols = ['row_hash']
 
     def __init__(self):
         """Ensure __init__ is only called once."""
@@ -36,7 +31,8 @@ class ServiceReportLedgerEntries(SingletonBase, ServiceBase):
     async def validate_insert_records(self, records: Union[pd.DataFrame, List[dict]]):
         """Bulk insert holdings data, skipping duplicates. Supports both DataFrame and list of dicts."""
         records = self.validate_clean_records(records)
-        await self.bulk_insert_records(records=records, index_elements=self.conflict_cols, skip_update_if_exists=True)
+        await self.bulk_insert_records(records=records, index_elements=self.conflict_cols, update_on_conflict=True,
+                                       skip_update_if_exists=True, return_records=False, raise_on_error=True)
 
         logger.info(f"Bulk processed {len(records)} records.")
 
@@ -47,11 +43,9 @@ class ServiceReportLedgerEntries(SingletonBase, ServiceBase):
         records = pd.DataFrame(records) if isinstance(records, list) else records
 
         # Convert date columns with timezone
-        for col, fmt, return_date in [("posting_date", "%Y-%m-%d", True)]:
-            if col in records:
-                records[col] = records[col].apply(
-                    lambda x: convert_to_timezone(x, format=fmt, return_date=return_date) if pd.notna(x) else None
-                )
+        records = convert_columns_to_timezone(records, [("posting_date", "%Y-%m-%d", True)])
+        records["row_hash"] = row_key_hashes(records, LEDGER_KEY_COLUMNS, LEDGER_AMOUNT_COLUMNS)
+        records = records.drop_duplicates("row_hash")  # Overlapping report files repeat entries
         records = records.to_dict(orient="records")
         return records
 
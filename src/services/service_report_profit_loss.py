@@ -4,7 +4,9 @@ import pandas as pd
 
 from src.core.singleton_base import SingletonBase
 from src.helpers.logger import get_logger
+from src.helpers.utils import row_key_hashes
 from src.models import ReportProfitLoss
+from src.models.report_profit_loss import PNL_KEY_COLUMNS, PNL_AMOUNT_COLUMNS
 from src.services.service_base import ServiceBase
 
 logger = get_logger(__name__)
@@ -16,12 +18,7 @@ class ServiceReportProfitLoss(SingletonBase, ServiceBase):
     """Service class for handling ReportProfitLoss database operations."""
 
     model = ReportProfitLoss
-    conflict_cols = ["account",
-                     "symbol",
-                     "isin",
-                     "quantity",
-                     "buy_value",
-                     "sell_value"]
+    conflict_cols = ["row_hash"]
 
     def __init__(self):
         """Ensure __init__ is only called once."""
@@ -32,14 +29,15 @@ class ServiceReportProfitLoss(SingletonBase, ServiceBase):
 
     async def validate_insert_records(self, records: Union[pd.DataFrame, List[dict]]):
         """Bulk insert holdings data, skipping duplicates. Supports both DataFrame and list of dicts."""
-        records = records.iloc[:, 1:]
-        await self.bulk_insert_records(records=records, index_elements=self.conflict_cols)
+        records = self.validate_clean_records(records.iloc[:, 1:])
+        await self.bulk_insert_records(records=records, index_elements=self.conflict_cols, update_on_conflict=True,
+                                       skip_update_if_exists=True, return_records=False, raise_on_error=True)
 
     @staticmethod
     def validate_clean_records(records):
         """Cleans and validates trade records before inserting into the database."""
-
-        return records
+        records = records.assign(row_hash=row_key_hashes(records, PNL_KEY_COLUMNS, PNL_AMOUNT_COLUMNS))
+        return records.drop_duplicates("row_hash")  # Overlapping report files repeat entries
 
 
 service_report_profit_loss = ServiceReportProfitLoss()
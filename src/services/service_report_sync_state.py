@@ -0,0 +1,40 @@
+from datetime import date
+from typing import Dict, Tuple
+
+from src.core.singleton_base import SingletonBase
+from src.helpers.logger import get_logger
+from src.models import ReportSyncState
+from src.services.service_base import ServiceBase
+
+logger = get_logger(__name__)
+
+
+class ServiceReportSyncState(SingletonBase, ServiceBase):
+    """Service class for the report ingestion high-water marks."""
+
+    model = ReportSyncState
+    conflict_cols = ['account', 'report']
+
+    def __init__(self):
+        """Ensure __init__ is only called once."""
+        if getattr(self, '_singleton_initialized', False):
+            logger.debug(f"Instance for {self.__class__.__name__} already initialized.")
+            return
+        super().__init__(self.model, self.conflict_cols)
+
+    async def get_watermarks(self) -> Dict[Tuple[str, str], date]:
+        """Last successfully ingested date per (account, report)."""
+        return {(record.account, record.report): record.last_synced_date
+                for record in await self.get_all_records(refresh=True)}
+
+    async def set_watermarks(self, watermarks: Dict[Tuple[str, str], date]):
+        if not watermarks:
+            return
+        records = [{'account': account, 'report': report, 'last_synced_date': last_synced_date}
+                   for (account, report), last_synced_date in watermarks.items()]
+        await self.setup_table_records(records, update_columns=['last_synced_date'])
+        logger.info(f"Report watermarks advanced: {watermarks}")
+
+
+# Singleton instance
+service_report_sync_state = ServiceReportSyncState()
@@ -0,0 +1,190 @@
+from collections import Counter
+from itertools import groupby
+from typing import AsyncIterator, Dict, List, Tuple
+
+from sqlalchemy import select, delete, insert, func, and_, or_, true
+
+from src.core.decorators import track_it
+from src.core.lot_matcher import match_fifo, OpenLot
+from src.core.singleton_base import SingletonBase
+from src.helpers.database_manager import db
+from src.helpers.logger import get_logger
+from src.models import ReportTradeLots, ReportTradebook
+from src.services.service_base import ServiceBase
+from src.settings.parameter_manager import parms
+
+logger = get_logger(__name__)
+
+TRADE_COLUMNS = (ReportTradebook.id, ReportTradebook.account, ReportTradebook.symbol, ReportTradebook.exchange,
+                 ReportTradebook.segment, ReportTradebook.trade_id, ReportTradebook.trade_type,
+                 ReportTradebook.quantity, ReportTradebook.price, ReportTradebook.order_execution_time)
+
+
+def _trade_key(trade) -> Tuple[str, str]:
+    return trade['account'], trade['symbol']
+
+
+class ServiceReportTradeLots(SingletonBase, ServiceBase):
+    """Service class for FIFO lot matching and realised P&L over report_tradebook."""
+
+    model = ReportTradeLots
+    conflict_cols = None
+
+    def __init__(self):
+        """Ensure __init__ is only called once."""
+        if getattr(self, '_singleton_initialized', False):
+            logger.debug(f"Instance for {self.__class__.__name__} already initialized.")
+            return
+        super().__init__(self.model, self.conflict_cols)
+
+    async def get_processed_row_ids(self, session) -> Dict[str, int]:
+        """Highest report_tradebook id already matched, per account. Every trade opens or closes some lot."""
+        result = await session.execute(
+            select(self.model.account, func.max(self.model.open_row_id), func.max(self.model.close_row_id))
+            .group_by(self.model.account)
+        )
+        return {account: max(open_row_id or 0, close_row_id or 0)
+                for account, open_row_id, close_row_id in result.all()}
+
+    @staticmethod
+    async def iter_new_trade_groups(session, processed_row_ids: Dict[str, int]) \
+            -> AsyncIterator[Tuple[Tuple[str, str], List[dict]]]:
+        """
+        Trades not matched yet, streamed in (account, symbol, execution time) order and yielded per
+        (account, symbol) as soon as the group is complete, so only one group is held in memory.
+        """
+        conditions = [ReportTradebook.account.notin_(list(processed_row_ids))] if processed_row_ids else [true()]
+        conditions += [and_(ReportTradebook.account == account, ReportTradebook.id > row_id)
+                       for account, row_id in processed_row_ids.items()]
+        result = await session.stream(
+            select(*TRADE_COLUMNS).where(or_(*conditions))
+            .order_by(ReportTradebook.account, ReportTradebook.symbol,
+                      ReportTradebook.order_execution_time, ReportTradebook.trade_id)
+        )
+        key, trades = None, []
+        async for row in result.mappings():
+            trade = dict(row)
+            if trades and _trade_key(trade) != key:
+                yield key, trades
+                trades = []
+            key = _trade_key(trade)
+            trades.append(trade)
+        if trades:
+            yield key, trades
+
+    @staticmethod
+    async def get_symbol_trades(session, account: str, symbol: str) -> List[dict]:
+        result = await session.execute(
+            select(*TRADE_COLUMNS)
+            .where(ReportTradebook.account == account, ReportTradebook.symbol == symbol)
+            .order_by(ReportTradebook.order_execution_time, ReportTradebook.trade_id)
+        )
+        return [dict(row) for row in result.mappings().all()]
+
+    async def get_lot_state(self, session, keys) -> Tuple[Dict[Tuple[str, str], List[OpenLot]],
+                                                        Dict[Tuple[str, str], object]]:
+        """Open lots and latest matched trade time of each (account, symbol) about to be extended."""
+        open_lots: Dict[Tuple[str, str], List[OpenLot]] = {}
+        last_times: Dict[Tuple[str, str], object] = {}
+        for account, symbols in groupby(sorted(keys), key=lambda key: key[0]):
+            symbols = [symbol for _, symbol in symbols]
+            in_scope = and_(self.model.account == account, self.model.symbol.in_(symbols))
+
+            result = await session.execute(
+                select(self.model).where(in_scope, self.model.status == 'OPEN')
+                .order_by(self.model.open_time, self.model.open_trade_id)
+            )
+            for lot in result.scalars().all():
+                open_lots.setdefault((lot.account, lot.symbol), []).append(
+                    OpenLot(lot.side, lot.quantity, float(lot.open_price), lot.open_trade_id, lot.open_time,
+                            lot.open_row_id))
+
+            result = await session.execute(
+                select(self.model.symbol, func.max(self.model.open_time), func.max(self.model.close_time))
+                .where(in_scope).group_by(self.model.symbol)
+            )
+            for symbol, open_time, close_time in result.all():
+                last_times[(account, symbol)] = max(filter(None, (open_time, close_time)))
+        return open_lots, last_times
+
+    @staticmethod
+    def to_records(account, symbol, exchange, segment, closed_lots, open_lots) -> List[dict]:
+        base = {'account': account, 'symbol': symbol, 'exchange': exchange, 'segment': segment}
+        records = [{
+            **base, 'side': lot.side, 'status': 'CLOSED', 'quantity': lot.quantity,
+            'open_trade_id': lot.open_trade_id, 'open_row_id': lot.open_row_id, 'open_time': lot.open_time,
+            'open_price': lot.open_price, 'close_trade_id': lot.close_trade_id, 'close_row_id': lot.close_row_id,
+            'close_time': lot.close_time, 'close_price': lot.close_price,
+            'realized_pnl': round(lot.realized_pnl, 4), 'holding_days': (lot.close_time - lot.open_time).days,
+        } for lot in closed_lots]
+        records += [{
+            **base, 'side': lot.side, 'status': 'OPEN', 'quantity': lot.quantity,
+            'open_trade_id': lot.trade_id, 'open_row_id': lot.row_id, 'open_time': lot.time,
+            'open_price': lot.price,
+        } for lot in open_lots]
+        return records
+
+    async def match_groups(self, session, trades_by_key: Dict[Tuple[str, str], List[dict]]) -> Dict[str, int]:
+        """
+        Match a batch of (account, symbol) groups and write their lots. Each touched symbol's OPEN rows are
+        replaced by the new remainder; a symbol receiving trades older than its matched history is rebuilt
+        from scratch. Returns the counts of symbols, lot rows written and symbols rebuilt.
+        """
+        open_lots, last_times = await self.get_lot_state(session, trades_by_key)
+
+        records = []
+        rebuilt = 0
+        for (account, symbol), trades in trades_by_key.items():
+            in_scope = and_(self.model.account == account, self.model.symbol == symbol)
+            last_time = last_times.get((account, symbol))
+            if last_time is not None and trades[0]['order_execution_time'] < last_time:
+                trades = await self.get_symbol_trades(session, account, symbol)
+                await session.execute(delete(self.model).where(in_scope))
+                key_open_lots = ()
+                rebuilt += 1
+            else:
+                await session.execute(delete(self.model).where(in_scope, self.model.status == 'OPEN'))
+                key_open_lots = open_lots.get((account, symbol), ())
+
+            closed, still_open = match_fifo(trades, key_open_lots)
+            records += self.to_records(account, symbol, trades[0]['exchange'], trades[0]['segment'],
+                                       closed, still_open)
+
+        if records:
+            await session.execute(insert(self.model), records)
+        return {'symbols': len(trades_by_key), 'lots': len(records), 'rebuilt': rebuilt}
+
+    @track_it()
+    async def match_new_trades(self):
+        """
+        Extend the lots with trades added since the last run. Groups are matched while the trades stream in,
+        LOT_MATCH_BATCH_SYMBOLS symbols at a time, and committed together at the end.
+        """
+        async with db.get_async_session() as session:
+            try:
+                processed_row_ids = await self.get_processed_row_ids(session)
+                totals = Counter()
+                batch = {}
+                async for key, trades in self.iter_new_trade_groups(session, processed_row_ids):
+                    batch[key] = trades
+                    totals['trades'] += len(trades)
+                    if len(batch) >= parms.LOT_MATCH_BATCH_SYMBOLS:
+                        totals.update(await self.match_groups(session, batch))
+                        batch = {}
+                if batch:
+                    totals.update(await self.match_groups(session, batch))
+
+                if not totals['trades']:
+                    logger.info("No new trades to match")
+                    return
+                await session.commit()
+                logger.info(f"Matched {totals['trades']} trades across {totals['symbols']} symbols "
+                            f"({totals['rebuilt']} rebuilt), {totals['lots']} lot rows written")
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"Lot matching failed: {e}")
+                raise
+
+
+# Singleton instance
+service_report_trade_lots = ServiceReportTradeLots()
@@ -1,7 +1,7 @@
 import pandas as pd
 
 from src.core.singleton_base import SingletonBase
-from src.helpers.date_time_utils import convert_to_timezone
+from src.helpers.date_time_utils import convert_columns_to_timezone
 from src.helpers.logger import get_logger
 from src.models.report_tradebook import ReportTradebook
 from src.services.service_base import ServiceBase
@@ -28,7 +28,9 @@ class ServiceReportTradebook(SingletonBase, ServiceBase):
 
         records = self.validate_clean_records(records)
 
-        await self.bulk_insert_records(records=records, index_elements=self.conflict_cols)
+        # Downloads restart on the watermark day, so trades already stored are skipped (DO NOTHING)
+        await self.bulk_insert_records(records=records, index_elements=self.conflict_cols, update_on_conflict=True,
+                                       skip_update_if_exists=True, return_records=False, raise_on_error=True)
 
     @staticmethod
     def validate_clean_records(records: pd.DataFrame):
@@ -44,15 +46,11 @@ class ServiceReportTradebook(SingletonBase, ServiceBase):
         )
 
         # Convert date columns with timezone
-        for col, fmt, return_date in [
+        records = convert_columns_to_timezone(records, [
             ("trade_date", "%Y-%m-%d", True),
             ("order_execution_time", "%Y-%m-%dT%H:%M:%S", None),
             ("expiry_date", "%Y-%m-%d", True),
-        ]:
-            if col in records:
-                records[col] = records[col].apply(
-                    lambda x: convert_to_timezone(x, format=fmt, return_date=return_date) if pd.notna(x) else None
-                )
+        ])
         records = records.drop_duplicates(['account', 'trade_id'])
         records = records.to_dict(orient="records")
 
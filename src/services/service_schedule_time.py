@@ -1,12 +1,13 @@
-from datetime import datetime, time
+from datetime import date, time
 from typing import List, Union, Set
 from typing import Tuple, Optional, Dict
 
 from sqlalchemy import select
 
+from src.core.market_schedule import DaySchedule, MarketCalendar
 from src.core.singleton_base import SingletonBase
 from src.helpers.database_manager import db
-from src.helpers.date_time_utils import today_indian, current_time_indian
+from src.helpers.date_time_utils import today_indian, timestamp_indian
 from src.helpers.logger import get_logger
 from src.helpers.utils import rec_to_dict
 from src.models.schedule_time import ScheduleTime
@@ -30,6 +31,9 @@ class ServiceScheduleTime(SingletonBase, ServiceBase):
         super().__init__(self.model, self.conflict_cols)
         self.last_checked_date = None
         self.schedule_records = {}
+        self.day_schedules = {}
+        self.all_records = None
+        self.market_calendar = None
 
     def get_unique_exchanges(self) -> List[str]:
         """Fetch unique exchange values from the table."""
@@ -42,121 +46,134 @@ class ServiceScheduleTime(SingletonBase, ServiceBase):
                 logger.error(f"Error fetching unique exchanges: {e}")
                 return ["*"]
 
-    def get_market_schedule_recs_for_today(self) -> List[dict]:
-        """Retrieve today's market hours with a fallback mechanism, considering all exchanges."""
-        if self.schedule_records:
-            return self.schedule_records
+    async def get_unique_exchanges_async(self) -> List[str]:
+        """Fetch unique exchange values from the table without blocking the event loop."""
+        async with db.get_async_session() as session:
+            try:
+                query = select(self.model.exchange).distinct()
+                results = (await session.execute(query)).scalars().all()
+                return list(results)
+            except Exception as e:
+                logger.error(f"Error fetching unique exchanges: {e}")
+                return ["*"]
+
+    def _load_all_records(self) -> List[dict]:
+        """Load the whole schedule_time table with a single query."""
+        if self.all_records is None:
+            with db.get_sync_session() as session:
+                records = [rec_to_dict(record) for record in session.execute(select(self.model)).scalars().all()]
+            self._compile_calendar(records)
+        return self.all_records
+
+    async def _load_all_records_async(self) -> List[dict]:
+        """Load the whole schedule_time table with a single query."""
+        if self.all_records is None:
+            self._compile_calendar([rec_to_dict(record) for record in await self.get_all_records(refresh=True)])
+        return self.all_records
+
+    def _compile_calendar(self, records: List[dict]):
+        self.all_records = records
+        self.market_calendar = MarketCalendar(records)
+        logger.info(f"Compiled {self.market_calendar} from {len(records)} schedule records")
+
+    def get_market_calendar(self) -> MarketCalendar:
+        """Market calendar shared by the initializer, the Ticker and the thread scheduler."""
+        if self.market_calendar is None:
+            self._load_all_records()
+        return self.market_calendar
+
+    async def get_market_calendar_async(self) -> MarketCalendar:
+        """Async equivalent of get_market_calendar for use during startup."""
+        if self.market_calendar is None:
+            await self._load_all_records_async()
+        return self.market_calendar
+
+    def _cache_day_schedule(self, trading_day: date, records: List[dict]) -> DaySchedule:
+        day_schedule = DaySchedule(trading_day, records, self.market_calendar)
+        self.day_schedules = {trading_day: day_schedule}  # Only the current trading day is kept
+        logger.info(f"Compiled schedule for {trading_day}: {day_schedule}")
+        return day_schedule
+
+    def get_day_schedule(self, trading_day: Optional[date] = None) -> DaySchedule:
+        """Compiled schedule for a trading day (defaults to today), cached per trading day."""
+        trading_day = trading_day or today_indian()
+        if trading_day not in self.day_schedules:
+            self._cache_day_schedule(trading_day, self._load_all_records())
+        return self.day_schedules[trading_day]
+
+    async def get_day_schedule_async(self, trading_day: Optional[date] = None) -> DaySchedule:
+        """Async equivalent of get_day_schedule for use during startup."""
+        trading_day = trading_day or today_indian()
+        if trading_day not in self.day_schedules:
+            self._cache_day_schedule(trading_day, await self._load_all_records_async())
+        return self.day_schedules[trading_day]
+
+    def invalidate_schedule_cache(self):
+        self.all_records = None
+        self.market_calendar = None
+        self.day_schedules = {}
+        self.schedule_records = {}
+        self.last_checked_date = None
 
-        today = today_indian()
-        weekday = today.strftime("%A")
-        today_str = today.strftime("%Y-%m-%d")  # Assuming default postgres date format is YYYY-MM-DD
-        records = []
-        exchanges = self.get_unique_exchanges()
-        imp_columns = self.conflict_cols + ['end_time', 'is_market_open']
+    async def setup_table_records(self, *args, **kwargs):
+        result = await super().setup_table_records(*args, **kwargs)
+        self.invalidate_schedule_cache()
+        return result
 
-        with db.get_sync_session() as session:
-            for schedule in ('MARKET', 'PRE_MARKET'):
-                for exchange in exchanges:
-                    for market_day in [today_str, weekday, '*']:
-                        logger.info(
-                            f"Checking {schedule} hours for market_day='{market_day}' and exchange='{exchange}'"
-                        )
-                        query = select(self.model).where(
-                            self.model.market_day == market_day,
-                            self.model.schedule == schedule,
-                            self.model.exchange == exchange
-                        )
-                        record = session.execute(query).scalars().first()
-                        if record:
-                            result = rec_to_dict(record)
-                            # result = {column: getattr(record, column) for column in self._model_inspect.columns}
-                            records.append(result)
-                            self.schedule_records[result['id']] = result
-                            break  # Stop at first match for this combo
-
-        self.schedule_records = records
-        return records
+    def get_market_schedule_recs_for_today(self) -> List[dict]:
+        """Retrieve today's market hours, resolving exact date > weekday > '*' per schedule and exchange."""
+        day_schedule = self.get_day_schedule()
+        self.schedule_records = day_schedule.records
+        self.last_checked_date = day_schedule.trading_day
+        return self.schedule_records
+
+    async def get_market_schedule_recs_for_today_async(self) -> List[dict]:
+        """Async equivalent of get_market_schedule_recs_for_today for use during startup."""
+        day_schedule = await self.get_day_schedule_async()
+        self.schedule_records = day_schedule.records
+        self.last_checked_date = day_schedule.trading_day
+        return self.schedule_records
 
     def get_schedule_records(self):
-        if not self.schedule_records:
+        if not self.schedule_records or self.last_checked_date != today_indian():
             self.get_market_schedule_recs_for_today()
         return self.schedule_records
 
     def get_schedule_recs_by_type(
             self, batch_type: Optional[Union[str, List[str], Tuple[str], Set[str]]] = None
-    ) -> List[ScheduleTime]:
-        """Retrieve today's batch processing schedule list, considering all exchanges."""
-        today_str = today_indian().strftime("%Y-%m-%d")
-        all_schedules = []
-        exchanges = self.get_unique_exchanges()
-
-        with db.get_sync_session() as session:
-            for exchange in exchanges + ["*"]:  # Handles global after loop
-                logger.info(f"Checking batch schedules for {today_str} and exchange='{exchange}'")
-                query = select(self.model).where(
-                    self.model.market_date == today_str,
-                    self.model.exchange == exchange
-                )
-                if batch_type:
-                    query = query.where(self.model.schedule.in_(batch_type))
-
-                found_schedules = session.execute(query).scalars().all()
-                all_schedules.extend(found_schedules)
-
-            if not all_schedules:
-                logger.info(f"No batch schedules found for {batch_type} on {today_str} for any exchange.")
-
-        return list({sched.id: sched for sched in all_schedules}.values())  # Deduplication by ID
+    ) -> List[dict]:
+        """Retrieve today's resolved schedule records, optionally limited to the given schedule types."""
+        if isinstance(batch_type, str):
+            batch_type = {batch_type}
+        records = self.get_day_schedule().records
+        if batch_type:
+            records = [record for record in records if record['schedule'] in batch_type]
+
+        if not records:
+            logger.info(f"No batch schedules found for {batch_type} on {today_indian()} for any exchange.")
+        return records
 
     def is_market_open(
             self, pre_market: bool = False, exchange: str = '*'
-    ) -> Tuple[bool, Optional[Dict], Optional[Dict]]:
-        """Determine if the market is currently open."""
-        today = today_indian()
-        current_time = current_time_indian()
+    ) -> Tuple[bool, Optional[time], Optional[time]]:
+        """
+        Determine if the market is currently open.
+        Returns (is_open, first opening, last closing) for today from the compiled market calendar.
+        """
         market_flag = 'PRE_MARKET' if pre_market else 'MARKET'
+        try:
+            calendar = self.get_market_calendar()
+        except Exception as e:
+            logger.error(f"Failed to fetch market hours: {e}")
+            return False, None, None
 
-        if self.last_checked_date != today or self.schedule_records is None:
-            try:
-                self.schedule_records = self.get_market_schedule_recs_for_today()
-                self.last_checked_date = today
-            except Exception as e:
-                logger.error(f"Failed to fetch market hours: {e}")
-                self.schedule_records = None
-                return False, None, None
-
-        def parse_time(t: str) -> Optional[time]:
-            try:
-                return datetime.strptime(t, "%H:%M").time()
-            except Exception as e:
-                logger.warning(f"Invalid time format '{t}': {e}")
-                return None
-
-        filtered = []
-        for x in self.schedule_records:
-            if (
-                    x.get('schedule') == market_flag
-                    and x.get('exchange') == exchange
-                    and x.get('is_market_open')
-            ):
-                start_time_str = x.get('start_time')
-                end_time_str = x.get('end_time')
-                start_time = parse_time(start_time_str)
-                end_time = parse_time(end_time_str)
-                if start_time and end_time:
-                    x['start_time'] = start_time
-                    x['end_time'] = end_time
-                    filtered.append(x)
-
-        if not filtered:
+        now = timestamp_indian()
+        bounds = calendar.get_bounds(exchange, market_flag, now.date())
+        if not bounds:
             logger.info(f"No open market hours found for {market_flag} on {exchange}")
             return False, None, None
 
-        earliest_start = min(filtered, key=lambda x: x['start_time'])
-        latest_end = max(filtered, key=lambda x: x['end_time'])
-
-        is_open = earliest_start['start_time'] <= current_time <= latest_end['end_time']
-        return is_open, earliest_start, latest_end
+        return calendar.is_open(exchange, market_flag, now), bounds[0], bounds[-1]
 
 
 # Singleton instance
@@ -1,48 +1,25 @@
-import asyncio
+from typing import List
 
 from sqlalchemy import select
 
 from src.helpers.database_manager import db
-from src.models import ScheduleTime, ThreadSchedule, ThreadList
-from src.services.service_schedule_list import get_market_hours_for_today
+from src.helpers.logger import get_logger
+from src.models import ThreadSchedule, ThreadList
 
+logger = get_logger(__name__)
 
-async def get_active_thread_schedule_time(account=None):
-    """Fetch start and end times for active threads based on market hours."""
+
+async def get_active_thread_schedules() -> List[dict]:
+    """
+    Fetch the schedule and concurrent-run limit of every active thread. Open/close times come from the
+    market calendar, so only the thread -> schedule mapping is read here.
+    """
     async with db.get_async_session() as session:
         stmt = (
-            select(
-                ThreadList.thread,
-                ThreadSchedule.schedule,
-                ScheduleTime.start_time,
-                ScheduleTime.end_time
-            )
+            select(ThreadList.thread, ThreadSchedule.schedule, ThreadSchedule.max_instances)
             .join(ThreadSchedule, ThreadList.thread == ThreadSchedule.thread)
-            .join(ScheduleTime, ThreadSchedule.schedule == ScheduleTime.schedule)
             .where(ThreadList.is_active == True)
         )
         result = await session.execute(stmt)
-        thread_schedules = result.all()  # List of tuples
-
-    # Apply market schedule filtering
-    market_hours = get_market_hours_for_today(account)
-    if market_hours:
-        filtered_threads = [
-            (thread, schedule, start_time, end_time)
-            for thread, schedule, start_time, end_time in thread_schedules
-            if (start_time >= market_hours.start_time and end_time <= market_hours.end_time)
-        ]
-        return filtered_threads
-
-    return thread_schedules  # Return all if no market hours found
-
-
-# Simple test runner for async SQLAlchemy call
-async def main():
-    results = await get_active_thread_schedule_time()
-    print("\n🧪 Active Thread Schedule Timings:\n")
-    print(results)  # pretty prints list of tuples
-
-
-if __name__ == "__main__":
-    asyncio.run(main())
+        return [{'thread': thread, 'schedule': schedule, 'max_instances': max_instances}
+                for thread, schedule, max_instances in result.all()]
@@ -1,16 +1,24 @@
+from typing import Optional
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
+
 from src.core.singleton_base import SingletonBase
+from src.helpers.database_manager import db
+from src.helpers.date_time_utils import timestamp_indian
 from src.helpers.logger import get_logger
 from src.models import ThreadStatusTracker
 from src.services.service_base import ServiceBase
+from src.settings.constants_manager import ThreadStatus
 
 logger = get_logger(__name__)
 
 
-class ThreadStatusTrackerServiceBase(SingletonBase, ServiceBase):
-    """Service class for handling ReportTradebook database operations."""
+class ServiceThreadStatusTracker(SingletonBase, ServiceBase):
+    """Service class for handling ThreadStatusTracker database operations."""
 
     model = ThreadStatusTracker
-    conflict_cols = ['account']
+    conflict_cols = ['thread', 'account']
 
     def __init__(self):
         """Ensure __init__ is only called once."""
@@ -19,8 +27,38 @@ class ThreadStatusTrackerServiceBase(SingletonBase, ServiceBase):
             return
         super().__init__(self.model, self.conflict_cols)
 
-    @classmethod
-    def validate_clean_records(cls, data_record):
-        """Cleans and validates trade records before inserting into the database."""
+    async def _upsert(self, values: dict, set_: dict, operation_desc: str):
+        """Insert the thread's tracker row or update it in one statement; tracking never fails a job."""
+        stmt = pg_insert(self.model).values(**values, upd_timestamp=timestamp_indian())
+        stmt = stmt.on_conflict_do_update(index_elements=self.conflict_cols,
+                                          set_={**set_, 'upd_timestamp': stmt.excluded.upd_timestamp})
+        async with db.get_async_session() as session:
+            try:
+                await self._execute_and_commit(session, stmt, operation_desc)
+            except SQLAlchemyError as e:
+                logger.error(f"Error recording {operation_desc}: {e}")
+
+    async def record_start(self, thread: str, schedule: str, account: str = '*') -> None:
+        """Mark the thread IN_PROGRESS as its run starts, so a hung or crashed run stays visible."""
+        await self._upsert(
+            {'thread': thread, 'account': account, 'schedule': schedule, 'thread_status': ThreadStatus.IN_PROGRESS,
+             'run_count': 0, 'error_count': 0},
+            {'schedule': schedule, 'thread_status': ThreadStatus.IN_PROGRESS, 'notes': None},
+            f"start of {thread} for {account}")
+
+    async def record_run(self, thread: str, schedule: str, succeeded: bool, duration: float,
+                         account: str = '*', notes: Optional[str] = None) -> None:
+        """Add a finished run to the thread's tracker row, creating it if the start was not recorded."""
+        status = ThreadStatus.COMPLETED if succeeded else ThreadStatus.FAILED
+        error_count = 0 if succeeded else 1
+        notes = notes[:255] if notes else None
+        await self._upsert(
+            {'thread': thread, 'account': account, 'schedule': schedule, 'thread_status': status,
+             'run_count': 1, 'error_count': error_count, 'duration': duration, 'notes': notes},
+            {'schedule': schedule, 'thread_status': status, 'run_count': self.model.run_count + 1,
+             'error_count': self.model.error_count + error_count, 'duration': duration, 'notes': notes},
+            f"run of {thread} for {account}")
+
 
-        return data_record
+# Singleton instance
+service_thread_status_tracker = ServiceThreadStatusTracker()
@@ -32,7 +32,14 @@ REPORT = {
         "button": "//button[@type='submit']",
         "href": "//a[contains(text(), 'CSV')]",
         "prefix": "tradebook",
-        "file_regex": r"(tradebook)-([^-]*)-([^-.(]*)(?:[(]\d*[)])?[.](csv)"
+        "file_regex": r"(tradebook)-([^-]*)-([^-.(]*)(?:[(][\w-]*[)])?[.](csv)",
+        "api": {
+            "path": "/api/reports/tradebook",
+            "params": {"format": "csv"},
+            "segments": {"Equity": "EQ", "Futures & Options": "FO"},
+            "file_name": "{prefix}-{account}-{segment}({from_date}-{to_date}).{ext}",
+            "ext": "csv"
+        }
     },
 
     'PNL': {
@@ -53,7 +60,14 @@ REPORT = {
         "button": "//button[@class='btn-blue']",
         "href": "//div[contains(text(), 'Download')]",
         "prefix": "pnl",
-        "file_regex": r"(pnl)-(.+?)(?:[(]\d+[)])?[.](csv|xlsx)"
+        "file_regex": r"(pnl)-(.+?)(?:[(][\w-]+[)])?[.](csv|xlsx)",
+        "api": {
+            "path": "/api/reports/pnl",
+            "params": {"format": "xlsx", "type": "realised"},
+            "segments": {"Equity": "EQ", "Futures & Options": "FO"},
+            "file_name": "{prefix}-{account}({segment}-{from_date}-{to_date}).{ext}",
+            "ext": "xlsx"
+        }
     },
 
     'LEDGER': {
@@ -67,7 +81,14 @@ REPORT = {
         "button": "//button[@type='submit']",
         "href": "//a[contains(text(), 'CSV')]",
         "prefix": "ledger",
-        "file_regex": r"(ledger)-(.+?)(?:[(]\d+[)])?[.](csv|xlsx)"
+        "file_regex": r"(ledger)-(.+?)(?:[(][\w-]+[)])?[.](csv|xlsx)",
+        "api": {
+            "path": "/api/funds/statement",
+            "params": {"format": "csv"},
+            "segments": {"Equity": "EQ"},
+            "file_name": "{prefix}-{account}({from_date}-{to_date}).{ext}",
+            "ext": "csv"
+        }
     }
 }
 
@@ -1,30 +1,110 @@
+import asyncio
 import time
+from concurrent.futures import ThreadPoolExecutor
+from inspect import iscoroutinefunction
 
-from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.date import DateTrigger
 
+from src.app_initializer import app_initializer
+from src.core.singleton_base import SingletonBase
+from src.helpers.date_time_utils import INDIAN_TIMEZONE
+from src.helpers.logger import get_logger
+from src.services.service_schedule_time import service_schedule_time
+from src.services.service_thread_schedule_time import get_active_thread_schedules
+from src.services.service_thread_status_tracker import service_thread_status_tracker
+from src.settings.constants_manager import Thread
+from src.settings.parameter_manager import parms
 
-def scheduled_task():
-    """Function to run the report downloader."""
-    try:
-        ReportDownloader.setup_driver()
-        ReportDownloader.login_kite()
-        # Add other necessary calls if required
-    except Exception as e:
-        logger.error(f"Scheduled task failed: {e}")
+logger = get_logger(__name__)
 
 
-# Initialize APScheduler
-scheduler = BackgroundScheduler()
+class ThreadScheduler(SingletonBase):
+    """
+    Runs the active threads of thread_list / thread_schedule at the next opening of their schedule.
 
-# Schedule `scheduled_task` at a specific time (e.g., every day at 9:15 AM)
-scheduler.add_job(scheduled_task, 'cron', hour=9, minute=15)
+    Each Thread constant maps to the AppInitializer method of the same name. Jobs run on the event loop,
+    with blocking work on a bounded thread pool (also the loop's default executor, so asyncio.to_thread
+    is bounded too). At most SCHEDULER_MAX_CONCURRENT_JOBS jobs run at once, and each job at most
+    thread_schedule.max_instances times at once (SCHEDULER_JOB_MAX_INSTANCES when not set). Every run is
+    marked IN_PROGRESS in thread_status_tracker when it starts and recorded there when it ends.
+    """
 
-# Start the scheduler
-scheduler.start()
+    def __init__(self):
+        """Ensure __init__ is only called once."""
+        if getattr(self, '_singleton_initialized', False):
+            logger.debug(f"Instance for {self.__class__.__name__} already initialized.")
+            return
+        self.scheduler = None
+        self.executor = ThreadPoolExecutor(max_workers=parms.SCHEDULER_MAX_WORKERS, thread_name_prefix='scheduler')
+        self.job_semaphore = None
+        self.thread_schedules = {}  # thread -> its thread_schedule record
+        self._singleton_initialized = True
 
-# Keep the script running to allow scheduled execution
-try:
-    while True:
-        time.sleep(1)
-except (KeyboardInterrupt, SystemExit):
-    scheduler.shutdown()
+    @staticmethod
+    def get_job(thread):
+        return getattr(app_initializer, thread, None)
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(self.executor)
+        self.job_semaphore = asyncio.Semaphore(parms.SCHEDULER_MAX_CONCURRENT_JOBS)
+        self.scheduler = AsyncIOScheduler(event_loop=loop, timezone=INDIAN_TIMEZONE)
+
+        calendar = await service_schedule_time.get_market_calendar_async()
+        for record in await get_active_thread_schedules():
+            thread = record['thread']
+            if not hasattr(Thread, thread) or self.get_job(thread) is None:
+                logger.warning(f"No job defined for thread {thread}, skipping.")
+                continue
+            self.thread_schedules[thread] = record
+            self.schedule_next(thread, calendar)
+
+        self.scheduler.start()
+        logger.info(f"Thread scheduler started with jobs: {self.scheduler.get_jobs()}")
+
+    def schedule_next(self, thread, calendar):
+        schedule = self.thread_schedules[thread]['schedule']
+        run_at = calendar.next_open(schedule=schedule)
+        if run_at is None:
+            logger.warning(f"No upcoming {schedule} opening, {thread} is not scheduled.")
+            return
+
+        self.scheduler.add_job(self.run_job, DateTrigger(run_date=run_at), args=[thread], id=thread,
+                               name=thread, replace_existing=True, coalesce=True,
+                               max_instances=self.get_max_instances(thread),
+                               misfire_grace_time=parms.SCHEDULER_MISFIRE_GRACE_TIME)
+        logger.info(f"Scheduled {thread} for {schedule} at {run_at}")
+
+    def get_max_instances(self, thread) -> int:
+        return self.thread_schedules[thread].get('max_instances') or parms.SCHEDULER_JOB_MAX_INSTANCES
+
+    async def run_job(self, thread):
+        job = self.get_job(thread)
+        schedule = self.thread_schedules[thread]['schedule']
+        succeeded, notes = True, None
+
+        async with self.job_semaphore:
+            await service_thread_status_tracker.record_start(thread, schedule)
+            start_time = time.perf_counter()
+            try:
+                if iscoroutinefunction(job):
+                    await job()
+                else:
+                    await asyncio.get_running_loop().run_in_executor(self.executor, job)
+            except Exception as e:
+                succeeded, notes = False, str(e)
+                logger.exception(f"Scheduled job {thread} failed: {e}")
+            duration = time.perf_counter() - start_time
+
+        logger.info(f"Scheduled job {thread} {'completed' if succeeded else 'failed'} in {duration:.4f} seconds")
+        await service_thread_status_tracker.record_run(thread, schedule, succeeded, duration, notes=notes)
+        self.schedule_next(thread, await service_schedule_time.get_market_calendar_async())
+
+    def shutdown(self):
+        if self.scheduler and self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
+        self.executor.shutdown(wait=False)
+
+
+thread_scheduler = ThreadScheduler()
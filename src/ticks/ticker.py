@@ -5,7 +5,7 @@ from kiteconnect import KiteTicker
 
 from src.core.decorators import retry_kite_conn
 from src.core.singleton_base import SingletonBase
-from src.helpers.date_time_utils import today_indian, current_time_indian
+from src.helpers.date_time_utils import timestamp_indian
 from src.helpers.logger import get_logger
 from src.settings.parameter_manager import parms
 from src.ticks.tick_service import TickService
@@ -33,12 +33,14 @@ class Ticker(SingletonBase, threading.Thread):
             self.running = True
             self.tokens = set()
             self.track_instr_xref_exchange = None
-            self.schedule_time = None
+            self.market_calendar = None
             self.instruments = set()
             self.instr_xchange_xref = {}
             self.add_instruments = set()
             self.remove_instruments = set()
             self.reconnect_attempts = 0
+            self.instruments_lock = threading.RLock()  # The run loop and app state callbacks both update
+            self.unsubscribe = None
 
             Ticker._instance = self
             logger.info("Ticker thread initialized.")
@@ -58,26 +60,43 @@ class Ticker(SingletonBase, threading.Thread):
             self.socket_conn.connect(threaded=True)
 
     def run(self):
-        if not (self.schedule_time and self.track_instr_xref_exchange):
-            logger.error("update_schedule_time and update_instruments must be called before starting Ticker.")
+        if not (self.market_calendar and self.track_instr_xref_exchange):
+            logger.error("update_market_calendar and update_instruments must be called before starting Ticker.")
+            self.end_session()
             return
 
         logger.info("Ticker thread started.")
-        while self.running:
-            try:
+        try:
+            while self.running:
                 if self.update_instruments():
                     logger.debug("Market is open. Ensuring WebSocket is active.")
                     self.setup_socket_conn()
                 else:
                     logger.debug("Market is closed. WebSocket not required.")
-                    self.close_socket()
                     return
 
-                time.sleep(parms.KITE_SOCKET_SLEEP)
-
-            except Exception as e:
-                logger.error(f"Error in Ticker loop: {e}")
-                raise
+                time.sleep(self.get_sleep_seconds())
+
+        except Exception as e:
+            logger.error(f"Error in Ticker loop: {e}")
+            raise
+        finally:
+            self.close_socket()
+            self.end_session()
+
+    def end_session(self):
+        """
+        Drop the AppState subscription and this instance, so the next market open creates and starts a
+        fresh thread (a finished thread cannot be started again) with no tokens left from this session.
+        """
+        if self.unsubscribe:
+            self.unsubscribe()
+            self.unsubscribe = None
+        with Ticker._lock:
+            if Ticker._instance is self:
+                Ticker._instance = None
+                Ticker._instances.pop(Ticker, None)
+                Ticker.instrument_tokens = set()
 
     def close_socket(self):
         if self.socket_conn:
@@ -86,19 +105,23 @@ class Ticker(SingletonBase, threading.Thread):
             self.socket_conn = None
 
     def update_instruments(self, track_instr_xref_exchange=None):
-        if not (self.schedule_time and (self.track_instr_xref_exchange or track_instr_xref_exchange)):
-            logger.error("update_schedule_time and update_instruments must be called before executing update_instruments.")
+        with self.instruments_lock:
+            return self._update_instruments(track_instr_xref_exchange)
+
+    def _update_instruments(self, track_instr_xref_exchange=None):
+        if not (self.market_calendar and (self.track_instr_xref_exchange or track_instr_xref_exchange)):
+            logger.error("update_market_calendar and update_instruments must be called before executing update_instruments.")
             return
 
-        if not self.track_instr_xref_exchange:
+        if track_instr_xref_exchange:
             self.track_instr_xref_exchange = track_instr_xref_exchange
 
-        current_time = current_time_indian().strftime('%H:%M')
+        now = timestamp_indian()
 
         instruments = set()
-        for sch_rec in self.schedule_time:
-            if sch_rec['start_time'] <= current_time <= sch_rec['end_time']:
-                instruments.update(self.track_instr_xref_exchange[sch_rec['exchange']])
+        for exchange, tokens in self.track_instr_xref_exchange.items():
+            if self.market_calendar.is_open(exchange, 'MARKET', now):
+                instruments.update(tokens)
 
         if not instruments and self.instruments:
             Ticker.stop()
@@ -118,10 +141,45 @@ class Ticker(SingletonBase, threading.Thread):
         self.instruments = instruments
         return self.instruments
 
-    def update_schedule_time(self, schedule_time):
-        self.schedule_time = [val for val in schedule_time if val['schedule'] == "MARKET"]
+    def on_track_list_change(self, change):
+        """
+        AppState subscriber for the exchange-wise track list: subscribes and unsubscribes only the tokens
+        that changed on exchanges that are open now; closed exchanges are picked up by the run loop.
+        """
+        with self.instruments_lock:
+            self.track_instr_xref_exchange = change.new
+            if not self.market_calendar or not self.instruments:
+                return  # Not streaming yet; the run loop subscribes everything when it starts
+
+            now = timestamp_indian()
+            added, removed = set(), set()
+            for exchange, (exchange_added, exchange_removed) in change.set_diffs().items():
+                if self.market_calendar.is_open(exchange, 'MARKET', now):
+                    added |= exchange_added
+                removed |= exchange_removed  # Whether or not its market is open
+            self.add_instruments = added - self.instruments
+            self.remove_instruments = (removed - added) & self.instruments
+
+            if self.remove_instruments:
+                Ticker.remove_instruments(self.remove_instruments)
+            if self.add_instruments:
+                Ticker.add_instruments(self.add_instruments)
+            self.instruments = (self.instruments - self.remove_instruments) | self.add_instruments
+
+    def update_market_calendar(self, market_calendar):
+        self.market_calendar = market_calendar
         return self
 
+    def get_sleep_seconds(self):
+        """Sleep until the next open/close of any tracked exchange, capped at KITE_SOCKET_SLEEP."""
+        now = timestamp_indian()
+        sleep_seconds = parms.KITE_SOCKET_SLEEP
+        for exchange in self.track_instr_xref_exchange:
+            transition = self.market_calendar.next_transition(exchange, 'MARKET', now)
+            if transition:
+                sleep_seconds = min(sleep_seconds, (transition[0] - now).total_seconds())
+        return max(sleep_seconds, 0)
+
     # ─── WebSocket Class Methods ───────────────────────────────────────────────
 
     @classmethod
@@ -191,10 +249,12 @@ class Ticker(SingletonBase, threading.Thread):
 
     @classmethod
     def stop(cls):
-        with cls._lock:
-            if cls._instance:
-                logger.info("Stopping Ticker thread.")
-                cls._instance.running = False
-                cls._instance.close_socket()
-                cls._instance.join()
-                cls._instance = None
+        instance = cls._instance
+        if instance is None:
+            return
+        logger.info("Stopping Ticker thread.")
+        instance.running = False
+        instance.close_socket()
+        instance.end_session()
+        if instance.is_alive() and instance is not threading.current_thread():  # run() itself may call stop()
+            instance.join()
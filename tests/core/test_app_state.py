@@ -0,0 +1,103 @@
+import pytest
+
+from src.app_state_manager import AppState, Xref
+
+INSTRUMENTS = {
+    'INFY:NSE': {'instrument_token': 408065},
+    'TCS:NSE': {'instrument_token': 2953217},
+    'RELIANCE:BSE': {'instrument_token': 128083204},
+    'GOLDM25JUNFUT:MCX': {'instrument_token': 109127943},
+}
+
+TRACK_KEYS = (Xref.TRACK_INSTR_XREF_BY_CATEGORY, Xref.TRACK_INSTR_XREF_XCHANGE, Xref.TRACK_INSTR_SYMBOL_XREF,
+              Xref.SYMBOL_POSITIONS, Xref.INSTR_POSITIONS, Xref.SYMBOL_HOLDINGS, Xref.INSTR_HOLDINGS)
+
+
+@pytest.fixture
+def state():
+    state = object.__new__(AppState)  # A private instance, not the shared singleton
+    state._singleton_initialized = False
+    state.__init__()
+    state.set_instruments(INSTRUMENTS)
+    return state
+
+
+def tracked(state):
+    return {key: state.get(key) for key in TRACK_KEYS}
+
+
+def test_transaction_publishes_once_and_atomically(state):
+    version = state.version
+    with state.transaction():
+        state.set('a', 1)
+        state.set('b', {'x': 1})
+        state.set('b', 2, sub_key='y')
+        assert state.get('a') == 1  # The writer reads its pending state
+        assert 'a' not in state.track_state  # Readers still see the published one
+
+    assert state.version == version + 1
+    assert state.get('b') == {'x': 1, 'y': 2}
+
+
+def test_failed_transaction_publishes_nothing(state):
+    state.set('b', {'x': 1})
+    published = state.track_state
+    with pytest.raises(RuntimeError):
+        with state.transaction():
+            state.set('b', 2, sub_key='x')
+            raise RuntimeError('abort')
+
+    assert state.track_state is published
+    assert state.get('b') == {'x': 1}
+
+
+def test_subscribers_get_one_change_per_transaction(state):
+    changes = []
+    unsubscribe = state.subscribe('s', changes.append)
+    state.set('s', {1, 2})
+    with state.transaction():
+        state.set('s', {2, 3})
+        state.set('s', {2, 3, 4})
+    state.set('other', 1)
+
+    assert [(change.added, change.removed) for change in changes] == [({1, 2}, set()), ({3, 4}, {1})]
+    assert changes[1].version == changes[0].version + 1
+
+    unsubscribe()
+    state.set('s', set())
+    assert len(changes) == 2
+
+
+def test_failing_subscriber_does_not_break_the_writer(state):
+    seen = []
+    state.subscribe('k', lambda change: 1 / 0)
+    state.subscribe('k', seen.append)
+    state.set('k', 1)
+
+    assert state.get('k') == 1
+    assert len(seen) == 1
+
+
+def test_incremental_tracking_matches_a_full_rebuild(state):
+    exchanges = ('NSE', 'BSE', '*')
+    state.set_positions({})
+    state.set_holdings({})
+    state.set_watchlist({})
+    state.set_track_list(exchanges)
+
+    state.upsert_tracked('p', 1, {'symbol_exchange': 'INFY:NSE'})
+    state.upsert_tracked('h', 2, {'symbol_exchange': 'INFY:NSE'})
+    state.upsert_tracked('h', 3, {'symbol_exchange': 'TCS:NSE'})
+    state.upsert_tracked('p', 4, {'symbol_exchange': 'GOLDM25JUNFUT:MCX'})
+    state.upsert_tracked('h', 3, {'symbol_exchange': 'RELIANCE:BSE'})  # Symbol changed
+    state.remove_tracked('p', 1)
+    incremental = tracked(state)
+
+    assert incremental[Xref.TRACK_INSTR_XREF_XCHANGE] == {'NSE': {408065}, 'BSE': {128083204},
+                                                          '*': {109127943}}
+    assert incremental[Xref.TRACK_INSTR_XREF_BY_CATEGORY][408065] == {'h': {2}}
+
+    state.set_positions(dict(state.get(Xref.POSITIONS)))
+    state.set_holdings(dict(state.get(Xref.HOLDINGS)))
+    state.set_track_list(exchanges)
+    assert tracked(state) == incremental
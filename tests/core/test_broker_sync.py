@@ -0,0 +1,141 @@
+import asyncio
+import time
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from src.app_state_manager import AppState, Xref
+from src.core import broker_sync as broker_sync_module
+from src.core.broker_sync import BrokerSync, POSITION_KEY_COLUMNS, SyncFeed
+from src.services.service_orders import service_orders
+from src.services.service_positions import service_positions
+
+INSTRUMENTS = {'INFY:NSE': {'instrument_token': 408065}, 'TCS:NSE': {'instrument_token': 2953217},
+               'SBIN:NSE': {'instrument_token': 779521}}
+
+
+class FakePositions:
+    model = service_positions.model
+    table_name = 'positions'
+
+    def __init__(self):
+        self.upserts, self.deleted, self.inserted = [], [], []
+
+    def upsert_later(self, record, key_cols=None):
+        self.upserts.append((record, key_cols))
+
+    async def delete_by_ids(self, record_ids):
+        self.deleted.extend(record_ids)
+
+    async def insert_record(self, record):
+        self.inserted.append(record)
+        return 100 + len(self.inserted)
+
+
+def position(symbol, quantity, pnl):
+    return {'type': 'net', 'account': 'A1', 'tradingsymbol': symbol, 'exchange': 'NSE', 'product': 'CNC',
+            'symbol_exchange': f'{symbol}:NSE', 'quantity': quantity, 'pnl': pnl, 'not_a_column': 1}
+
+
+@pytest.fixture
+def state(monkeypatch):
+    state = object.__new__(AppState)
+    state._singleton_initialized = False
+    state.__init__()
+    state.set_instruments(INSTRUMENTS)
+    monkeypatch.setattr(broker_sync_module, 'app_state', state)
+    return state
+
+
+@pytest.fixture
+def sync():
+    sync = object.__new__(BrokerSync)  # A private instance, not the shared singleton
+    sync._singleton_initialized = False
+    sync.__init__()
+    return sync
+
+
+def test_only_position_differences_are_applied(state):
+    service = FakePositions()
+    stored = {1: {**position('INFY', 5, Decimal('10.5000')), 'id': 1},
+              2: {**position('TCS', 3, Decimal('0.0000')), 'id': 2}}
+    del stored[1]['not_a_column'], stored[2]['not_a_column']
+    state.set_positions(stored)
+    state.set_track_list(('NSE',))
+    changes = []
+    state.subscribe(Xref.POSITIONS, changes.append)
+
+    fresh = [position('INFY', 5, 12.25), position('SBIN', 1, 0.0)]  # INFY moved, TCS closed, SBIN opened
+    applied = asyncio.run(BrokerSync._apply_records('p', service, fresh, POSITION_KEY_COLUMNS))
+
+    assert applied == 3
+    [(record, key_cols)] = service.upserts
+    assert (record['id'], record['pnl'], key_cols) == (1, 12.25, ['id'])
+    assert 'not_a_column' not in record
+    assert service.deleted == [2]
+    assert [record['tradingsymbol'] for record in service.inserted] == ['SBIN']
+    assert set(state.get(Xref.POSITIONS)) == {1, 101}
+    assert set(state.get(Xref.TRACK_INSTR_XREF_BY_CATEGORY)) == {408065, 779521}
+    assert len(changes) == 1  # One notification for the whole poll
+
+    # Floats from Kite equal to the stored Decimals are not a change
+    assert asyncio.run(BrokerSync._apply_records('p', service, fresh, POSITION_KEY_COLUMNS)) == 0
+
+
+def order(order_id, parent_order_id=None, status='OPEN', exchange_update_timestamp='2025-04-01 09:15:02'):
+    return {'order_id': order_id, 'parent_order_id': parent_order_id, 'status': status, 'quantity': 10,
+            'price': 100.0, 'trigger_price': 0.0, 'average_price': 0.0, 'filled_quantity': 0, 'pending_quantity': 10,
+            'cancelled_quantity': 0, 'exchange_update_timestamp': exchange_update_timestamp}
+
+
+def test_orders_are_diffed_against_the_table_and_written_parents_first(sync, monkeypatch):
+    stored = [('P0', 'OPEN', 10, Decimal('100.0000'), Decimal('0.0000'), Decimal('0.0000'), 0, 10, 0,
+               datetime(2025, 4, 1, 9, 15, 2))]
+    batches = []
+
+    async def get_existing_records(unique_fields):
+        return stored
+
+    async def bulk_insert_orders(records_df):
+        batches.append(dict(zip(records_df['order_id'], records_df['parent_order_id'])))
+
+    monkeypatch.setattr(service_orders, 'get_existing_records', get_existing_records)
+    monkeypatch.setattr(service_orders, 'bulk_insert_orders', bulk_insert_orders)
+
+    orders = [order('P0'), order('C2', 'C1'), order('C1', 'P0'), order('X', 'GONE')]
+    assert asyncio.run(sync.apply_orders(orders)) == 3
+
+    # P0 is unchanged since it was stored; C1 needs P0, C2 needs C1, X's parent was never synced
+    assert batches == [{'C1': 'P0', 'X': None}, {'C2': 'C1'}]
+    assert asyncio.run(sync.apply_orders(orders)) == 0
+
+    orders[0] = order('P0', status='COMPLETE')
+    assert asyncio.run(sync.apply_orders(orders)) == 1
+    assert list(batches[-1]) == ['P0']
+
+
+def test_polls_of_one_feed_do_not_overlap(sync):
+    active, peak = 0, 0
+
+    def fetch():
+        time.sleep(0.01)  # Blocking Kite call
+        return []
+
+    async def apply(response):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return 0
+
+    sync.limiter.min_interval = 0  # Only the feed lock keeps the polls apart
+
+    async def run():
+        feed = sync.feeds['holdings'] = SyncFeed('holdings', fetch, apply, base_interval=1.0, interval=1.0)
+        await asyncio.gather(sync.poll(feed), sync.sync_now('holdings'), sync.poll(feed))  # Loop and scheduled job
+        return feed
+
+    feed = asyncio.run(run())
+    assert (peak, feed.polls, feed.failures) == (1, 3, 0)
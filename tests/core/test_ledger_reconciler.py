@@ -0,0 +1,72 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from src.core.ledger_reconciler import daily_cash_flow, reconcile_balances
+from src.helpers.date_time_utils import INDIAN_TIMEZONE
+
+
+def posted(day, hour=10):
+    return datetime(2025, 4, day, hour, tzinfo=INDIAN_TIMEZONE)
+
+
+def ledger(rows):
+    return pd.DataFrame(rows, columns=['id', 'account', 'posting_date', 'particulars', 'debit', 'credit',
+                                       'net_balance'])
+
+
+def test_continuous_balances_have_no_gaps():
+    reconciled = reconcile_balances(ledger([
+        (1, 'A1', posted(1), 'Funds added', 0, 1000, 1000),
+        (2, 'A1', posted(1), 'Charges', 20, 0, 980),
+        (3, 'A1', posted(2), 'Payout', 500, 0, 480),
+    ]))
+
+    assert not reconciled['balance_gap'].any()
+    assert (reconciled['gap_amount'] == 0).all()
+
+
+def test_missing_entry_is_flagged_with_its_amount():
+    reconciled = reconcile_balances(ledger([
+        (1, 'A1', posted(1), 'Funds added', 0, 1000, 1000),
+        (2, 'A1', posted(2), 'Charges', 20, 0, 930),  # 50 debited by an entry that is not in the report
+        (3, 'A1', posted(3), 'Funds added', 0, 70, 1000),
+    ]))
+
+    assert reconciled['balance_gap'].tolist() == [False, True, False]
+    assert reconciled.loc[1, 'gap_amount'] == pytest.approx(-50.0)
+
+
+def test_accounts_are_reconciled_separately_and_in_posting_order():
+    reconciled = reconcile_balances(ledger([
+        (3, 'A2', posted(1), 'Funds added', 0, 200, 200),
+        (2, 'A1', posted(2), 'Charges', '10', None, 90),  # Amounts arrive as text or missing
+        (1, 'A1', posted(1), 'Funds added', 0, 100, 100),
+        (4, 'A1', None, 'Opening balance', 0, 0, 0),  # Summary rows have no posting date
+    ]), tolerance=0.01)
+
+    assert reconciled[['account', 'id']].values.tolist() == [['A1', 1], ['A1', 2], ['A2', 3]]
+    assert not reconciled['balance_gap'].any()
+
+
+def test_tolerance_absorbs_rounding():
+    reconciled = reconcile_balances(ledger([
+        (1, 'A1', posted(1), 'Funds added', 0, 100, 100),
+        (2, 'A1', posted(1), 'Charges', 0.333, 0, 99.667 - 0.004),
+    ]), tolerance=0.01)
+
+    assert not reconciled['balance_gap'].any()
+
+
+def test_daily_cash_flow():
+    daily = daily_cash_flow(reconcile_balances(ledger([
+        (1, 'A1', posted(1), 'Funds added', 0, 1000, 1000),
+        (2, 'A1', posted(1, 15), 'Charges', 20, 0, 980),
+        (3, 'A1', posted(2), 'Payout', 500, 0, 400),  # Gap of 80
+    ])))
+
+    assert daily[['credit', 'debit', 'net_flow', 'closing_balance', 'entries', 'balance_gaps']].values.tolist() == [
+        [1000, 20, 980, 980, 2, 0],
+        [0, 500, -500, 400, 1, 1],
+    ]
@@ -0,0 +1,58 @@
+import pytest
+
+from src.core.lot_matcher import LONG, SHORT, OpenLot, match_fifo
+
+
+def trade(row_id, trade_type, quantity, price):
+    return {'id': row_id, 'trade_id': 1000 + row_id, 'trade_type': trade_type, 'quantity': quantity,
+            'price': price, 'order_execution_time': f't{row_id}'}
+
+
+def test_sell_closes_oldest_buys_first():
+    closed, open_lots = match_fifo([
+        trade(1, 'buy', 10, 100.0),
+        trade(2, 'buy', 10, 110.0),
+        trade(3, 'sell', 15, 120.0),
+    ])
+
+    assert [(lot.open_row_id, lot.quantity, lot.close_row_id) for lot in closed] == [(1, 10, 3), (2, 5, 3)]
+    assert [lot.realized_pnl for lot in closed] == [pytest.approx(200.0), pytest.approx(50.0)]
+    assert [(lot.side, lot.row_id, lot.quantity, lot.price) for lot in open_lots] == [(LONG, 2, 5, 110.0)]
+
+
+def test_oversized_close_flips_to_short():
+    closed, open_lots = match_fifo([trade(1, 'buy', 5, 100.0), trade(2, 'sell', 8, 90.0)])
+
+    assert [(lot.quantity, lot.realized_pnl) for lot in closed] == [(5, pytest.approx(-50.0))]
+    assert [(lot.side, lot.quantity, lot.row_id) for lot in open_lots] == [(SHORT, 3, 2)]
+
+
+def test_short_lot_pnl_is_inverted():
+    closed, open_lots = match_fifo([trade(1, 'sell', 4, 50.0), trade(2, 'buy', 4, 45.0)])
+
+    assert closed[0].side == SHORT
+    assert closed[0].realized_pnl == pytest.approx(20.0)
+    assert open_lots == []
+
+
+def test_continues_from_existing_open_lots():
+    existing = [OpenLot(LONG, 3, 100.0, 900, 't0', 9), OpenLot(LONG, 2, 105.0, 901, 't0', 10)]
+    closed, open_lots = match_fifo([trade(11, 'sell', 4, 110.0)], existing)
+
+    assert [(lot.open_row_id, lot.quantity) for lot in closed] == [(9, 3), (10, 1)]
+    assert [(lot.row_id, lot.quantity) for lot in open_lots] == [(10, 1)]
+
+
+def test_queue_is_reused_after_it_empties():
+    closed, open_lots = match_fifo([
+        trade(1, 'buy', 2, 10.0), trade(2, 'sell', 2, 12.0),
+        trade(3, 'buy', 1, 11.0), trade(4, 'buy', 1, 13.0),
+    ])
+
+    assert len(closed) == 1
+    assert [(lot.row_id, lot.price) for lot in open_lots] == [(3, 11.0), (4, 13.0)]
+
+
+def test_no_trades_keeps_open_lots():
+    existing = [OpenLot(SHORT, 7, 20.0, 1, 't', 1)]
+    assert match_fifo([], existing) == ([], existing)
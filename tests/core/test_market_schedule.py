@@ -0,0 +1,80 @@
+from datetime import date, datetime, time
+
+from src.core.market_schedule import DaySchedule, MarketCalendar, parse_schedule_time, resolve_day_records
+from src.helpers.date_time_utils import INDIAN_TIMEZONE
+
+MONDAY = date(2025, 4, 7)
+TUESDAY = date(2025, 4, 8)
+SATURDAY = date(2025, 4, 12)
+
+
+def record(market_day, start_time, end_time, exchange='*', schedule='MARKET', is_market_open=True):
+    return {'market_day': market_day, 'exchange': exchange, 'schedule': schedule,
+            'start_time': start_time, 'end_time': end_time, 'is_market_open': is_market_open}
+
+
+RECORDS = [
+    record('*', '09:15', '15:30'),
+    record('Saturday', '*', '*', is_market_open=False),
+    record('Sunday', '*', '*', is_market_open=False),
+    record('*', '09:00', '23:30', exchange='MCX'),
+    record('2025-04-08', '*', '*', is_market_open=False),  # Holiday
+    record('2025-04-08', '17:00', '23:30', exchange='MCX'),  # Evening session only
+]
+
+
+def at(day, hour, minute=0):
+    return datetime.combine(day, time(hour, minute), tzinfo=INDIAN_TIMEZONE)
+
+
+def test_parse_schedule_time():
+    assert parse_schedule_time('09:15') == time(9, 15)
+    assert parse_schedule_time('*') is None
+    assert parse_schedule_time('9h15') is None
+
+
+def test_resolve_day_records_prefers_exact_date_then_weekday():
+    resolved = resolve_day_records(RECORDS, TUESDAY)
+    assert {(r['exchange'], r['market_day']) for r in resolved} == {('*', '2025-04-08'), ('MCX', '2025-04-08')}
+
+    resolved = resolve_day_records(RECORDS, SATURDAY)
+    assert {(r['exchange'], r['market_day']) for r in resolved} == {('*', 'Saturday'), ('MCX', '*')}
+
+
+def test_day_schedule_falls_back_to_wildcard_exchange():
+    schedule = DaySchedule(MONDAY, RECORDS)
+    assert schedule.is_open('NSE', time(10, 0))
+    assert not schedule.is_open('NSE', time(15, 30))  # Same half-open windows as MarketCalendar
+    assert schedule.get_windows('NSE') == ((time(9, 15), time(15, 30)),)
+    assert not schedule.is_open('NSE', time(16, 0))
+    assert schedule.is_open('MCX', time(22, 0))
+    assert schedule.get_exchanges() == ['*', 'MCX']
+
+
+def test_calendar_weekday_and_holiday():
+    calendar = MarketCalendar(RECORDS)
+    assert calendar.is_open('NSE', at=at(MONDAY, 9, 15))
+    assert not calendar.is_open('NSE', at=at(MONDAY, 15, 30))  # Windows are half-open
+    assert not calendar.is_open('NSE', at=at(SATURDAY, 10))
+    assert not calendar.is_open('NSE', at=at(TUESDAY, 10))
+    assert not calendar.is_open('MCX', at=at(TUESDAY, 10))
+    assert calendar.is_open('MCX', at=at(TUESDAY, 18))
+
+
+def test_calendar_next_transition():
+    calendar = MarketCalendar(RECORDS)
+    assert calendar.next_transition('NSE', at=at(MONDAY, 8)) == (at(MONDAY, 9, 15), True)
+    assert calendar.next_transition('NSE', at=at(MONDAY, 10)) == (at(MONDAY, 15, 30), False)
+    # After Monday's close the Tuesday holiday is skipped
+    assert calendar.next_transition('NSE', at=at(MONDAY, 16)) == (at(date(2025, 4, 9), 9, 15), True)
+    assert calendar.next_open('NSE', at=at(MONDAY, 10)) == at(date(2025, 4, 9), 9, 15)
+
+
+def test_calendar_merges_overlapping_windows():
+    calendar = MarketCalendar([record('*', '09:00', '12:00'), record('*', '11:00', '13:00')])
+    assert calendar.get_bounds('*', 'MARKET', MONDAY) == (time(9), time(13))
+
+
+def test_calendar_without_openings_has_no_transition():
+    calendar = MarketCalendar([record('*', '*', '*', is_market_open=False)])
+    assert calendar.next_transition('NSE', at=at(MONDAY, 10)) is None
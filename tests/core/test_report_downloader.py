@@ -0,0 +1,64 @@
+import os
+from datetime import date
+
+import pytest
+
+from src.core import report_downloader as report_downloader_module
+from src.core.report_downloader import ReportDownloader
+from src.settings.parameter_manager import parms
+
+
+@pytest.fixture
+def run_settings(tmp_path, monkeypatch):
+    monkeypatch.setattr(parms, 'REPORT_DOWNLOAD_DIR', str(tmp_path))
+    monkeypatch.setattr(parms, 'DELETE_REPORTS_BEFORE_REFRESH', False)
+    monkeypatch.setattr(parms, 'REPORT_START_DATE', '2024-04-01')
+    monkeypatch.setattr(parms, 'REPORT_DOWNLOAD_WORKERS', 2)
+    monkeypatch.setattr(report_downloader_module, 'ACCOUNT_CREDENTIALS', {'A1': {}, 'A2': {}, 'A3': {}})
+    return tmp_path
+
+
+def test_every_account_downloads_into_its_own_directory_from_its_watermarks(run_settings, monkeypatch):
+    def run(self):
+        if self.account == 'A3':
+            raise RuntimeError('login failed')
+        return self.download_path, self.report_start_dates
+
+    monkeypatch.setattr(ReportDownloader, 'run', run)
+
+    downloads = ReportDownloader.login_download_reports({('A2', 'LEDGER'): date(2024, 5, 10)})
+
+    assert set(downloads) == {'A1', 'A2'}  # A failed account does not stop the others
+    assert downloads['A1'][0] == os.path.join(str(run_settings), 'A1')
+    assert downloads['A2'][0] == os.path.join(str(run_settings), 'A2')
+    assert downloads['A1'][1] == {'TRADEBOOK': date(2024, 4, 1), 'PNL': date(2024, 4, 1), 'LEDGER': date(2024, 4, 1)}
+    assert downloads['A2'][1] == {'TRADEBOOK': date(2024, 4, 1), 'PNL': date(2024, 4, 1), 'LEDGER': date(2024, 5, 10)}
+
+
+@pytest.mark.parametrize('files, path, complete', [
+    ({'tradebook.csv': b'a,b\n'}, 'tradebook.csv', True),
+    ({'tradebook.csv': b''}, 'tradebook.csv', False),  # Created, nothing written yet
+    ({'tradebook.csv': b'a,b\n', 'tradebook.csv.part': b'a'}, 'tradebook.csv', False),
+    ({'tradebook.csv.crdownload': b'a'}, 'tradebook.csv.crdownload', False),
+    ({}, 'tradebook.csv', False),  # Renamed away again
+])
+def test_download_is_complete_once_no_partial_file_is_left(tmp_path, files, path, complete):
+    for file_name, content in files.items():
+        (tmp_path / file_name).write_bytes(content)
+
+    assert ReportDownloader.is_download_complete(str(tmp_path / path)) is complete
+
+
+def test_wait_for_download_returns_the_file_renamed_from_its_partial(tmp_path):
+    downloader = ReportDownloader('A1', {}, {}, date(2024, 4, 30), {}, str(tmp_path))
+    os.makedirs(downloader.download_path)
+    downloader.start_download_watch()
+    try:
+        partial = os.path.join(downloader.download_path, 'tradebook-A1-EQ.csv.part')
+        with open(partial, 'wb') as f:
+            f.write(b'symbol\nINFY\n')
+        os.replace(partial, partial[:-len('.part')])
+
+        assert downloader.wait_for_download(timeout=5) == 'tradebook-A1-EQ.csv'
+    finally:
+        downloader.stop_download_watch()
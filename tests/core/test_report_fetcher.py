@@ -0,0 +1,164 @@
+import asyncio
+import os
+import re
+import threading
+from datetime import date
+
+import httpx
+import pytest
+
+from src.core.report_fetcher import ReportFetcher, ReportFetchError
+from src.core.report_fixture_server import create_fixture_server
+from src.settings import constants_manager as const
+from src.settings.parameter_manager import parms
+
+TRADEBOOK_CSV = b"symbol,isin,trade_date,exchange,segment,trade_type,quantity,price,trade_id\n" \
+                b"INFY,INE009A01021,2024-04-02,NSE,EQ,buy,10,1500.0,1001\n"
+LEDGER_CSV = b"particulars,posting_date,debit,credit,net_balance\nFunds added,2024-04-02,0,1000,1000\n"
+
+
+@pytest.fixture(autouse=True)
+def fast_parms(monkeypatch):
+    monkeypatch.setattr(parms, 'REPORT_FETCH_CONCURRENCY', 2)
+    monkeypatch.setattr(parms, 'REPORT_FETCH_MIN_INTERVAL', 0)
+    monkeypatch.setattr(parms, 'MAX_RETRIES', 3)
+    monkeypatch.setattr(parms, 'RETRY_DELAY', 0)
+
+
+@pytest.fixture
+def fixture_server(tmp_path):
+    fixture_dir = tmp_path / 'fixtures'
+    fixture_dir.mkdir()
+    (fixture_dir / 'tradebook-EQ.csv').write_bytes(TRADEBOOK_CSV)
+    (fixture_dir / 'tradebook-FO.csv').write_bytes(TRADEBOOK_CSV)
+    (fixture_dir / 'ledger-EQ.csv').write_bytes(LEDGER_CSV)
+
+    server = create_fixture_server(port=0, fixture_dir=str(fixture_dir))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def make_fetcher(download_path, start_date, end_date, refresh=('TRADEBOOK', 'LEDGER'), base_url=None):
+    return ReportFetcher('ZG0790', [{'name': 'session', 'value': 'abc'}], dict.fromkeys(const.REPORT, start_date),
+                         end_date, {name: name in refresh for name in const.REPORT}, str(download_path), base_url)
+
+
+def test_chunks_split_every_report_into_364_day_ranges_per_segment(tmp_path):
+    fetcher = make_fetcher(tmp_path, date(2023, 1, 1), date(2024, 6, 30), refresh=('TRADEBOOK',))
+
+    chunks = [(name, segment, start, end) for name, _, segment, start, end in fetcher.get_chunks()]
+
+    assert chunks == [
+        ('TRADEBOOK', 'Equity', date(2023, 1, 1), date(2023, 12, 31)),
+        ('TRADEBOOK', 'Futures & Options', date(2023, 1, 1), date(2023, 12, 31)),
+        ('TRADEBOOK', 'Equity', date(2024, 1, 1), date(2024, 6, 30)),
+        ('TRADEBOOK', 'Futures & Options', date(2024, 1, 1), date(2024, 6, 30)),
+    ]
+
+
+@pytest.mark.parametrize('name', list(const.REPORT))
+def test_file_names_carry_the_range_and_match_the_upload_pattern(tmp_path, name):
+    item = const.REPORT[name]
+    fetcher = make_fetcher(tmp_path, date(2024, 1, 1), date(2024, 6, 30))
+    names = {fetcher.get_file_name(item, segment, start, end)
+             for segment in item['segment']['values']
+             for start, end in [(date(2023, 1, 1), date(2023, 12, 31)), (date(2023, 6, 1), date(2024, 5, 30))]}
+
+    assert len(names) == 2 * len(item['segment']['values'])  # Overlapping reruns never share a file
+    for file_name in names:
+        match = re.match(item['file_regex'], file_name)
+        assert match and match.group(2) == 'ZG0790' and match.groups()[-1] == item['api']['ext']
+
+
+def test_fetch_reports_writes_every_chunk_from_the_fixture_server(tmp_path, fixture_server):
+    download_path = tmp_path / 'ZG0790'
+    fetcher = make_fetcher(download_path, date(2024, 4, 1), date(2024, 4, 30), base_url=fixture_server)
+
+    fetched = asyncio.run(fetcher.fetch_reports())
+
+    assert fetched == {
+        'TRADEBOOK': {'Equity': ['tradebook-ZG0790-EQ(20240401-20240430).csv'],
+                      'Futures & Options': ['tradebook-ZG0790-FO(20240401-20240430).csv']},
+        'LEDGER': {'Equity': ['ledger-ZG0790(20240401-20240430).csv']},
+    }
+    assert sorted(os.listdir(download_path)) == sorted(
+        file_name for segments in fetched.values() for files in segments.values() for file_name in files)
+    assert (download_path / 'ledger-ZG0790(20240401-20240430).csv').read_bytes() == LEDGER_CSV
+
+
+def test_fetch_reports_fails_when_a_fixture_is_missing(tmp_path, fixture_server):
+    download_path = tmp_path / 'ZG0790'
+    fetcher = make_fetcher(download_path, date(2024, 4, 1), date(2024, 4, 30), refresh=('PNL',),
+                           base_url=fixture_server)
+
+    with pytest.raises(ReportFetchError, match='2 of 2 report requests failed'):
+        asyncio.run(fetcher.fetch_reports())
+    assert os.listdir(download_path) == []
+
+
+def fetch_with(tmp_path, responses, name='LEDGER'):
+    """Run one chunk against a transport answering with the given responses in turn."""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return responses[min(len(requests), len(responses)) - 1]
+
+    async def run():
+        fetcher = make_fetcher(tmp_path, date(2024, 4, 1), date(2024, 4, 30))
+        async with httpx.AsyncClient(base_url='http://console', transport=httpx.MockTransport(handler)) as client:
+            return await fetcher.fetch_chunk(client, name, const.REPORT[name], 'Equity',
+                                             date(2024, 4, 1), date(2024, 4, 30))
+
+    return asyncio.run(run()), requests
+
+
+@pytest.mark.parametrize('status_code', [429, 500, 503])
+def test_fetch_chunk_retries_throttled_and_server_errors(tmp_path, status_code):
+    (segment, file_name), requests = fetch_with(tmp_path, [
+        httpx.Response(status_code), httpx.Response(200, content=LEDGER_CSV, headers={'content-type': 'text/csv'})])
+
+    assert len(requests) == 2
+    assert requests[0].url.params['from_date'] == '2024-04-01' and requests[0].url.params['segment'] == 'EQ'
+    assert (segment, file_name) == ('Equity', 'ledger-ZG0790(20240401-20240430).csv')
+
+
+def test_fetch_chunk_gives_up_after_max_retries(tmp_path):
+    with pytest.raises(ReportFetchError, match='returned 503'):
+        fetch_with(tmp_path, [httpx.Response(503)])
+    assert os.listdir(tmp_path) == []
+
+
+def test_fetch_chunk_does_not_retry_client_errors_or_accept_login_pages(tmp_path):
+    with pytest.raises(ReportFetchError, match='returned 403'):
+        fetch_with(tmp_path, [httpx.Response(403)])
+    with pytest.raises(ReportFetchError, match='returned 200'):
+        fetch_with(tmp_path, [httpx.Response(200, content=b'<html>', headers={'content-type': 'text/html'})])
+
+
+def test_fetch_chunk_skips_empty_reports(tmp_path):
+    (segment, file_name), _ = fetch_with(tmp_path, [httpx.Response(200, content=b'')])
+
+    assert (segment, file_name) == ('Equity', None)
+    assert os.listdir(tmp_path) == []
+
+
+def test_fetch_chunk_writes_atomically(tmp_path, monkeypatch):
+    target = tmp_path / 'ledger-ZG0790(20240401-20240430).csv'
+    target.write_bytes(b'previous run')
+    replaced = []
+    real_replace = os.replace
+
+    def replace(src, dst):
+        replaced.append((open(src, 'rb').read(), open(dst, 'rb').read()))  # Target untouched until the swap
+        real_replace(src, dst)
+
+    monkeypatch.setattr(os, 'replace', replace)
+    fetch_with(tmp_path, [httpx.Response(200, content=LEDGER_CSV)])
+
+    assert replaced == [(LEDGER_CSV, b'previous run')]
+    assert os.listdir(tmp_path) == [target.name]
+    assert target.read_bytes() == LEDGER_CSV
@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import pandas as pd
+
+from src.core.report_parser import pandas_column_names, parse_report_file, read_csv
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+
+def test_column_names_follow_pandas():
+    assert pandas_column_names(['', 'Symbol', '', 'Symbol', 'Symbol']) == [
+        'Unnamed: 0', 'Symbol', 'Unnamed: 2', 'Symbol.1', 'Symbol.2']
+
+
+def test_read_csv_matches_pandas_for_a_ledger():
+    path = FIXTURES / 'ledger-ZG0790.csv'
+    data_df, expected = read_csv(path), pd.read_csv(path)
+
+    assert list(data_df.columns) == list(expected.columns)
+    assert data_df.isna().equals(expected.isna())  # Empty cells are nulls, not ''
+    assert data_df['posting_date'].tolist()[1:3] == ['2025-04-01', '2025-04-02']  # Dates stay text
+    assert data_df['debit'].equals(expected['debit'])
+
+
+def test_pnl_report_is_parsed_below_its_summary():
+    data_df, problem = parse_report_file('pnl', 'pnl-ZG0790.csv', FIXTURES / 'pnl-ZG0790.csv', 'csv', 'ZG0790')
+
+    assert problem is None
+    assert data_df['Symbol'].tolist() == ['INFY', 'TCS']
+    assert data_df['Realized P&L'].tolist() == ['1250.5', '0']
+    assert data_df['Previous Closing Price'].isna().tolist() == [True, False]
+    assert (data_df['account'] == 'ZG0790').all()
+
+
+def test_empty_and_unparsable_files(tmp_path):
+    empty = tmp_path / 'pnl-ZG0790.csv'
+    empty.write_text('particulars,posting_date\n')
+    data_df, problem = parse_report_file('ledger', empty.name, empty, 'csv', 'ZG0790')
+    assert problem is None and data_df.empty
+
+    headerless = tmp_path / 'pnl-ZG0790(1).csv'
+    headerless.write_text('a,b\n1,2\n')
+    data_df, problem = parse_report_file('pnl', headerless.name, headerless, 'csv', 'ZG0790')
+    assert data_df is None and 'Header row missing' in problem
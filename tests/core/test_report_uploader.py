@@ -0,0 +1,68 @@
+import asyncio
+import re
+
+import pandas as pd
+import pytest
+
+from src.core import report_uploader as report_uploader_module
+from src.core.report_uploader import ReportUploader
+
+PATTERN = re.compile(r"(pnl)-(.+?)(?:[(]\d+[)])?[.](csv|xlsx)")
+
+
+class FakeService:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.inserted = []
+
+    async def validate_insert_records(self, records):
+        if self.fail:
+            raise RuntimeError('insert failed')
+        self.inserted.append(records)
+
+
+@pytest.fixture
+def logged(monkeypatch):
+    logged = []
+
+    async def log_files(entries):
+        logged.extend(entries)
+
+    async def read_report(key, file_name, file_path, match):
+        return FRAMES[file_name]
+
+    monkeypatch.setattr(report_uploader_module.service_report_file_log, 'log_files', log_files)
+    monkeypatch.setattr(ReportUploader, 'read_report', staticmethod(read_report))
+    return logged
+
+
+FRAMES = {
+    'pnl-A1.csv': pd.DataFrame({'Symbol': ['INFY'], 'Quantity': ['10'], 'account': ['A1']}),
+    'pnl-A1(1).csv': pd.DataFrame(columns=['Symbol', 'account']),  # Report without data
+    'pnl-A2.csv': None,  # Could not be parsed
+}
+
+
+def chunk(*file_names):
+    return [(file_name, f'/reports/{file_name}', PATTERN.match(file_name), f'hash-{file_name}')
+            for file_name in file_names]
+
+
+def test_only_parsed_files_are_logged(logged):
+    service = FakeService()
+    files = chunk('pnl-A1.csv', 'pnl-A1(1).csv', 'pnl-A2.csv')
+    failed = asyncio.run(ReportUploader.upload_chunk('pnl', service, files))
+
+    assert failed == {('A2', 'PNL')}
+    [records] = service.inserted
+    assert records.columns.tolist() == ['symbol', 'quantity', 'account']
+    assert [(entry['file_name'], entry['row_count']) for entry in logged] == [
+        ('pnl-A1.csv', 1), ('pnl-A1(1).csv', 0)]
+
+
+def test_nothing_is_logged_when_the_insert_fails(logged):
+    files = chunk('pnl-A1.csv', 'pnl-A2.csv')
+    failed = asyncio.run(ReportUploader.upload_chunk('pnl', FakeService(fail=True), files))
+
+    assert failed == {('A1', 'PNL'), ('A2', 'PNL')}
+    assert logged == []
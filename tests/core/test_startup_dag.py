@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from src.core.startup_dag import StartupDag, Step
+
+
+def recorder(log, name, error=None):
+    async def action():
+        log.append(name)
+        if error:
+            raise error
+    return action
+
+
+def test_steps_run_after_their_dependencies():
+    log = []
+    dag = StartupDag('test', [
+        Step('report', recorder(log, 'report'), depends_on=('positions', 'holdings')),
+        Step('positions', recorder(log, 'positions'), depends_on=('instruments',)),
+        Step('holdings', recorder(log, 'holdings'), depends_on=('instruments',)),
+        Step('instruments', recorder(log, 'instruments')),
+    ])
+    asyncio.run(dag.run())
+
+    assert log[0] == 'instruments'
+    assert log[-1] == 'report'
+    assert set(dag.results.values()) == {'completed'}
+
+
+def test_unknown_dependencies_and_cycles_are_rejected():
+    with pytest.raises(ValueError, match='unknown'):
+        StartupDag('test', [Step('a', recorder([], 'a'), depends_on=('b',))])
+    with pytest.raises(ValueError, match='cycle'):
+        StartupDag('test', [Step('a', recorder([], 'a'), depends_on=('b',)),
+                            Step('b', recorder([], 'b'), depends_on=('a',))])
+    with pytest.raises(ValueError, match='Duplicate'):
+        StartupDag('test', [Step('a', recorder([], 'a')), Step('a', recorder([], 'a'))])
+
+
+def test_failure_blocks_dependents_but_not_independent_steps():
+    log = []
+    dag = StartupDag('test', [
+        Step('login', recorder(log, 'login', RuntimeError('no token'))),
+        Step('positions', recorder(log, 'positions'), depends_on=('login',)),
+        Step('report', recorder(log, 'report'), depends_on=('positions',)),
+        Step('parameters', recorder(log, 'parameters')),
+    ])
+    with pytest.raises(RuntimeError, match='no token'):
+        asyncio.run(dag.run())
+
+    assert sorted(log) == ['login', 'parameters']
+    assert dag.results == {'login': 'failed', 'positions': 'blocked', 'report': 'blocked',
+                           'parameters': 'completed'}
+
+
+def test_disabled_steps_do_not_hold_up_dependents():
+    log = []
+    dag = StartupDag('test', [
+        Step('backfill', recorder(log, 'backfill'), enabled=lambda: False),
+        Step('report', recorder(log, 'report'), depends_on=('backfill',)),
+    ])
+    asyncio.run(dag.run())
+
+    assert log == ['report']
+    assert dag.results == {'backfill': 'skipped', 'report': 'completed'}
+
+
+def test_unchanged_fingerprints_skip_steps(tmp_path):
+    log = []
+    inputs = {'seed': 'v1', 'empty': 'v1'}
+
+    async def async_fingerprint():
+        return inputs['empty']
+
+    def steps():
+        return [Step('seed', recorder(log, 'seed'), fingerprint=lambda: inputs['seed']),
+                Step('empty', recorder(log, 'empty'), fingerprint=async_fingerprint),
+                Step('forced', recorder(log, 'forced'), fingerprint=lambda: None)]
+
+    state_file = tmp_path / 'startup_state.json'
+    asyncio.run(StartupDag('test', steps(), state_file=str(state_file)).run())
+    assert sorted(log) == ['empty', 'forced', 'seed']
+
+    log.clear()
+    inputs['empty'] = None  # e.g. the table is empty again
+    dag = StartupDag('test', steps(), state_file=str(state_file))
+    asyncio.run(dag.run())
+    assert sorted(log) == ['empty', 'forced']
+    assert dag.results['seed'] == 'unchanged'
+
+    log.clear()
+    inputs['seed'] = 'v2'
+    asyncio.run(StartupDag('test', steps(), state_file=str(state_file)).run(skip_unchanged=False))
+    assert sorted(log) == ['empty', 'forced', 'seed']
+
+
+@pytest.mark.parametrize('check', ['fingerprint', 'enabled'])
+def test_failing_checks_fail_the_step_and_block_dependents(check):
+    def broken():
+        raise ConnectionError('database unavailable')
+
+    log = []
+    dag = StartupDag('test', [
+        Step('seed', recorder(log, 'seed'), **{check: broken}),
+        Step('app_state', recorder(log, 'app_state'), depends_on=('seed',)),
+    ])
+    with pytest.raises(ConnectionError):
+        asyncio.run(dag.run())
+
+    assert log == []
+    assert dag.results == {'seed': 'failed', 'app_state': 'blocked'}
@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from src.core.write_behind import WriteBehindQueue
+from src.settings.parameter_manager import parms
+
+
+class FakeService:
+    table_name = 'positions'
+    conflict_cols = ('account', 'tradingsymbol')
+    _pk_names = ('id',)
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.calls = []
+
+    async def bulk_insert_records(self, **kwargs):
+        self.calls.append(kwargs)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError('database unavailable')
+
+
+@pytest.fixture
+def queue():
+    queue = WriteBehindQueue()
+    queue._singleton_initialized = False  # Fresh pending records and counters for every test
+    queue.__init__()
+    return queue
+
+
+def flush(queue):
+    return asyncio.run(queue.flush())
+
+
+def test_updates_to_one_key_are_coalesced(queue):
+    service = FakeService()
+    queue.put(service, {'account': 'A1', 'tradingsymbol': 'INFY', 'quantity': 1, 'pnl': 5})
+    queue.put(service, {'account': 'A1', 'tradingsymbol': 'INFY', 'quantity': 2})
+    queue.put(service, {'account': 'A1', 'tradingsymbol': 'TCS', 'quantity': 7, 'pnl': 0})
+
+    assert queue.metrics()['queue_depth'] == 2
+    assert queue.metrics()['coalesced'] == 1
+    assert flush(queue) == 2
+
+    [call] = service.calls
+    assert call['records'] == [{'account': 'A1', 'tradingsymbol': 'INFY', 'quantity': 2, 'pnl': 5},
+                               {'account': 'A1', 'tradingsymbol': 'TCS', 'quantity': 7, 'pnl': 0}]
+    assert call['index_elements'] == ['account', 'tradingsymbol']
+    assert sorted(call['update_columns']) == ['pnl', 'quantity']
+    assert call['raise_on_error']
+    assert queue.metrics()['queue_depth'] == 0
+
+
+def test_records_are_batched_by_key_and_column_set(queue):
+    service = FakeService()
+    queue.put(service, {'account': 'A1', 'tradingsymbol': 'INFY', 'quantity': 1})
+    queue.put(service, {'account': 'A1', 'tradingsymbol': 'TCS', 'pnl': 3})
+    queue.put(service, {'id': 9, 'quantity': 4}, key_cols=['id'])
+
+    assert flush(queue) == 3
+    assert sorted((call['index_elements'], call['update_columns']) for call in service.calls) == [
+        (['account', 'tradingsymbol'], ['pnl']), (['account', 'tradingsymbol'], ['quantity']), (['id'], ['quantity'])]
+
+
+def test_missing_key_column_is_rejected(queue):
+    with pytest.raises(ValueError):
+        queue.put(FakeService(), {'account': 'A1', 'quantity': 1})
+
+
+def test_failed_batch_is_retried_and_newer_values_win(queue):
+    service = FakeService(failures=1)
+    queue.put(service, {'account': 'A1', 'tradingsymbol': 'INFY', 'quantity': 1, 'pnl': 5})
+
+    assert flush(queue) == 0
+    assert queue.metrics()['failed_batches'] == 1
+    assert queue.metrics()['queue_depth'] == 1
+
+    queue.put(service, {'account': 'A1', 'tradingsymbol': 'INFY', 'quantity': 2})
+    assert queue.metrics()['queue_depth'] == 1
+    assert flush(queue) == 1
+    assert service.calls[-1]['records'] == [{'account': 'A1', 'tradingsymbol': 'INFY', 'quantity': 2, 'pnl': 5}]
+    assert queue.metrics()['flushed'] == 1
+
+
+def test_record_is_dropped_after_max_retries(queue):
+    service = FakeService(failures=parms.WRITE_BEHIND_MAX_RETRIES + 1)
+    queue.put(service, {'account': 'A1', 'tradingsymbol': 'INFY', 'quantity': 1})
+
+    for _ in range(parms.WRITE_BEHIND_MAX_RETRIES + 1):
+        assert flush(queue) == 0
+
+    assert queue.metrics()['dropped'] == 1
+    assert queue.metrics()['queue_depth'] == 0
+    assert flush(queue) == 0
+    assert len(service.calls) == parms.WRITE_BEHIND_MAX_RETRIES + 1
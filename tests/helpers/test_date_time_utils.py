@@ -0,0 +1,47 @@
+import logging
+from datetime import date, datetime, time
+
+import pandas as pd
+
+from src.helpers.date_time_utils import INDIAN_TIMEZONE, convert_columns_to_timezone, convert_series_to_timezone
+
+
+def test_dates_parse_with_the_given_format():
+    values = pd.Series(['2024-04-01', None, '2024-12-31'], name='trade_date')
+
+    assert convert_series_to_timezone(values).tolist() == [date(2024, 4, 1), None, date(2024, 12, 31)]
+
+
+def test_unparseable_values_become_none_with_one_warning(caplog):
+    values = pd.Series(['01-04-2024', '2024-04-02', 'n/a'], name='trade_date')
+
+    with caplog.at_level(logging.WARNING):
+        converted = convert_series_to_timezone(values)
+
+    assert converted.tolist() == [None, date(2024, 4, 2), None]
+    [record] = [record for record in caplog.records if record.levelno == logging.WARNING]
+    assert '2 invalid date values in trade_date' in record.getMessage()
+
+
+def test_naive_values_are_localized_and_aware_values_converted():
+    naive = pd.Series(['2024-04-01 09:15:00'])
+    aware = pd.Series(['2024-04-01T03:45:00+0000'])
+
+    localized = convert_series_to_timezone(naive, format='%Y-%m-%d %H:%M:%S', return_date=None)
+    converted = convert_series_to_timezone(aware, format='%Y-%m-%dT%H:%M:%S%z', return_date=None)
+
+    assert localized[0] == converted[0] == datetime(2024, 4, 1, 9, 15, tzinfo=INDIAN_TIMEZONE)
+    assert str(localized[0].tzinfo) == 'Asia/Kolkata'
+    assert convert_series_to_timezone(aware, format='%Y-%m-%dT%H:%M:%S%z', return_date=False)[0] == time(9, 15)
+
+
+def test_columns_missing_from_the_frame_are_skipped():
+    data = pd.DataFrame({'trade_date': ['2024-04-01'], 'order_execution_time': ['2024-04-01 09:15:00']})
+
+    convert_columns_to_timezone(data, [('trade_date', '%Y-%m-%d', True),
+                                       ('order_execution_time', '%Y-%m-%d %H:%M:%S', None),
+                                       ('expiry_date', '%Y-%m-%d', True)])
+
+    assert data['trade_date'][0] == date(2024, 4, 1)
+    assert data['order_execution_time'][0] == datetime(2024, 4, 1, 9, 15, tzinfo=INDIAN_TIMEZONE)
+    assert list(data.columns) == ['trade_date', 'order_execution_time']
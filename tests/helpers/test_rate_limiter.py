@@ -0,0 +1,56 @@
+import asyncio
+import time
+
+import pytest
+
+from src.helpers.rate_limiter import AsyncRateLimiter
+
+
+def test_limiter_caps_concurrent_calls():
+    async def run():
+        limiter = AsyncRateLimiter(2)
+        active = peak = 0
+
+        async def call():
+            nonlocal active, peak
+            async with limiter:
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(call() for _ in range(6)))
+        return peak
+
+    assert asyncio.run(run()) == 2
+
+
+def test_limiter_spaces_call_starts():
+    async def run():
+        limiter = AsyncRateLimiter(5, min_interval=0.05)
+        starts = []
+
+        async def call():
+            async with limiter:
+                starts.append(time.monotonic())
+
+        await asyncio.gather(*(call() for _ in range(4)))
+        return starts
+
+    starts = asyncio.run(run())
+    assert all(later - earlier >= 0.045 for earlier, later in zip(starts, starts[1:]))
+
+
+def test_limiter_releases_its_slot_when_cancelled_while_waiting():
+    async def run():
+        limiter = AsyncRateLimiter(1, min_interval=10)
+        async with limiter:
+            pass
+        waiting = asyncio.create_task(limiter.__aenter__())  # Sleeps out the interval holding the slot
+        await asyncio.sleep(0.01)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        return limiter.semaphore.locked()
+
+    assert asyncio.run(run()) is False
@@ -0,0 +1,28 @@
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from src.helpers.utils import row_key_hashes
+
+
+def test_equal_keys_hash_alike_whatever_the_amount_type():
+    df = pd.DataFrame({'symbol': ['INFY', 'INFY', 'INFY'], 'amount': [12.5, '12.50', Decimal('12.5000')]})
+    hashes = row_key_hashes(df, ['symbol', 'amount'], decimal_columns=['amount'])
+
+    assert hashes.dtype == np.int64
+    assert len(set(hashes.tolist())) == 1
+
+
+def test_missing_values_hash_as_empty_text():
+    df = pd.DataFrame({'symbol': ['INFY', 'INFY', 'INFY'], 'note': [None, np.nan, '']}, dtype=object)
+    assert len(set(row_key_hashes(df, ['symbol', 'note']).tolist())) == 1
+
+
+def test_key_columns_and_their_order_matter():
+    df = pd.DataFrame({'a': ['x', 'y'], 'b': ['y', 'x'], 'c': [1, 2]})
+    by_ab, by_ba = row_key_hashes(df, ['a', 'b']), row_key_hashes(df, ['b', 'a'])
+
+    assert by_ab[0] != by_ab[1]
+    assert by_ab[0] != by_ba[0]
+    assert (row_key_hashes(df, ['a', 'b']) == by_ab).all()  # Deterministic
@@ -0,0 +1,135 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from src.models import ReportTradeLots, ReportTradebook
+from src.services import service_report_trade_lots as trade_lots_module
+from src.services.service_report_trade_lots import ServiceReportTradeLots
+from src.settings.parameter_manager import parms
+
+
+class FakeStream:
+    def __init__(self, result):
+        self.result = result
+
+    async def mappings(self):
+        for row in self.result.mappings():
+            yield row
+
+
+class FakeSession:
+    """AsyncSession stand-in over a sync SQLite session."""
+
+    def __init__(self, session):
+        self.session = session
+
+    async def execute(self, stmt, params=None):
+        return self.session.execute(stmt, params)
+
+    async def stream(self, stmt):
+        return FakeStream(self.session.execute(stmt))
+
+    async def commit(self):
+        self.session.commit()
+
+    async def rollback(self):
+        self.session.rollback()
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = create_engine('sqlite://')
+    for model in (ReportTradebook, ReportTradeLots):
+        model.__table__.create(engine)
+
+    class FakeDb:
+        @asynccontextmanager
+        async def get_async_session(self):
+            with Session(engine) as session:
+                yield FakeSession(session)
+
+    monkeypatch.setattr(trade_lots_module, 'db', FakeDb())
+    monkeypatch.setattr(parms, 'LOT_MATCH_BATCH_SYMBOLS', 1)  # Every group is matched as it completes
+    return engine
+
+
+@pytest.fixture
+def service():
+    service = object.__new__(ServiceReportTradeLots)
+    service._singleton_initialized = False
+    service.__init__()
+    return service
+
+
+def add_trades(engine, *trades):
+    with engine.begin() as connection:
+        connection.execute(insert(ReportTradebook), [{
+            'account': account, 'trade_id': trade_id, 'order_id': trade_id, 'symbol': symbol, 'exchange': 'NSE',
+            'segment': 'EQ', 'trade_type': trade_type, 'quantity': quantity, 'price': price,
+            'trade_date': datetime(2024, 4, day), 'order_execution_time': datetime(2024, 4, day, 10),
+        } for account, symbol, trade_id, day, trade_type, quantity, price in trades])
+
+
+def lots(engine):
+    with engine.connect() as connection:
+        return connection.execute(
+            select(ReportTradeLots.account, ReportTradeLots.symbol, ReportTradeLots.status, ReportTradeLots.quantity,
+                   ReportTradeLots.open_trade_id, ReportTradeLots.close_trade_id)
+            .order_by(ReportTradeLots.account, ReportTradeLots.symbol, ReportTradeLots.status,
+                      ReportTradeLots.open_trade_id)
+        ).all()
+
+
+def test_new_trades_extend_the_open_lots(engine, service):
+    add_trades(engine,
+               ('A1', 'INFY', 1, 1, 'buy', 10, 100.0),
+               ('A1', 'INFY', 2, 2, 'buy', 10, 110.0),
+               ('A1', 'TCS', 3, 2, 'buy', 5, 3000.0),
+               ('A2', 'INFY', 4, 1, 'buy', 7, 100.0))
+    asyncio.run(service.match_new_trades())
+    add_trades(engine, ('A1', 'INFY', 5, 3, 'sell', 15, 120.0))
+    asyncio.run(service.match_new_trades())
+
+    assert lots(engine) == [
+        ('A1', 'INFY', 'CLOSED', 10, 1, 5),
+        ('A1', 'INFY', 'CLOSED', 5, 2, 5),
+        ('A1', 'INFY', 'OPEN', 5, 2, None),
+        ('A1', 'TCS', 'OPEN', 5, 3, None),
+        ('A2', 'INFY', 'OPEN', 7, 4, None),
+    ]
+
+
+def test_backdated_trades_rebuild_the_symbol(engine, service):
+    add_trades(engine,
+               ('A1', 'INFY', 1, 2, 'buy', 10, 100.0),
+               ('A1', 'INFY', 2, 3, 'sell', 10, 110.0),
+               ('A1', 'TCS', 3, 2, 'buy', 5, 3000.0))
+    asyncio.run(service.match_new_trades())
+    add_trades(engine, ('A1', 'INFY', 4, 1, 'buy', 4, 90.0))  # Executed before the matched history
+    asyncio.run(service.match_new_trades())
+
+    assert lots(engine) == [
+        ('A1', 'INFY', 'CLOSED', 6, 1, 2),
+        ('A1', 'INFY', 'CLOSED', 4, 4, 2),
+        ('A1', 'INFY', 'OPEN', 4, 1, None),
+        ('A1', 'TCS', 'OPEN', 5, 3, None),
+    ]
+
+
+def test_groups_are_yielded_per_account_and_symbol(engine, service):
+    add_trades(engine,
+               ('A1', 'TCS', 1, 1, 'buy', 5, 3000.0),
+               ('A1', 'INFY', 2, 2, 'buy', 10, 100.0),
+               ('A1', 'INFY', 3, 1, 'buy', 10, 100.0),
+               ('A2', 'INFY', 4, 1, 'buy', 7, 100.0))
+
+    async def collect():
+        with Session(engine) as session:
+            return [(key, [trade['trade_id'] for trade in trades])
+                    async for key, trades in service.iter_new_trade_groups(FakeSession(session), {'A2': 4})]
+
+    assert asyncio.run(collect()) == [(('A1', 'INFY'), [3, 2]), (('A1', 'TCS'), [1])]
@@ -0,0 +1,78 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from src.models import ReportTradebook
+from src.services import service_base as service_base_module
+from src.services.service_report_tradebook import ServiceReportTradebook
+
+
+class FakeSession:
+    """AsyncSession stand-in over a sync SQLite session."""
+
+    def __init__(self, session):
+        self.session = session
+
+    async def execute(self, stmt, params=None):
+        return self.session.execute(stmt, params)
+
+    async def commit(self):
+        self.session.commit()
+
+    async def rollback(self):
+        self.session.rollback()
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = create_engine('sqlite://')
+    ReportTradebook.__table__.create(engine)
+
+    class FakeDb:
+        @asynccontextmanager
+        async def get_async_session(self):
+            with Session(engine) as session:
+                yield FakeSession(session)
+
+    monkeypatch.setattr(service_base_module, 'db', FakeDb())
+    return engine
+
+
+@pytest.fixture
+def service():
+    service = object.__new__(ServiceReportTradebook)
+    service._singleton_initialized = False
+    service.__init__()
+    return service
+
+
+def tradebook(*trades):
+    """A parsed tradebook frame with Console's column names."""
+    return pd.DataFrame([{
+        'Symbol': symbol, 'ISIN': 'INE009A01021', 'Trade Date': day, 'Exchange': 'NSE', 'Segment': 'EQ',
+        'Series': 'EQ', 'Trade Type': 'buy', 'Auction': False, 'Quantity': quantity, 'Price': 1500.0,
+        'Trade ID': trade_id, 'Order ID': trade_id, 'Order Execution Time': f'{day}T09:15:00', 'Expiry Date': None,
+        'account': 'A1',
+    } for trade_id, symbol, day, quantity in trades])
+
+
+def test_trades_already_stored_or_repeated_in_a_file_are_skipped(engine, service):
+    asyncio.run(service.validate_insert_records(tradebook(
+        (1, 'INFY', '2024-04-01', 10),
+        (2, 'INFY', '2024-04-02', 5),
+        (2, 'INFY', '2024-04-02', 5),  # Same trade in two files of one run
+    )))
+    # The next run restarts on the watermark day and delivers its trades again
+    asyncio.run(service.validate_insert_records(tradebook(
+        (2, 'INFY', '2024-04-02', 7),
+        (3, 'TCS', '2024-04-03', 1),
+    )))
+
+    with Session(engine) as session:
+        stored = session.execute(select(ReportTradebook.trade_id, ReportTradebook.symbol, ReportTradebook.quantity)
+                                 .order_by(ReportTradebook.trade_id)).all()
+    assert stored == [(1, 'INFY', 10), (2, 'INFY', 5), (3, 'TCS', 1)]
@@ -0,0 +1,61 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from src import app_initializer as app_initializer_module
+from src.app_initializer import AppInitializer
+from src.core.report_downloader import ReportDownloader
+from src.core.report_uploader import ReportUploader
+from src.services.service_report_ledger_daily import service_report_ledger_daily
+from src.services.service_report_sync_state import service_report_sync_state
+from src.services.service_report_trade_lots import service_report_trade_lots
+
+
+@pytest.fixture
+def report_run(monkeypatch):
+    run = {'watermarks': {('A1', 'TRADEBOOK'): date(2024, 4, 20)}, 'downloads': {}, 'failed_uploads': set()}
+
+    async def get_watermarks():
+        return run['watermarks']
+
+    async def set_watermarks(watermarks):
+        run['advanced'] = watermarks
+
+    def login_download_reports(watermarks=None):
+        run['download_watermarks'] = watermarks
+        return run['downloads']
+
+    async def upload_reports():
+        return run['failed_uploads']
+
+    async def nothing():
+        pass
+
+    monkeypatch.setattr(service_report_sync_state, 'get_watermarks', get_watermarks)
+    monkeypatch.setattr(service_report_sync_state, 'set_watermarks', set_watermarks)
+    monkeypatch.setattr(ReportDownloader, 'login_download_reports', staticmethod(login_download_reports))
+    monkeypatch.setattr(ReportUploader, 'upload_reports', staticmethod(upload_reports))
+    monkeypatch.setattr(service_report_trade_lots, 'match_new_trades', nothing)
+    monkeypatch.setattr(service_report_ledger_daily, 'reconcile', nothing)
+    monkeypatch.setattr(app_initializer_module, 'today_indian', lambda: date(2024, 4, 30))
+    return run
+
+
+def test_watermarks_advance_only_for_reports_that_downloaded_and_uploaded(report_run):
+    report_run['downloads'] = {
+        'A1': {'TRADEBOOK': {'Equity': ['tradebook-A1-EQ.csv']}, 'LEDGER': {'Equity': ['ledger-A1.csv']}},
+        'A2': {'PNL': {'Equity': ['pnl-A2.xlsx']}},  # A2's tradebook download failed and is left out
+    }
+    report_run['failed_uploads'] = {('A1', 'LEDGER')}
+
+    asyncio.run(AppInitializer.sync_reports())
+
+    assert report_run['download_watermarks'] == {('A1', 'TRADEBOOK'): date(2024, 4, 20)}
+    assert report_run['advanced'] == {('A1', 'TRADEBOOK'): date(2024, 4, 30), ('A2', 'PNL'): date(2024, 4, 30)}
+
+
+def test_no_watermark_moves_when_no_account_downloaded(report_run):
+    asyncio.run(AppInitializer.sync_reports())
+
+    assert report_run['advanced'] == {}
@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+import src.thread_scheduler as thread_scheduler_module
+from src.settings.parameter_manager import parms
+from src.thread_scheduler import ThreadScheduler
+
+
+class FakeTracker:
+    def __init__(self):
+        self.events = []
+
+    async def record_start(self, thread, schedule):
+        self.events.append(('start', thread, schedule))
+
+    async def record_run(self, thread, schedule, succeeded, duration, notes=None):
+        self.events.append(('end', thread, schedule, succeeded, notes))
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    scheduler = object.__new__(ThreadScheduler)  # A private instance, not the shared singleton
+    scheduler._singleton_initialized = False
+    scheduler.__init__()
+    scheduler.thread_schedules = {'sync_positions': {'schedule': 'MARKET', 'max_instances': 2},
+                                  'sync_holdings': {'schedule': 'PRE_MARKET', 'max_instances': None}}
+    monkeypatch.setattr(scheduler, 'schedule_next', lambda thread, calendar: None)
+    yield scheduler
+    scheduler.executor.shutdown(wait=False)
+
+
+def test_max_instances_per_thread_fall_back_to_the_global_setting(scheduler):
+    assert scheduler.get_max_instances('sync_positions') == 2
+    assert scheduler.get_max_instances('sync_holdings') == parms.SCHEDULER_JOB_MAX_INSTANCES
+
+
+def test_runs_are_marked_in_progress_before_the_job_and_recorded_after(scheduler, monkeypatch):
+    tracker = FakeTracker()
+
+    async def job():
+        tracker.events.append(('job',))
+        raise RuntimeError('kite down')
+
+    async def get_market_calendar_async():
+        return None
+
+    monkeypatch.setattr(thread_scheduler_module, 'service_thread_status_tracker', tracker)
+    monkeypatch.setattr(thread_scheduler_module.service_schedule_time, 'get_market_calendar_async',
+                        get_market_calendar_async)
+    monkeypatch.setattr(scheduler, 'get_job', lambda thread: job)
+
+    async def run():
+        scheduler.job_semaphore = asyncio.Semaphore(1)
+        await scheduler.run_job('sync_positions')
+
+    asyncio.run(run())
+    assert tracker.events == [('start', 'sync_positions', 'MARKET'), ('job',),
+                              ('end', 'sync_positions', 'MARKET', False, 'kite down')]
@@ -0,0 +1,34 @@
+from src.app_state_manager import AppState, Xref
+from src.ticks.ticker import Ticker
+
+
+class ClosedCalendar:
+    @staticmethod
+    def is_open(exchange, schedule, now):
+        return False
+
+    @staticmethod
+    def next_transition(exchange, schedule, now):
+        return None
+
+
+def test_each_market_session_gets_a_fresh_thread():
+    state = object.__new__(AppState)
+    state._singleton_initialized = False
+    state.__init__()
+
+    ticker = Ticker(kite_obj=object())
+    ticker.update_market_calendar(ClosedCalendar()).update_instruments({'NSE': {408065}})
+    ticker.unsubscribe = state.subscribe(Xref.TRACK_INSTR_XREF_XCHANGE, ticker.on_track_list_change)
+    Ticker.add_instruments({408065})
+    ticker.start()
+    ticker.join(timeout=5)
+
+    assert not ticker.is_alive()
+    assert not state._subscribers[Xref.TRACK_INSTR_XREF_XCHANGE]
+    assert not Ticker.instrument_tokens
+
+    next_ticker = Ticker(kite_obj=object())
+    assert next_ticker is not ticker
+    assert not next_ticker.is_alive() and not next_ticker.instruments
+    next_ticker.end_session()